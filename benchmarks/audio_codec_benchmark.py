@@ -0,0 +1,69 @@
+"""
+Throughput of the table driven G.711 codec of bolna.helpers.audio_codec against audioop (when the interpreter still
+ships it, it was removed in Python 3.13) for telephony sized frames and for longer buffers. audioop decodes faster at
+every size and encodes faster on short frames, the codec is there to run without it.
+
+Usage (from the repository root): python -m benchmarks.audio_codec_benchmark [--frame-ms 20 100 1000] [--iterations 2000]
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from bolna.helpers import audio_codec
+
+SAMPLE_RATE = 8000
+
+
+def measure(fn, iterations):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frame-ms", type=int, nargs="+", default=[20, 100, 1000])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            import audioop
+    except ImportError:
+        audioop = None
+        print("audioop is not available in this interpreter, only bolna.helpers.audio_codec is measured")
+
+    print(f"{'operation':>10} {'frame ms':>9} {'audioop MB/s':>13} {'codec MB/s':>11} {'codec _into MB/s':>17}")
+    for frame_ms in args.frame_ms:
+        samples = int(SAMPLE_RATE * frame_ms / 1000)
+        pcm_data = (np.random.default_rng(0).normal(0, 4000, samples)).clip(-32768, 32767).astype(np.int16).tobytes()
+        ulaw_data = audio_codec.lin2ulaw(pcm_data)
+        alaw_data = audio_codec.lin2alaw(pcm_data)
+        encode_buffer = bytearray(samples)
+        decode_buffer = bytearray(2 * samples)
+
+        operations = [
+            ("lin2ulaw", pcm_data, audio_codec.lin2ulaw, audio_codec.lin2ulaw_into, encode_buffer, "lin2ulaw"),
+            ("ulaw2lin", ulaw_data, audio_codec.ulaw2lin, audio_codec.ulaw2lin_into, decode_buffer, "ulaw2lin"),
+            ("lin2alaw", pcm_data, audio_codec.lin2alaw, audio_codec.lin2alaw_into, encode_buffer, "lin2alaw"),
+            ("alaw2lin", alaw_data, audio_codec.alaw2lin, audio_codec.alaw2lin_into, decode_buffer, "alaw2lin"),
+        ]
+        for name, data, convert, convert_into, buffer, audioop_name in operations:
+            megabytes = len(data) / (1024 * 1024)
+            codec_throughput = megabytes / measure(lambda: convert(data), args.iterations)
+            codec_into_throughput = megabytes / measure(lambda: convert_into(data, buffer), args.iterations)
+            if audioop is not None:
+                audioop_convert = getattr(audioop, audioop_name)
+                audioop_throughput = f"{megabytes / measure(lambda: audioop_convert(data, 2), args.iterations):.1f}"
+            else:
+                audioop_throughput = "n/a"
+            print(f"{name:>10} {frame_ms:>9} {audioop_throughput:>13} {codec_throughput:>11.1f} {codec_into_throughput:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
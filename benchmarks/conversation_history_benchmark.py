@@ -0,0 +1,66 @@
+"""
+Compares the per-turn history bookkeeping of a long call when the transcript is deep copied on every turn (what the
+TaskManager used to do) against the append-only ConversationHistory.
+
+Usage (from the repository root): python -m benchmarks.conversation_history_benchmark [--turns 10 40 160] [--calls 50]
+"""
+import argparse
+import copy
+import time
+
+from bolna.helpers.conversation_history import ConversationHistory, format_message
+
+SYSTEM_PROMPT = {'role': 'system', 'content': "You are a helpful voice agent for a rental company. " * 60}
+USER_TURN = "I wanted to check if the apartment on fifth street is still available next month"
+ASSISTANT_TURN = "Yes it is available from the first, would you like me to book a visit for you this week?"
+
+
+def run_deepcopy_call(turns):
+    history = [SYSTEM_PROMPT]
+    interim_history = copy.deepcopy(history)
+    for _ in range(turns):
+        history.append({'role': 'user', 'content': USER_TURN})
+        messages = copy.deepcopy(history)
+        "".join(format_message(message, use_system_prompt=True) for message in messages)
+        messages.append({'role': 'assistant', 'content': ASSISTANT_TURN})
+        history.append({'role': 'assistant', 'content': ASSISTANT_TURN})
+        interim_history = copy.deepcopy(messages)
+    return interim_history
+
+
+def run_shared_history_call(turns):
+    history = ConversationHistory([SYSTEM_PROMPT])
+    interim_history = history.snapshot()
+    for _ in range(turns):
+        history.append({'role': 'user', 'content': USER_TURN})
+        messages = history.snapshot()
+        messages.format(use_system_prompt=True)
+        assistant_message = {'role': 'assistant', 'content': ASSISTANT_TURN}
+        messages.append(assistant_message)
+        history.append(assistant_message)
+        interim_history = messages.snapshot()
+    return interim_history
+
+
+def measure(fn, turns, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn(turns)
+    return (time.perf_counter() - start) / (calls * turns) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 40, 160])
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'turns':>6} {'deepcopy us/turn':>18} {'shared us/turn':>16} {'speedup':>8}")
+    for turns in args.turns:
+        deepcopy_cost = measure(run_deepcopy_call, turns, args.calls)
+        shared_cost = measure(run_shared_history_call, turns, args.calls)
+        print(f"{turns:>6} {deepcopy_cost:>18.1f} {shared_cost:>16.1f} {deepcopy_cost / shared_cost:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compares the list of (frame_start, frame_end, send_timestamp) tuples the transcribers used to keep for the whole call,
+scanned linearly for every result, against the FrameTimestampIndex (bounded arrays searched by bisection and trimmed
+behind the latest result), for a call of a given length streaming 200 ms frames with a result every second.
+
+Usage (from the repository root): python -m benchmarks.frame_timestamp_benchmark [--minutes 1 10 30]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+from bolna.constants import DEFAULT_FRAME_TIMESTAMP_RETENTION_S
+from bolna.helpers.frame_timestamp_index import FrameTimestampIndex
+
+FRAME_DURATION = 0.2
+FRAMES_PER_RESULT = 5
+
+
+def find_in_list(frames, position):
+    for frame_start, frame_end, send_timestamp in frames:
+        if frame_start <= position <= frame_end:
+            return send_timestamp
+    return None
+
+
+def run_list(frame_count):
+    frames = []
+    found = 0
+    start = time.perf_counter()
+    for frame in range(frame_count):
+        frames.append((frame * FRAME_DURATION, (frame + 1) * FRAME_DURATION, 1000.0 + frame))
+        if frame % FRAMES_PER_RESULT == 0:
+            found += find_in_list(frames, (frame + 0.5) * FRAME_DURATION) is not None
+    return time.perf_counter() - start, found, frames
+
+
+def run_index(frame_count):
+    index = FrameTimestampIndex()
+    found = 0
+    start = time.perf_counter()
+    for frame in range(frame_count):
+        index.append(frame * FRAME_DURATION, (frame + 1) * FRAME_DURATION, 1000.0 + frame)
+        if frame % FRAMES_PER_RESULT == 0:
+            position = (frame + 0.5) * FRAME_DURATION
+            found += index.find(position) is not None
+            index.trim(position - DEFAULT_FRAME_TIMESTAMP_RETENTION_S)
+    return time.perf_counter() - start, found, index
+
+
+def memory_of(run, frame_count):
+    tracemalloc.start()
+    _, _, kept = run(frame_count)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10, 30])
+    args = parser.parse_args()
+
+    print(f"{'minutes':>8} {'frames':>7} {'list ms':>9} {'index ms':>9} {'list KiB':>9} {'index KiB':>10}")
+    for minutes in args.minutes:
+        frame_count = int(minutes * 60 / FRAME_DURATION)
+        list_time, list_found, _ = run_list(frame_count)
+        index_time, index_found, _ = run_index(frame_count)
+        if list_found != index_found:
+            sys.exit(f"Lookups differ: {list_found} found in the list, {index_found} in the index")
+        list_memory, index_memory = memory_of(run_list, frame_count), memory_of(run_index, frame_count)
+        print(f"{minutes:>8g} {frame_count:>7} {list_time * 1000:>9.1f} {index_time * 1000:>9.1f} "
+              f"{list_memory / 1024:>9.0f} {index_memory / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Load test of the local (offline, CPU) transcriber: a number of concurrent calls stream the same audio in real time
+sized chunks to the shared LocalSTTService, once with a single worker thread (as recognizing each call on its own
+would) and once with the worker pool. Reports how many times faster than real time the audio of all the calls is
+recognized and the average number of calls per batch, the transcripts must not depend on the pool.
+
+Usage (from the repository root): python -m benchmarks.local_stt_benchmark --wav SPEECH.wav [--calls 1 10 50] [--workers N] [--model NAME_OR_PATH]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import wave
+
+from bolna.constants import DEFAULT_LOCAL_STT_MODEL
+from bolna.helpers.local_stt_service import LocalSTTService
+
+CHUNK_MS = 200
+
+
+def read_wav(path):
+    with wave.open(path, "rb") as wav_file:
+        if wav_file.getnchannels() != 1 or wav_file.getsampwidth() != 2:
+            sys.exit("The audio must be 16 bit mono PCM")
+        return wav_file.readframes(wav_file.getnframes()), wav_file.getframerate()
+
+
+async def run_calls(service, calls, audio, sample_rate):
+    streams = [service.open_stream(sample_rate) for _ in range(calls)]
+    transcripts = [[] for _ in range(calls)]
+
+    async def collect(stream, transcript):
+        async for event in stream:
+            if event["type"] == "final" and event["text"]:
+                transcript.append(event["text"])
+
+    collectors = [asyncio.create_task(collect(stream, transcript)) for stream, transcript in zip(streams, transcripts)]
+    chunk_size = 2 * sample_rate * CHUNK_MS // 1000
+    runs, jobs = service.runs, service.jobs
+    start = time.perf_counter()
+    for offset in range(0, len(audio), chunk_size):
+        for stream in streams:
+            await stream.send(audio[offset:offset + chunk_size])
+        await asyncio.sleep(0)
+    for stream in streams:
+        await stream.finish()
+    await asyncio.gather(*collectors)
+    elapsed = time.perf_counter() - start
+    average_batch = (service.jobs - jobs) / max(service.runs - runs, 1)
+    return elapsed, average_batch, {" ".join(transcript) for transcript in transcripts}
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wav", required=True)
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--model", default=DEFAULT_LOCAL_STT_MODEL)
+    args = parser.parse_args()
+
+    audio, sample_rate = read_wav(args.wav)
+    audio_duration = len(audio) / 2 / sample_rate
+    single, pool = LocalSTTService(args.model, workers=1), LocalSTTService(args.model, workers=args.workers)
+    print(f"{'calls':>6} {'1 worker x realtime':>20} {f'{args.workers} workers x realtime':>21} {'avg batch':>10}")
+    for calls in args.calls:
+        single_time, _, single_transcripts = await run_calls(single, calls, audio, sample_rate)
+        pool_time, average_batch, pool_transcripts = await run_calls(pool, calls, audio, sample_rate)
+        if single_transcripts != pool_transcripts or len(pool_transcripts) != 1:
+            sys.exit(f"Transcripts differ: {single_transcripts} {pool_transcripts}")
+        print(f"{calls:>6} {calls * audio_duration / single_time:>20.1f} {calls * audio_duration / pool_time:>21.1f} {average_batch:>10.1f}")
+    print(f"Transcript: {pool_transcripts.pop()}")
+    await single.close()
+    await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
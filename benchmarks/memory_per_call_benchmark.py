@@ -0,0 +1,100 @@
+"""
+Measures the resident memory used per concurrent call by the provider resources (HTTP pools, ONNX VAD session,
+embedding model) when every call builds its own (what the TaskManager used to do) against drawing them from the
+process wide ResourceRegistry. Every scenario runs in a fresh interpreter so that the numbers don't leak into
+each other. Resources whose dependencies (or model files) aren't available are skipped.
+
+Usage (from the repository root): python -m benchmarks.memory_per_call_benchmark [--calls 1 25 100]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from importlib.util import find_spec
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def available_resources():
+    resources = ["httpx", "aiohttp"]
+    if find_spec("onnxruntime") and find_spec("torch") and os.path.exists(os.path.expanduser("~/.cache/bolna/silero_vad.onnx")):
+        resources.append("vad")
+    if find_spec("fastembed"):
+        resources.append("embedding_model")
+    return resources
+
+
+def build_call_resources(shared, resources):
+    """The resources one call holds on to for its whole duration"""
+    import httpx
+    import aiohttp
+    from bolna.helpers.resource_registry import resource_registry
+
+    call_resources = []
+    if "httpx" in resources:
+        if shared:
+            call_resources.append(resource_registry.get_httpx_client("openai"))
+        else:
+            call_resources.append(httpx.AsyncClient(limits=httpx.Limits(max_connections=50, max_keepalive_connections=50, keepalive_expiry=30)))
+    if "aiohttp" in resources:
+        call_resources.append(resource_registry.get_aiohttp_session() if shared else aiohttp.ClientSession())
+    if "vad" in resources:
+        from bolna.helpers.vad import VAD
+        path = os.path.expanduser("~/.cache/bolna/silero_vad.onnx")
+        call_resources.append(VAD() if shared else VAD.create_session(path))
+    if "embedding_model" in resources:
+        from fastembed import TextEmbedding
+        from bolna.memory.cache.vector_cache import VectorCache
+        call_resources.append(VectorCache() if shared else TextEmbedding(model_name="BAAI/bge-small-en-v1.5"))
+    return call_resources
+
+
+async def run_scenario(shared, calls, resources):
+    # Pay for the imports and lazy initialisations upfront so that only the per call cost is measured
+    warmup = build_call_resources(False, resources)
+    baseline = rss_bytes()
+    all_calls = [build_call_resources(shared, resources) for _ in range(calls)]
+    used = rss_bytes() - baseline
+
+    for call_resources in all_calls + [warmup]:
+        for resource in call_resources:
+            if hasattr(resource, "aclose"):
+                await resource.aclose()
+            elif hasattr(resource, "close") and asyncio.iscoroutinefunction(resource.close):
+                await resource.close()
+    from bolna.helpers.resource_registry import resource_registry
+    await resource_registry.close()
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 25, 100])
+    parser.add_argument("--scenario", choices=["isolated", "shared"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    resources = available_resources()
+
+    if args.scenario:
+        used = asyncio.run(run_scenario(args.scenario == "shared", args.calls[0], resources))
+        print(json.dumps({"used": used}))
+        return
+
+    print(f"Resources per call: {', '.join(resources)}")
+    print(f"{'calls':>6} {'isolated MB/call':>17} {'shared MB/call':>15} {'saving':>8}")
+    for calls in args.calls:
+        used = {}
+        for scenario in ("isolated", "shared"):
+            output = subprocess.run([sys.executable, "-m", "benchmarks.memory_per_call_benchmark", "--scenario", scenario, "--calls", str(calls)],
+                                    capture_output=True, text=True, check=True).stdout
+            used[scenario] = json.loads(output.strip().splitlines()[-1])["used"] / calls / (1024 * 1024)
+        saving = used["isolated"] / used["shared"] if used["shared"] > 0 else float("inf")
+        print(f"{calls:>6} {used['isolated']:>17.3f} {used['shared']:>15.3f} {saving:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
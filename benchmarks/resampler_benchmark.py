@@ -0,0 +1,79 @@
+"""
+Compares resampling a synthesizer chunk the way `resample()` used to (torchaudio WAV load, a Resample kernel built on
+every call, torchaudio WAV save) against the StreamingResampler working on the raw PCM with cached filter banks.
+
+Usage (from the repository root): python -m benchmarks.resampler_benchmark [--chunk-ms 40 200 1000] [--iterations 200]
+"""
+import argparse
+import io
+import time
+from importlib.util import find_spec
+
+import numpy as np
+
+from bolna.helpers.audio_resampler import StreamingResampler
+
+RATE_PAIRS = [(24000, 8000), (44100, 8000), (16000, 8000), (8000, 16000)]
+
+
+def make_pcm(sample_rate, duration_ms):
+    t = np.arange(int(sample_rate * duration_ms / 1000)) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.2 * np.sin(2 * np.pi * 1250 * t)
+    return (tone * 32767).astype(np.int16).tobytes()
+
+
+def make_wav(pcm_data, sample_rate):
+    import wave
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm_data)
+    return buffer.getvalue()
+
+
+def torchaudio_resample(wav_bytes, target_sample_rate):
+    import torchaudio
+    waveform, orig_sample_rate = torchaudio.load(io.BytesIO(wav_bytes), format="wav")
+    resampler = torchaudio.transforms.Resample(orig_sample_rate, target_sample_rate)
+    audio_buffer = io.BytesIO()
+    torchaudio.save(audio_buffer, resampler(waveform), target_sample_rate, format="wav")
+    return audio_buffer.getvalue()
+
+
+def measure(fn, iterations):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunk-ms", type=int, nargs="+", default=[40, 200, 1000])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    has_torchaudio = find_spec("torchaudio") is not None
+    if not has_torchaudio:
+        print("torchaudio is not installed, only the streaming resampler is measured")
+
+    print(f"{'rates':>13} {'chunk ms':>9} {'torchaudio us':>14} {'streaming us':>13} {'speedup':>8}")
+    for orig_sample_rate, target_sample_rate in RATE_PAIRS:
+        for chunk_ms in args.chunk_ms:
+            pcm_data = make_pcm(orig_sample_rate, chunk_ms)
+            resampler = StreamingResampler(orig_sample_rate, target_sample_rate)
+            streaming_cost = measure(lambda: resampler.process(pcm_data), args.iterations)
+            rates = f"{orig_sample_rate}->{target_sample_rate}"
+            if has_torchaudio:
+                wav_bytes = make_wav(pcm_data, orig_sample_rate)
+                torchaudio_cost = measure(lambda: torchaudio_resample(wav_bytes, target_sample_rate), args.iterations)
+                print(f"{rates:>13} {chunk_ms:>9} {torchaudio_cost:>14.1f} {streaming_cost:>13.1f} {torchaudio_cost / streaming_cost:>7.1f}x")
+            else:
+                print(f"{rates:>13} {chunk_ms:>9} {'n/a':>14} {streaming_cost:>13.1f} {'n/a':>8}")
+
+
+if __name__ == "__main__":
+    main()
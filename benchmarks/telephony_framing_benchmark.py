@@ -0,0 +1,100 @@
+"""
+Compares the framing of telephony audio the way the handlers used to do it against the AudioFrameBuffer and the
+memoryview based yield_chunks_from_memory:
+
+- inbound: one second of Twilio media events (50 frames of 20 ms) batched for the transcriber, previously base64
+  decoded into a list of frames joined every 10 frames, with the packet metadata rebuilt for every frame
+- outbound: a synthesized response split into output chunks, previously sliced into copies
+
+Usage (from the repository root): python -m benchmarks.telephony_framing_benchmark [--seconds 60] [--frames-per-batch 10]
+"""
+import argparse
+import base64
+import json
+import time
+import tracemalloc
+
+from bolna.helpers.audio_frame_buffer import AudioFrameBuffer
+
+FRAME_BYTES = 160  # 20 ms of 8 kHz mu-law
+FRAMES_PER_SECOND = 50
+
+
+def make_media_events(seconds):
+    payload = base64.b64encode(bytes(range(FRAME_BYTES))).decode("utf-8")
+    return [json.dumps({"event": "media", "streamSid": "MZ00", "media": {"track": "inbound", "chunk": str(i), "timestamp": str(20 * i), "payload": payload}})
+            for i in range(seconds * FRAMES_PER_SECOND)]
+
+
+def run_list_join(events, frames_per_batch):
+    batches, buffer, message_count = [], [], 0
+    for message in events:
+        packet = json.loads(message)
+        media_audio = base64.b64decode(packet['media']['payload'])
+        meta_info = {'io': 'twilio', 'call_sid': 'CA00', 'stream_sid': 'MZ00', 'sequence': 0}
+        buffer.append(media_audio)
+        message_count += 1
+        if message_count == frames_per_batch:
+            batches.append((b''.join(buffer), meta_info))
+            buffer, message_count = [], 0
+    return batches
+
+
+def run_frame_buffer(events, frames_per_batch):
+    batches, frame_buffer = [], AudioFrameBuffer(frames_per_batch)
+    for message in events:
+        packet = json.loads(message)
+        if frame_buffer.append_base64(packet['media']['payload']):
+            meta_info = {'io': 'twilio', 'call_sid': 'CA00', 'stream_sid': 'MZ00', 'sequence': 0}
+            batches.append((frame_buffer.flush(), meta_info))
+    return batches
+
+
+def slice_chunks(audio, chunk_size):
+    return [audio[i:i + chunk_size] for i in range(0, len(audio), chunk_size)]
+
+
+def view_chunks(audio, chunk_size):
+    audio_view = memoryview(audio)
+    return [audio_view[i:i + chunk_size] for i in range(0, len(audio_view), chunk_size)]
+
+
+def measure(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    # Memory is traced in a separate run since tracing slows everything down
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--frames-per-batch", type=int, default=10)
+    args = parser.parse_args()
+
+    events = make_media_events(args.seconds)
+    print(f"inbound: {len(events)} media events, {args.frames_per_batch} frames per batch")
+    print(f"{'framing':>12} {'us/event':>9} {'peak KB':>8}")
+    reference = None
+    for name, fn in (("list + join", run_list_join), ("frame buffer", run_frame_buffer)):
+        fn(events[:FRAMES_PER_SECOND], args.frames_per_batch)
+        batches, elapsed, peak = measure(fn, events, args.frames_per_batch)
+        reference = reference or [batch for batch, _ in batches]
+        assert [batch for batch, _ in batches] == reference
+        print(f"{name:>12} {elapsed / len(events) * 1e6:>9.2f} {peak / 1024:>8.1f}")
+
+    audio = bytes(16000 * args.seconds)  # a response of `seconds` of 8 kHz PCM
+    print(f"\noutbound: {len(audio) // 1024} KB of audio in chunks of 320 bytes, all chunks held (as in the output queue)")
+    print(f"{'chunking':>12} {'us/chunk':>9} {'peak KB':>8}")
+    for name, fn in (("slices", slice_chunks), ("memoryviews", view_chunks)):
+        chunks, elapsed, peak = measure(fn, audio, 320)
+        print(f"{name:>12} {elapsed / len(chunks) * 1e6:>9.2f} {peak / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compares the per call sleep loops the idle timeouts used to run as (transcriber heartbeat every 5 s, utterance timeout
+monitor and synthesizer connection monitor every second, completion check every 2 s) against the same timeouts armed
+on the shared TimerWheel (a keepalive re-armed every 5 s and a silence deadline every 10 s), for a number of idle
+calls. Counts the coroutine resumptions / timer wheel wakeups and the CPU time spent.
+
+Usage (from the repository root): python -m benchmarks.timer_wheel_benchmark [--calls 100 1000 5000] [--seconds 10]
+"""
+import argparse
+import asyncio
+import time
+
+from bolna.helpers.timer_wheel import TimerWheel
+
+SLEEP_LOOP_PERIODS = (5, 1, 1, 2)
+
+
+async def run_sleep_loops(calls, seconds):
+    resumptions = 0
+
+    async def loop(period):
+        nonlocal resumptions
+        while True:
+            await asyncio.sleep(period)
+            resumptions += 1
+
+    tasks = [asyncio.create_task(loop(period)) for _ in range(calls) for period in SLEEP_LOOP_PERIODS]
+    start = time.process_time()
+    await asyncio.sleep(seconds)
+    cpu_time = time.process_time() - start
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return resumptions, cpu_time
+
+
+async def run_timer_wheel(calls, seconds):
+    wheel = TimerWheel()
+
+    def rearm(period):
+        wheel.call_later(period, rearm, period)
+
+    for _ in range(calls):
+        rearm(5)
+        rearm(10)
+    start = time.process_time()
+    await asyncio.sleep(seconds)
+    return wheel.wakeups, time.process_time() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{'calls':>6} {'loop wakeups/s':>15} {'loop cpu ms':>12} {'wheel wakeups/s':>16} {'wheel cpu ms':>13}")
+    for calls in args.calls:
+        resumptions, loop_cpu_time = await run_sleep_loops(calls, args.seconds)
+        wakeups, wheel_cpu_time = await run_timer_wheel(calls, args.seconds)
+        print(f"{calls:>6} {resumptions / args.seconds:>15.0f} {loop_cpu_time * 1000:>12.1f} "
+              f"{wakeups / args.seconds:>16.1f} {wheel_cpu_time * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Compares running Silero VAD once per call and per frame (batch size 1, as bolna.helpers.vad.VAD does) against the
+batched VADService, which evaluates one frame of every call in a single session.run, for a number of concurrent calls
+streaming audio in real time chunks. Both must give the same speech probabilities.
+
+Usage (from the repository root): python -m benchmarks.vad_batching_benchmark [--calls 1 50 200] [--seconds 5] [--model-path PATH]
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from bolna.helpers.vad_service import FRAME_SIZES, VADService
+
+SAMPLE_RATE = 16000
+CHUNK_MS = 100
+
+
+def make_call_audio(seconds, seed):
+    # Noise bursts alternating with silence, enough for the model to do its usual amount of work
+    rng = np.random.default_rng(seed)
+    frame_size = FRAME_SIZES[SAMPLE_RATE]
+    audio = rng.normal(0, 3000, SAMPLE_RATE * seconds // frame_size * frame_size)
+    audio[(np.arange(len(audio)) // SAMPLE_RATE) % 2 == 1] *= 0.01
+    return audio.clip(-32768, 32767).astype(np.int16).tobytes()
+
+
+def run_unbatched(service, calls_audio):
+    frame_size = FRAME_SIZES[SAMPLE_RATE]
+    probabilities = []
+    start = time.perf_counter()
+    for audio in calls_audio:
+        frames = np.frombuffer(audio, dtype=np.int16).astype(np.float32).reshape(-1, frame_size) / 32768
+        state = service.initial_state(SAMPLE_RATE)
+        call_probabilities = []
+        for frame in frames:
+            probability, (state,) = service.infer(SAMPLE_RATE, frame[None, :], [state])
+            call_probabilities.append(probability[0])
+        probabilities.append(call_probabilities)
+    return time.perf_counter() - start, np.array(probabilities)
+
+
+async def run_batched(service, calls_audio):
+    streams = [service.open_stream(SAMPLE_RATE) for _ in calls_audio]
+    probabilities = [[] for _ in calls_audio]
+    for stream, call_probabilities in zip(streams, probabilities):
+        on_probability = stream.on_probability
+        stream.on_probability = lambda probability, on_probability=on_probability, collected=call_probabilities: (
+            collected.append(probability), on_probability(probability))
+
+    chunk_size = 2 * SAMPLE_RATE * CHUNK_MS // 1000
+    expected = len(calls_audio[0]) // (2 * FRAME_SIZES[SAMPLE_RATE])
+    start = time.perf_counter()
+    for offset in range(0, len(calls_audio[0]), chunk_size):
+        for stream, audio in zip(streams, calls_audio):
+            stream.push(audio[offset:offset + chunk_size])
+        await asyncio.sleep(0)
+    while any(len(call_probabilities) < expected for call_probabilities in probabilities):
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    for stream in streams:
+        stream.close()
+    return elapsed, np.array(probabilities)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 50, 200])
+    parser.add_argument("--seconds", type=int, default=5)
+    parser.add_argument("--model-path", default=None)
+    args = parser.parse_args()
+
+    service = await asyncio.to_thread(VADService, args.model_path, 0)
+    print(f"{'calls':>6} {'unbatched ms':>13} {'batched ms':>11} {'x audio realtime':>17} {'avg batch':>10} {'max diff':>9}")
+    for calls in args.calls:
+        calls_audio = [make_call_audio(args.seconds, seed) for seed in range(calls)]
+        unbatched_time, unbatched_probabilities = run_unbatched(service, calls_audio)
+        runs, frames = service.runs, service.frames
+        batched_time, batched_probabilities = await run_batched(service, calls_audio)
+        average_batch = (service.frames - frames) / max(service.runs - runs, 1)
+        max_difference = np.abs(unbatched_probabilities - batched_probabilities).max()
+        realtime_factor = calls * args.seconds / batched_time
+        print(f"{calls:>6} {unbatched_time * 1000:>13.1f} {batched_time * 1000:>11.1f} {realtime_factor:>17.0f} {average_batch:>10.1f} {max_difference:>9.2e}")
+    await service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
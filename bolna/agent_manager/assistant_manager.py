@@ -29,6 +29,7 @@ class AssistantManager(BaseManager):
         self.output_queue = output_queue
         self.kwargs = kwargs
         self.conversation_history = conversation_history
+        self.task_manager = None
         if kwargs.get("is_web_based_call", False):
             self.kwargs['agent_welcome_message'] = agent_config.get('agent_welcome_message', AGENT_WELCOME_MESSAGE)
         else:
@@ -52,6 +53,7 @@ class AssistantManager(BaseManager):
                                        turn_based_conversation=self.turn_based_conversation,
                                        cache=self.cache, input_queue=self.input_queue, output_queue=self.output_queue,
                                        conversation_history=self.conversation_history, **self.kwargs)
+            self.task_manager = task_manager
             await task_manager.load_prompt(self.agent_config.get("agent_name", self.agent_config.get("assistant_name")),
                                            task_id, local=local, **self.kwargs)
             task_output = await task_manager.run()
@@ -63,3 +65,9 @@ class AssistantManager(BaseManager):
             if task["task_type"] == "extraction":
                 input_parameters["extraction_details"] = task_output["extracted_data"]
         logger.info("Done with execution of the agent")
+
+    def get_pipeline_queue_stats(self):
+        """Queue counters of the task currently running, so that the server can expose them for a live call"""
+        if self.task_manager is None:
+            return {}
+        return self.task_manager.get_pipeline_queue_stats()
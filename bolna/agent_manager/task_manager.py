@@ -12,9 +12,7 @@ import base64
 import pytz
 import websockets
 
-import aiohttp
-
-from bolna.constants import ACCIDENTAL_INTERRUPTION_PHRASES, DEFAULT_USER_ONLINE_MESSAGE, DEFAULT_USER_ONLINE_MESSAGE_TRIGGER_DURATION, FILLER_DICT, DEFAULT_LANGUAGE_CODE, DEFAULT_TIMEZONE
+from bolna.constants import ACCIDENTAL_INTERRUPTION_PHRASES, DEFAULT_USER_ONLINE_MESSAGE, DEFAULT_USER_ONLINE_MESSAGE_TRIGGER_DURATION, FILLER_DICT, DEFAULT_LANGUAGE_CODE, DEFAULT_TIMEZONE, DEFAULT_SYNTHESIZER_LEAD_TIME_MS, DEFAULT_PIPELINE_QUEUE_CONFIG, DEFAULT_SPECULATIVE_GENERATION_WINDOW_MS, DEFAULT_INPUT_FRAMES_PER_BATCH, DEFAULT_AMBIENT_NOISE_FRAME_MS, DEFAULT_OUTPUT_SEND_AHEAD_MS, DEFAULT_OUTPUT_FRAME_MS
 from bolna.helpers.function_calling_helpers import trigger_api, computed_api_response
 from bolna.memory.cache.vector_cache import VectorCache
 from .base_manager import BaseManager
@@ -22,14 +20,27 @@ from bolna.agent_types import *
 from bolna.providers import *
 from bolna.prompts import *
 from bolna.helpers.utils import structure_system_prompt, compute_function_pre_call_message, get_date_time_from_timezone, get_route_info, calculate_audio_duration, create_ws_data_packet, get_file_names_in_directory, get_raw_audio_bytes, is_valid_md5, \
-    get_required_input_types, format_messages, get_prompt_responses, resample, save_audio_file_to_s3, update_prompt_with_context, get_md5_hash, clean_json_string, wav_bytes_to_pcm, convert_to_request_log, yield_chunks_from_memory, process_task_cancellation
+    get_required_input_types, format_messages, get_prompt_responses, save_audio_file_to_s3, update_prompt_with_context, get_md5_hash, clean_json_string, convert_to_request_log, yield_chunks_from_memory, process_task_cancellation, \
+    get_audio_asset, preload_audio_assets
 from bolna.helpers.logger_config import configure_logger
 from semantic_router import Route
 from semantic_router.layer import RouteLayer
 from semantic_router.encoders import FastEmbedEncoder
 
 from ..helpers.mark_event_meta_data import MarkEventMetaData
+from ..helpers.packet_meta_info import PacketMetaInfo
+from ..helpers.pipeline_queue import PipelineQueue
+from ..helpers.speculative_generation import SpeculativeGeneration
+from ..helpers import turn_tracer
+from ..helpers.turn_tracer import TurnTracer
+from ..helpers.resource_registry import resource_registry
+from ..helpers.conversation_history import ConversationHistory
 from ..helpers.observable_variable import ObservableVariable
+from ..helpers.call_recorder import CallRecorder
+from ..helpers.ambient_noise_mixer import AmbientNoiseMixer
+from ..helpers.audio_clock import AudioClock
+from ..helpers.audio_frame_normalizer import AudioFrameNormalizer
+from ..helpers.timer_wheel import get_timer_wheel
 
 logger = configure_logger(__name__)
 
@@ -74,10 +85,11 @@ class TaskManager(BaseManager):
         # TODO check if we need to toggle this based on some config
         self.yield_chunks = False
         # Set up communication queues between processes
-        self.audio_queue = asyncio.Queue()
-        self.llm_queue = asyncio.Queue()
-        self.synthesizer_queue = asyncio.Queue()
-        self.transcriber_output_queue = asyncio.Queue()
+        self.pipeline_queue_config = self.__get_pipeline_queue_config()
+        self.audio_queue = self.__create_pipeline_queue("transcriber")
+        self.llm_queue = self.__create_pipeline_queue("llm")
+        self.synthesizer_queue = self.__create_pipeline_queue("synthesizer")
+        self.transcriber_output_queue = self.__create_pipeline_queue("transcriber_output")
         self.dtmf_queue = asyncio.Queue()
         self.queues = {
             "dtmf": self.dtmf_queue,
@@ -93,6 +105,7 @@ class TaskManager(BaseManager):
         # Assistant persistance stuff
         self.assistant_id = assistant_id
         self.run_id = kwargs.get("run_id")
+        self.turn_tracer = TurnTracer(self.run_id)
 
         self.mark_event_meta_data = MarkEventMetaData()
         self.sampling_rate = 24000
@@ -105,22 +118,14 @@ class TaskManager(BaseManager):
 
         # Recording
         self.should_record = False
-        self.conversation_recording = {
-            "input": {
-                'data': b'',
-                'started': time.time()
-            },
-            "output": [],
-            "metadata": {
-                "started": 0
-            }
-        }
+        self.conversation_recording = CallRecorder()
 
         self.welcome_message_audio = self.kwargs.pop('welcome_message_audio', None)
         # Pre-decode welcome audio for faster playback
         self.preloaded_welcome_audio = base64.b64decode(self.welcome_message_audio) if self.welcome_message_audio else None
         self.observable_variables = {}
         self.output_handler_set = False
+        self.output_frame_normalizer = None
         #IO HANDLERS
         if task_id == 0:
             if self.is_web_based_call:
@@ -152,8 +157,8 @@ class TaskManager(BaseManager):
         # Agent stuff
         # Need to maintain current conversation history and overall persona/history kinda thing.
         # Soon we will maintain a separate history for this
-        self.history = [] if conversation_history is None else conversation_history
-        self.interim_history = copy.deepcopy(self.history.copy())
+        self.history = ConversationHistory(conversation_history)
+        self.interim_history = self.history.snapshot()
         self.label_flow = []
 
         # Setup IO SERVICE, TRANSCRIBER, LLM, SYNTHESIZER
@@ -250,7 +255,21 @@ class TaskManager(BaseManager):
 
         # Output stuff
         self.output_task = None
-        self.buffered_output_queue = asyncio.Queue()
+        self.buffered_output_queue = self.__create_pipeline_queue("buffered_output")
+        self.speaking_gate_event = asyncio.Event()
+
+        # Pacing of the synthesizer against the audio buffered downstream
+        self.synthesizer_lead_time = self.task_config["task_config"].get("synthesizer_lead_time_ms", DEFAULT_SYNTHESIZER_LEAD_TIME_MS) / 1000
+        self.buffered_audio_duration = 0  # seconds of audio waiting in buffered_output_queue
+        # Outbound audio is sent against a real time clock, at most `output_send_ahead_ms` ahead of what's being played
+        self.audio_clock = AudioClock(self.task_config["task_config"].get("output_send_ahead_ms", DEFAULT_OUTPUT_SEND_AHEAD_MS) / 1000)
+        # Raw audio messages longer than this (e.g. the welcome message) are paced frame by frame
+        self.output_frame_duration = self.task_config["task_config"].get("output_frame_ms", DEFAULT_OUTPUT_FRAME_MS) / 1000
+        self.audio_lead_event = asyncio.Event()
+
+        # Ambient noise bed mixed into the outbound audio, set up once the call starts
+        self.ambient_noise = False
+        self.ambient_noise_mixer = None
 
         # Memory
         self.cache = cache
@@ -262,9 +281,14 @@ class TaskManager(BaseManager):
         #setup request logs
         self.request_logs = []
         self.hangup_task = None
+        self.completion_check_task = None
 
         self.conversation_config = None
 
+        # Speculative LLM generation on stable interim transcripts
+        self.use_speculative_generation = False
+        self.speculative_generation = None
+
         if task_id == 0:
             provider_config = self.task_config["tools_config"]["synthesizer"].get("provider_config")
             self.synthesizer_voice = provider_config["voice"]
@@ -391,6 +415,11 @@ class TaskManager(BaseManager):
                 if self.ambient_noise:
                     logger.info(f"Ambient noise is True {self.ambient_noise}")
                     self.soundtrack = f"{self.conversation_config.get('ambient_noise_track', 'coffee-shop')}.wav"
+                    self.ambient_noise_gain = self.conversation_config.get("ambient_noise_gain", 1.0)
+                    self.ambient_noise_frame_duration = DEFAULT_AMBIENT_NOISE_FRAME_MS / 1000
+
+            self.use_speculative_generation = self.conversation_config.get("speculative_generation", False)
+            self.speculative_generation_window = self.conversation_config.get("speculative_generation_window_ms", DEFAULT_SPECULATIVE_GENERATION_WINDOW_MS) / 1000
 
             # Classifier for filler
             self.use_fillers = self.conversation_config.get("use_fillers", False)
@@ -403,6 +432,10 @@ class TaskManager(BaseManager):
 
         # setting transcriber and synthesizer in parallel
         self.__setup_transcriber()
+        if self._is_conversation_task() and "transcriber" in self.tools and not self.turn_based_conversation and \
+                self.conversation_config.get("preconnect_transcriber", True):
+            # The connection to the ASR is set up while the call is (prompts, synthesizer, telephony start event)
+            self.tools["transcriber"].preconnect()
         self.__setup_synthesizer(self.llm_config)
         if not self.turn_based_conversation and task_id == 0:
             self.synthesizer_monitor_task = asyncio.create_task(self.tools['synthesizer'].monitor_connection())
@@ -445,6 +478,30 @@ class TaskManager(BaseManager):
             logger.info(f"Webhook URL {webhook_url}")
             self.tools["webhook_agent"] = WebhookAgent(webhook_url=webhook_url)
 
+    def __get_pipeline_queue_config(self):
+        queue_config = {stage: dict(config) for stage, config in DEFAULT_PIPELINE_QUEUE_CONFIG.items()}
+        for stage, config in (self.task_config["task_config"].get("pipeline_queues") or {}).items():
+            if stage not in queue_config:
+                logger.warning(f"Ignoring config for unknown pipeline queue {stage}")
+                continue
+            queue_config[stage].update(config)
+        return queue_config
+
+    def __create_pipeline_queue(self, stage):
+        config = self.pipeline_queue_config[stage]
+        return PipelineQueue(stage, maxsize=config.get("maxsize", 0), policy=config.get("policy", "block"))
+
+    def get_pipeline_queue_stats(self):
+        """Depth, drop and wait time counters of every queue of the pipeline, to find the stage which is lagging behind"""
+        queues = {
+            "transcriber": self.audio_queue,
+            "llm": self.llm_queue,
+            "synthesizer": self.synthesizer_queue,
+            "transcriber_output": self.transcriber_output_queue,
+            "buffered_output": self.buffered_output_queue
+        }
+        return {stage: queue.stats() for stage, queue in queues.items()}
+
     def __is_multiagent(self):
         if self.task_config["task_type"] == "webhook":
             return False
@@ -471,7 +528,7 @@ class TaskManager(BaseManager):
 
     def __setup_routes(self, routes):
         embedding_model = routes.get("embedding_model", os.getenv("ROUTE_EMBEDDING_MODEL"))
-        route_encoder = FastEmbedEncoder(name=embedding_model)
+        route_encoder = resource_registry.get_or_create("route_encoder", embedding_model, lambda: FastEmbedEncoder(name=embedding_model))
 
         routes_list = []
         self.vector_caches = {}
@@ -533,6 +590,9 @@ class TaskManager(BaseManager):
 
             self.tools["output"] = output_handler_class(**output_kwargs)
             self.output_handler_set = True
+            if self.tools["output"].audio_format is not None:
+                self.output_frame_normalizer = AudioFrameNormalizer(self.tools["output"].audio_format, 8000,
+                                                                    self.task_config["task_config"].get("output_frame_ms", DEFAULT_OUTPUT_FRAME_MS))
             logger.info("output handler set")
         else:
             raise "Other input handlers not supported yet"
@@ -573,6 +633,9 @@ class TaskManager(BaseManager):
                     input_kwargs['queue'] = input_queue
 
                 input_kwargs["observable_variables"] = self.observable_variables
+                if self.task_config['tools_config']['input']['provider'] in SUPPORTED_INPUT_TELEPHONY_HANDLERS.keys():
+                    transcriber_config = self.task_config["tools_config"].get("transcriber") or {}
+                    input_kwargs["frames_per_batch"] = transcriber_config.get("input_frames_per_batch", DEFAULT_INPUT_FRAMES_PER_BATCH)
             self.tools["input"] = input_handler_class(**input_kwargs)
         else:
             raise "Other input handlers not supported yet"
@@ -617,15 +680,8 @@ class TaskManager(BaseManager):
                     await self.tools["output"].set_stream_sid(stream_sid)
                     self.tools["input"].update_is_audio_being_played(True)
                     convert_to_request_log(message=text, meta_info=meta_info, component="synthesizer", direction="response", model=self.synthesizer_provider, is_cached=meta_info.get("is_cached", False), engine=self.tools['synthesizer'].get_engine(), run_id=self.run_id)
-                    await self.tools["output"].handle(message)
-                    try:
-                        duration = calculate_audio_duration(len(message["data"]), self.sampling_rate,
-                                                            format=message['meta_info']['format'])
-                        self.conversation_recording['output'].append(
-                            {'data': message['data'], "start_time": time.time(), "duration": duration})
-                    except Exception as e:
-                        duration = 0.256
-                        logger.error("Exception in __forced_first_message for duration calculation: {}".format(str(e)))
+                    # Sent (paced, recorded) by the output loop like any other audio
+                    await self.__put_in_buffered_output_queue(message)
                     break
                 else:
                     logger.info(f"Stream id is still None ({stream_sid}) or output handler not set ({self.output_handler_set}), waiting...")
@@ -681,6 +737,12 @@ class TaskManager(BaseManager):
                 self.task_config["tools_config"]["synthesizer"]["audio_format"] = "mp3" # Hard code mp3 if we're connected through dashboard
                 self.task_config["tools_config"]["synthesizer"]["stream"] = True if self.enforce_streaming else False #Hardcode stream to be False as we don't want to get blocked by a __listen_synthesizer co-routine
 
+            if self.output_frame_normalizer is not None:
+                # Ask the provider for the format the output handler expects, or the cheapest to convert to it
+                provider_config["output_format"] = synthesizer_class.negotiate_output_format(self.output_frame_normalizer.target_format,
+                                                                                           self.output_frame_normalizer.sample_rate)
+                logger.info(f"Native output format of the {self.synthesizer_provider} synthesizer: {provider_config['output_format']}")
+
             self.tools["synthesizer"] = synthesizer_class(**self.task_config["tools_config"]["synthesizer"], **provider_config, **self.kwargs, caching=caching)
             # if not self.turn_based_conversation:
             #     self.synthesizer_monitor_task = asyncio.create_task(self.tools['synthesizer'].monitor_connection())
@@ -839,10 +901,8 @@ class TaskManager(BaseManager):
                 'content': ""
             }
 
-        if len(self.system_prompt['content']) == 0:
-            self.history = [] if len(self.history) == 0 else self.history
-        else:
-            self.history = [self.system_prompt] if len(self.history) == 0 else [self.system_prompt] + self.history
+        if len(self.system_prompt['content']) != 0:
+            self.history = ConversationHistory([self.system_prompt, *self.history])
 
         # If using knowledge_agent, inject the prompt into agent config so agent can read it
         try:
@@ -856,7 +916,7 @@ class TaskManager(BaseManager):
         if task_id == 0 and len(self.history) == 1 and len(self.kwargs['agent_welcome_message']) != 0:
             self.history.append({'role': 'assistant', 'content': self.kwargs['agent_welcome_message']})
 
-        self.interim_history = copy.deepcopy(self.history)
+        self.interim_history = self.history.snapshot()
 
     def __prefill_prompts(self, task, prompt, task_type):
         if self.context_data and 'recipient_data' in self.context_data and self.context_data[
@@ -933,10 +993,10 @@ class TaskManager(BaseManager):
                 spoken_so_far = self.get_partial_combined_text(cleared_mark_events_data, diff_ts)
 
                 if self.history[-1]['role'] == 'assistant':
-                    self.history[-1]['content'] = self.update_transcript_for_interruption(self.history[-1]['content'], spoken_so_far)
+                    self.history[-1] = {**self.history[-1], 'content': self.update_transcript_for_interruption(self.history[-1]['content'], spoken_so_far)}
 
                 if self.interim_history[-1]['role'] == 'assistant':
-                    self.interim_history[-1]['content'] = self.update_transcript_for_interruption(self.interim_history[-1]['content'], spoken_so_far)
+                    self.interim_history[-1] = {**self.interim_history[-1], 'content': self.update_transcript_for_interruption(self.interim_history[-1]['content'], spoken_so_far)}
 
     async def __cleanup_downstream_tasks(self):
         current_ts = time.time()
@@ -949,6 +1009,8 @@ class TaskManager(BaseManager):
             await self.sync_history(self.mark_event_meta_data.fetch_cleared_mark_event_data().items(), current_ts)
 
         self.sequence_ids = {-1}
+        self.__cancel_speculative_generation()
+        self.__cancel_completion_check()
         await self.tools["synthesizer"].flush_synthesizer_stream()
 
         #Stop the output loop first so that we do not transmit anything else
@@ -977,9 +1039,12 @@ class TaskManager(BaseManager):
         logger.info(f"Synth Task cancelled seconds")
         if not self.buffered_output_queue.empty():
             logger.info(f"Output queue was not empty and hence emptying it")
-            self.buffered_output_queue = asyncio.Queue()
+            self.__flush_buffered_output_queue()
 
         #restart output task
+        played, cut_off = self.audio_clock.interrupt()
+        logger.info(f"Interrupted after {played:.2f} seconds of audio, {cut_off:.2f} seconds already sent were cut off")
+        self.audio_lead_event.set()
         self.output_task = asyncio.create_task(self.__process_output_loop())
         self.started_transmitting_audio = False #Since we're interrupting we need to stop transmitting as well
         self.last_transmitted_timestamp = time.time()
@@ -990,7 +1055,7 @@ class TaskManager(BaseManager):
         if meta_info is None:
             meta_info = self.tools["transcriber"].get_meta_info()
             logger.info(f"Metainfo {meta_info}")
-        meta_info_copy = meta_info.copy()
+        meta_info_copy = PacketMetaInfo(meta_info)
         self.curr_sequence_id += 1
         meta_info_copy["sequence_id"] = self.curr_sequence_id
         meta_info_copy['turn_id'] = self.turn_id
@@ -1090,7 +1155,9 @@ class TaskManager(BaseManager):
             if first_item.get('text_synthesized') and first_item.get('is_final_chunk') is True:
                 break
 
-            await asyncio.sleep(0.5)
+            # The pending marks only change when a mark message comes in, or when they are cleared on interruption
+            # which the timeout covers
+            await self.tools["input"].wait_for_mark_event(timeout=0.5)
         return
 
     async def inject_digits_to_conversation(self) -> None:
@@ -1183,7 +1250,7 @@ class TaskManager(BaseManager):
 
     async def _process_conversation_preprocessed_task(self, message, sequence, meta_info):
         if self.task_config["tools_config"]["llm_agent"]['agent_flow_type'] == "preprocessed":
-            messages = copy.deepcopy(self.history)
+            messages = self.history.snapshot()
             # TODO revisit this
             messages.append({'role': 'user', 'content': message['data']})
             logger.info(f"Starting LLM Agent {messages}")
@@ -1192,7 +1259,7 @@ class TaskManager(BaseManager):
             async for next_state in self.tools['llm_agent'].generate(messages, label_flow=self.label_flow):
                 if next_state == "<end_of_conversation>":
                     meta_info["end_of_conversation"] = True
-                    self.buffered_output_queue.put_nowait(create_ws_data_packet("<end_of_conversation>", meta_info))
+                    await self.__put_in_buffered_output_queue(create_ws_data_packet("<end_of_conversation>", meta_info))
                     return
 
                 logger.info(f"Text chunk {next_state['text']}")
@@ -1202,7 +1269,7 @@ class TaskManager(BaseManager):
                         self._synthesize(create_ws_data_packet(next_state['audio'], meta_info, is_md5_hash=True))))
             logger.info(f"Interim history after the LLM task {messages}")
             self.llm_response_generated = True
-            self.interim_history = copy.deepcopy(messages)
+            self.interim_history = messages.snapshot()
             # if self.callee_silent:
             #     logger.info("When we got utterance end, maybe LLM was still generating response. So, copying into history")
             #     self.history = copy.deepcopy(self.interim_history)
@@ -1233,7 +1300,7 @@ class TaskManager(BaseManager):
         start_time = time.perf_counter()
         filler_class = self.filler_classifier.classify(message['data'])
         logger.info(f"doing the classification task in {time.perf_counter() - start_time}")
-        new_meta_info = copy.deepcopy(meta_info)
+        new_meta_info = PacketMetaInfo(meta_info)
         self.current_filler = filler_class
         should_bypass_synth = 'bypass_synth' in meta_info and meta_info['bypass_synth'] == True
         filler = random.choice((FILLER_DICT[filler_class]))
@@ -1294,17 +1361,16 @@ class TaskManager(BaseManager):
                 await self.tools["output"].handle(eos_packet)
                 return
 
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"Sending the payload to stop the conversation {payload} url {url}")
-                while self.tools["input"].is_audio_being_played_to_user():
-                    await asyncio.sleep(1)
-                convert_to_request_log(str(payload), meta_info, None, "function_call", direction="request", is_cached=False,
-                                       run_id=self.run_id)
-                async with session.post(url, json = payload) as response:
-                    response_text = await response.text()
-                    logger.info(f"Response from the server after call transfer: {response_text}")
-                    convert_to_request_log(str(response_text), meta_info, None, "function_call", direction="response", is_cached=False, run_id=self.run_id)
-                    return
+            session = resource_registry.get_aiohttp_session()
+            logger.info(f"Sending the payload to stop the conversation {payload} url {url}")
+            await self.tools["input"].wait_for_audio_playback_to_finish()
+            convert_to_request_log(str(payload), meta_info, None, "function_call", direction="request", is_cached=False,
+                                   run_id=self.run_id)
+            async with session.post(url, json = payload) as response:
+                response_text = await response.text()
+                logger.info(f"Response from the server after call transfer: {response_text}")
+                convert_to_request_log(str(response_text), meta_info, None, "function_call", direction="response", is_cached=False, run_id=self.run_id)
+                return
 
         response = await trigger_api(url=url, method=method.lower(), param=param, api_token=api_token, headers_data=headers, meta_info=meta_info, run_id=self.run_id, **resp)
         function_response = str(response)
@@ -1318,10 +1384,12 @@ class TaskManager(BaseManager):
         else:
             set_response_prompt = function_response
 
-        self.history.append({"role": "assistant", "content": None, "tool_calls": resp["model_response"]})
-        self.history.append({"role": "tool", "tool_call_id": resp.get("tool_call_id", ""), "content": function_response})
-        model_args["messages"].append({"role": "assistant", "content": None, "tool_calls": resp["model_response"]})
-        model_args["messages"].append({"role": "tool", "tool_call_id": resp.get("tool_call_id", ""), "content": function_response})
+        tool_call_messages = [
+            {"role": "assistant", "content": None, "tool_calls": resp["model_response"]},
+            {"role": "tool", "tool_call_id": resp.get("tool_call_id", ""), "content": function_response}
+        ]
+        self.history.extend(tool_call_messages)
+        model_args["messages"].extend(tool_call_messages)
 
         logger.info(f"Logging function call parameters ")
         convert_to_request_log(function_response, meta_info , None, "function_call", direction = "response", is_cached= False, run_id = self.run_id)
@@ -1349,20 +1417,17 @@ class TaskManager(BaseManager):
                 #Assuming that callee was silent
                 # self.history = copy.deepcopy(self.interim_history)
             else:
-                messages.append({"role": "assistant", "content": llm_response})
-                self.history.append({"role": "assistant", "content": llm_response})
-                self.interim_history = copy.deepcopy(messages)
+                # Appending the same message to both lets them keep sharing the log instead of copying it
+                assistant_message = {"role": "assistant", "content": llm_response}
+                messages.append(assistant_message)
+                self.history.append(assistant_message)
+                self.interim_history = messages.snapshot()
                 # if self.callee_silent:
                 #     logger.info("##### When we got utterance end, maybe LLM was still generating response. So, copying into history")
                 #     self.history = copy.deepcopy(self.interim_history)
                 #self.__update_transcripts()
 
-    async def __do_llm_generation(self, messages, meta_info, next_step, should_bypass_synth=False, should_trigger_function_call=False):
-        llm_response, function_tool, function_tool_message = '', '', ''
-        synthesize = True
-        if should_bypass_synth:
-            synthesize = False
-
+    def __inject_language_instruction(self, messages):
         # Inject language instruction based on configured mode (once detected)
         if (self.language_detected and self.conversation_language and
             self.language_injection_mode is not None and
@@ -1378,20 +1443,36 @@ class TaskManager(BaseManager):
                     # Inject once at top of system prompt
                     for i, msg in enumerate(messages):
                         if msg.get('role') == 'system':
-                            messages[i]['content'] = instruction + msg['content']
+                            messages[i] = {**msg, 'content': instruction + msg['content']}
                             logger.info(f"[system_only] Injected language instruction: {lang_name}")
                             break
                 elif self.language_injection_mode == 'per_turn':
                     # Inject before every user message
                     for i, msg in enumerate(messages):
                         if msg.get('role') == 'user':
-                            messages[i]['content'] = instruction + msg['content']
+                            messages[i] = {**msg, 'content': instruction + msg['content']}
                     logger.info(f"[per_turn] Injected language instruction to {sum(1 for m in messages if m.get('role') == 'user')} user messages: {lang_name}")
             except Exception as e:
                 logger.error(f"Exception while injecting language instruction: {e}")
 
-        async for llm_message in self.tools['llm_agent'].generate(messages, synthesize=synthesize, meta_info=meta_info):
+    async def __do_llm_generation(self, messages, meta_info, next_step, should_bypass_synth=False, should_trigger_function_call=False):
+        llm_response, function_tool, function_tool_message = '', '', ''
+        synthesize = True
+        if should_bypass_synth:
+            synthesize = False
+
+        self.__inject_language_instruction(messages)
+
+        # A speculative generation committed for this sequence id has already been streaming from the LLM
+        llm_stream = self.__take_committed_speculative_stream(meta_info)
+        if llm_stream is None:
+            llm_stream = self.tools['llm_agent'].generate(messages, synthesize=synthesize, meta_info=meta_info)
+
+        self.turn_tracer.mark(turn_tracer.LLM_REQUEST, meta_info.get("sequence_id"), meta_info.get("turn_id"))
+        async for llm_message in llm_stream:
             data, end_of_llm_stream, latency, trigger_function_call, function_tool, function_tool_message = llm_message
+            self.turn_tracer.mark(turn_tracer.LLM_FIRST_TOKEN, meta_info.get("sequence_id"))
+            self.turn_tracer.mark(turn_tracer.LLM_LAST_TOKEN, meta_info.get("sequence_id"), overwrite=True)
 
             if trigger_function_call:
                 logger.info(f"Triggering function call for {data}")
@@ -1420,9 +1501,10 @@ class TaskManager(BaseManager):
                 #filler_message = PRE_FUNCTION_CALL_MESSAGE.get(self.language, PRE_FUNCTION_CALL_MESSAGE[DEFAULT_LANGUAGE_CODE])
                 if text_chunk == filler_message:
                     logger.info("Got a pre function call message")
-                    messages.append({'role':'assistant', 'content': filler_message})
-                    self.history.append({'role': 'assistant', 'content': filler_message})
-                    self.interim_history = copy.deepcopy(messages)
+                    filler_history_message = {'role': 'assistant', 'content': filler_message}
+                    messages.append(filler_history_message)
+                    self.history.append(filler_history_message)
+                    self.interim_history = messages.snapshot()
 
                 await self._handle_llm_output(next_step, text_chunk, should_bypass_synth, meta_info)
             else:
@@ -1437,6 +1519,86 @@ class TaskManager(BaseManager):
         if self.stream and llm_response != filler_message:
             self.__store_into_history(meta_info, messages, llm_response, should_trigger_function_call= should_trigger_function_call)
 
+    def __can_speculate(self, next_task):
+        return (self.use_speculative_generation and self.stream and next_task == "llm" and self._is_conversation_task()
+                and not self.__is_multiagent() and self.route_layer is None and self.agent_type not in ["graph_agent"])
+
+    def __schedule_speculative_generation(self, next_task, transcript, meta_info):
+        # Every new interim result restarts the stability window, the previous transcript being stale by now
+        self.__cancel_speculative_generation()
+        if not self.__can_speculate(next_task) or self.tools["input"].is_audio_being_played_to_user():
+            return
+        self.speculative_generation = SpeculativeGeneration(transcript)
+        self.speculative_generation.start(self.__run_speculative_generation(self.speculative_generation, meta_info))
+
+    async def __run_speculative_generation(self, speculative_generation, meta_info):
+        await asyncio.sleep(self.speculative_generation_window)
+        if self.llm_task is not None and not self.llm_task.done():
+            return
+
+        # Provisional sequence id, dropped from sequence_ids if the final transcript turns out to be different
+        meta_info = self.__get_updated_meta_info(meta_info)
+        meta_info["origin"] = "transcriber"
+        meta_info["llm_start_time"] = time.time()
+        speculative_generation.meta_info = meta_info
+        logger.info(f"Interim transcript stable for {self.speculative_generation_window}s, speculatively generating for sequence id {meta_info['sequence_id']}: {speculative_generation.transcript}")
+
+        messages = self.history.snapshot()
+        messages.append({"role": "user", "content": speculative_generation.transcript})
+        self.__inject_language_instruction(messages)
+        await speculative_generation.consume(self.tools['llm_agent'].generate(messages, synthesize=True, meta_info=meta_info))
+
+    def __cancel_speculative_generation(self):
+        speculative_generation, self.speculative_generation = self.speculative_generation, None
+        if speculative_generation is None:
+            return
+        speculative_generation.cancel()
+        if speculative_generation.meta_info is not None:
+            self.sequence_ids.discard(speculative_generation.meta_info["sequence_id"])
+
+    def __commit_speculative_generation(self, transcript, meta_info):
+        """
+        Returns the meta_info of the speculative generation if it was started on the same transcript as the final one,
+        otherwise cancels it and returns None so that the transcript is sent to the LLM as usual.
+        """
+        speculative_generation = self.speculative_generation
+        if speculative_generation is None or speculative_generation.committed:
+            return None
+        if not speculative_generation.matches(transcript):
+            logger.info(f"Final transcript '{transcript}' differs from the speculated one '{speculative_generation.transcript}', cancelling it")
+            self.__cancel_speculative_generation()
+            return None
+
+        logger.info(f"Committing speculative generation for sequence id {speculative_generation.meta_info['sequence_id']}")
+        speculative_generation.committed = True
+        committed_meta_info = speculative_generation.meta_info
+        for key, value in meta_info.items():
+            if key not in ("sequence_id", "turn_id", "llm_start_time"):
+                committed_meta_info[key] = value
+        return committed_meta_info
+
+    def __release_committed_speculative_generation(self, meta_info):
+        """
+        Cancels the speculative generation committed for this turn if it wasn't taken over by its LLM generation, so
+        that it doesn't linger into the next turn. The sequence id stays valid, it is the turn's own.
+        """
+        speculative_generation = self.speculative_generation
+        if speculative_generation is None or not speculative_generation.committed or \
+                speculative_generation.meta_info.get("sequence_id") != meta_info.get("sequence_id"):
+            return
+        logger.info(f"Speculative generation committed for sequence id {meta_info.get('sequence_id')} wasn't used, cancelling it")
+        self.speculative_generation = None
+        speculative_generation.cancel()
+
+    def __take_committed_speculative_stream(self, meta_info):
+        speculative_generation = self.speculative_generation
+        if speculative_generation is None or not speculative_generation.committed or \
+                speculative_generation.meta_info.get("sequence_id") != meta_info.get("sequence_id"):
+            return None
+        # From now on the generation belongs to this turn's LLM task, cancelling that task cancels the generation
+        self.speculative_generation = None
+        return speculative_generation.stream()
+
     async def _process_conversation_task(self, message, sequence, meta_info):
         should_bypass_synth = 'bypass_synth' in meta_info and meta_info['bypass_synth'] is True
         next_step = self._get_next_step(sequence, "llm")
@@ -1471,10 +1633,10 @@ class TaskManager(BaseManager):
                 cache_response = self.route_responses_dict[route][relevant_utterance]
                 convert_to_request_log(message=message['data'], meta_info=meta_info, component="llm", direction="request", model=self.llm_config["model"], run_id=self.run_id)
                 convert_to_request_log(message=message['data'], meta_info=meta_info, component="llm", direction="response", model=self.llm_config["model"], is_cached=True, run_id= self.run_id)
-                messages = copy.deepcopy(self.history)
+                messages = self.history.snapshot()
                 # TODO revisit this
-                messages += [{'role': 'user', 'content': message['data']},{'role': 'assistant', 'content': cache_response}]
-                self.interim_history = copy.deepcopy(messages)
+                messages.extend([{'role': 'user', 'content': message['data']},{'role': 'assistant', 'content': cache_response}])
+                self.interim_history = messages.snapshot()
                 self.llm_response_generated = True
                 # if self.callee_silent:
                 #     logger.info("##### When we got utterance end, maybe LLM was still generating response. So, copying into history")
@@ -1493,7 +1655,7 @@ class TaskManager(BaseManager):
         else:
             if self.turn_based_conversation:
                 self.history.append({"role": "user", "content": message['data']})
-            messages = copy.deepcopy(self.history)
+            messages = self.history.snapshot()
             # messages.append({'role': 'user', 'content': message['data']})
             ### TODO CHECK IF THIS IS EVEN REQUIRED
             convert_to_request_log(message=format_messages(messages, use_system_prompt=True), meta_info=meta_info, component="llm", direction="request", model=self.llm_config["model"], run_id= self.run_id)
@@ -1503,27 +1665,54 @@ class TaskManager(BaseManager):
 
             if self.agent_type not in ["graph_agent"]:
                 if self.use_llm_to_determine_hangup and not self.turn_based_conversation:
-                    completion_res = await self.tools["llm_agent"].check_for_completion(messages, self.check_for_completion_prompt)
-                    should_hangup = (
-                        str(completion_res.get("hangup", "")).lower() == "yes"
-                        if isinstance(completion_res, dict)
-                        else False
-                    )
-
-                    prompt = [
-                            {'role': 'system', 'content': self.check_for_completion_prompt},
-                            {'role': 'user', 'content': format_messages(self.history, use_system_prompt= True)}]
-                    logger.info(f"##### Answer from the LLM {completion_res}")
-                    convert_to_request_log(message=format_messages(prompt, use_system_prompt= True), meta_info= meta_info, component="llm_hangup", direction="request", model=self.check_for_completion_llm, run_id= self.run_id)
-                    convert_to_request_log(message=completion_res, meta_info= meta_info, component="llm_hangup", direction="response", model=self.check_for_completion_llm, run_id= self.run_id)
-
-                    if should_hangup:
-                        await self.process_call_hangup()
-                        return
+                    # Runs while the response is being played so that the next user turn isn't held back by it
+                    self.__cancel_completion_check()
+                    self.completion_check_task = asyncio.create_task(self.__run_completion_check(messages, meta_info))
 
             self.llm_processed_request_ids.add(self.current_request_id)
             llm_response = ""
 
+    async def __run_completion_check(self, messages, meta_info):
+        try:
+            start_time = time.perf_counter()
+            completion_res = await self.tools["llm_agent"].check_for_completion(messages, self.check_for_completion_prompt)
+            completion_check_latency = (time.perf_counter() - start_time) * 1000
+            should_hangup = (
+                str(completion_res.get("hangup", "")).lower() == "yes"
+                if isinstance(completion_res, dict)
+                else False
+            )
+
+            prompt = [
+                    {'role': 'system', 'content': self.check_for_completion_prompt},
+                    {'role': 'user', 'content': format_messages(self.history, use_system_prompt= True)}]
+            logger.info(f"##### Answer from the LLM {completion_res} in {completion_check_latency} ms")
+            convert_to_request_log(message=format_messages(prompt, use_system_prompt= True), meta_info= meta_info, component="llm_hangup", direction="request", model=self.check_for_completion_llm, run_id= self.run_id)
+            convert_to_request_log(message=completion_res, meta_info= meta_info, component="llm_hangup", direction="response", model=self.check_for_completion_llm, run_id= self.run_id)
+            self.__record_completion_check_latency(meta_info.get("sequence_id"), completion_check_latency)
+
+            if should_hangup and meta_info.get("sequence_id") in self.sequence_ids and not self.hangup_triggered:
+                # Detach from the task first as hanging up cleans up the downstream tasks, which would cancel this one
+                self.completion_check_task = None
+                await self.process_call_hangup()
+        except Exception as e:
+            # Nothing awaits this task, its errors would otherwise only surface when it's garbage collected
+            traceback.print_exc()
+            logger.error(f"Error while checking for completion: {e}")
+
+    def __record_completion_check_latency(self, sequence_id, completion_check_latency):
+        for latency in reversed(self.llm_latencies['turn_latencies']):
+            if latency.get('sequence_id') == sequence_id:
+                latency['completion_check_latency_ms'] = completion_check_latency
+                return
+        self.llm_latencies['turn_latencies'].append({'sequence_id': sequence_id, 'completion_check_latency_ms': completion_check_latency})
+
+    def __cancel_completion_check(self):
+        if self.completion_check_task is not None and not self.completion_check_task.done():
+            logger.info("Cancelling the completion check of the previous turn")
+            self.completion_check_task.cancel()
+        self.completion_check_task = None
+
     async def process_call_hangup(self):
         if not self.call_hangup_message:
             await self.__process_end_of_conversation()
@@ -1573,6 +1762,9 @@ class TaskManager(BaseManager):
         except Exception as e:
             traceback.print_exc()
             logger.error(f"Something went wrong in llm: {e}")
+        finally:
+            # The turn may have been answered without the LLM generation (routes, early returns, errors)
+            self.__release_committed_speculative_generation(meta_info)
 
 
     #################################################################
@@ -1631,38 +1823,45 @@ class TaskManager(BaseManager):
             logger.info(f"Conversation language detected: {self.conversation_language} (total counts: {self.language_word_counts})")
 
     async def _handle_transcriber_output(self, next_task, transcriber_message, meta_info):
-        current_ts = self.tools["input"].get_current_mark_started_time()
-        self.previous_start_ts = self.current_start_ts
-        self.current_start_ts = current_ts
+        handed_to_llm = False
+        try:
+            current_ts = self.tools["input"].get_current_mark_started_time()
+            self.previous_start_ts = self.current_start_ts
+            self.current_start_ts = current_ts
 
-        if not self.tools["input"].welcome_message_played() and len(self.history) > 2:
-            logger.info(f"Welcome message is playing while spoken: {transcriber_message}")
-            return
+            if not self.tools["input"].welcome_message_played() and len(self.history) > 2:
+                logger.info(f"Welcome message is playing while spoken: {transcriber_message}")
+                return
 
-        if self.current_start_ts == self.previous_start_ts and not self.tools['input'].is_audio_being_played_to_user():
-            logger.info(f"handle_transcriber_output -> skip as previous user message {self.history[-1]}")
-            return
+            if self.current_start_ts == self.previous_start_ts and not self.tools['input'].is_audio_being_played_to_user():
+                logger.info(f"handle_transcriber_output -> skip as previous user message {self.history[-1]}")
+                return
 
-        # Detect conversation language from first N turns
-        self._detect_conversation_language(meta_info)
+            # Detect conversation language from first N turns
+            self._detect_conversation_language(meta_info)
 
-        self.history.append({"role": "user", "content": transcriber_message})
+            self.history.append({"role": "user", "content": transcriber_message})
 
-        convert_to_request_log(message=transcriber_message, meta_info=meta_info, model=self.task_config["tools_config"]["transcriber"]["provider"], run_id= self.run_id)
-        if next_task == "llm":
-            logger.info(f"Running llm Tasks")
-            meta_info["origin"] = "transcriber"
-            transcriber_package = create_ws_data_packet(transcriber_message, meta_info)
-            self.llm_task = asyncio.create_task(
-                self._run_llm_task(transcriber_package))
-            if self.use_fillers:
-                self.filler_task = asyncio.create_task(self.__filler_classification_task(transcriber_package))
+            convert_to_request_log(message=transcriber_message, meta_info=meta_info, model=self.task_config["tools_config"]["transcriber"]["provider"], run_id= self.run_id)
+            if next_task == "llm":
+                logger.info(f"Running llm Tasks")
+                meta_info["origin"] = "transcriber"
+                transcriber_package = create_ws_data_packet(transcriber_message, meta_info)
+                self.llm_task = asyncio.create_task(
+                    self._run_llm_task(transcriber_package))
+                handed_to_llm = True
+                if self.use_fillers:
+                    self.filler_task = asyncio.create_task(self.__filler_classification_task(transcriber_package))
 
-        elif next_task == "synthesizer":
-            self.synthesizer_tasks.append(asyncio.create_task(
-                self._synthesize(create_ws_data_packet(transcriber_message, meta_info))))
-        else:
-            logger.info(f"Need to separate out output task")
+            elif next_task == "synthesizer":
+                self.synthesizer_tasks.append(asyncio.create_task(
+                    self._synthesize(create_ws_data_packet(transcriber_message, meta_info))))
+            else:
+                logger.info(f"Need to separate out output task")
+        finally:
+            # A committed speculative generation is taken over by the LLM task, otherwise nothing will ever use it
+            if not handed_to_llm:
+                self.__release_committed_speculative_generation(meta_info)
 
     async def _listen_transcriber(self):
         temp_transcriber_message = ""
@@ -1730,6 +1929,10 @@ class TaskManager(BaseManager):
                         # TODO check where this needs to be added post understanding it's usage
                         self.let_remaining_audio_pass_through = False
                         self.llm_response_generated = False
+                        self.__notify_speaking_gate()
+
+                        if self.use_speculative_generation:
+                            self.__schedule_speculative_generation(next_task, temp_transcriber_message, meta_info)
 
                     # Whenever speech_final or UtteranceEnd is received from Deepgram, this condition would get triggered
                     elif isinstance(message.get("data"), dict) and message["data"].get("type", "") == "transcript":
@@ -1759,9 +1962,18 @@ class TaskManager(BaseManager):
                         self.time_since_first_interim_result = -1
                         self.required_delay_before_speaking = max(
                             self.minimum_wait_duration - self.incremental_delay, 0) if len(self.history) > 2 else 0
+                        self.__notify_speaking_gate()
 
                         transcriber_message = message["data"].get("content")
-                        meta_info = self.__get_updated_meta_info(meta_info)
+                        meta_info = self.__commit_speculative_generation(transcriber_message, meta_info) or self.__get_updated_meta_info(meta_info)
+                        # Send time of the audio frame the transcript ends in, as the transcriber looked it up for its latency
+                        audio_sent_at = getattr(self.tools["transcriber"], "last_result_audio_sent_at", None)
+                        if audio_sent_at is not None:
+                            self.turn_tracer.mark(turn_tracer.ASR_LAST_AUDIO_SENT, meta_info["sequence_id"], self.turn_id,
+                                                  timestamp=self.turn_tracer.from_wall_clock(audio_sent_at / 1000))
+                            # Not carried over to a next transcript which wasn't looked up (e.g. force-finalized)
+                            self.tools["transcriber"].last_result_audio_sent_at = None
+                        self.turn_tracer.mark(turn_tracer.FINAL_TRANSCRIPT, meta_info["sequence_id"], self.turn_id)
                         await self._handle_transcriber_output(next_task, transcriber_message, meta_info)
 
                     elif message["data"] == "transcriber_connection_closed":
@@ -1798,9 +2010,8 @@ class TaskManager(BaseManager):
     #################################################################
     # Synthesizer task
     #################################################################
-    def __enqueue_chunk(self, chunk, i, number_of_chunks, meta_info):
-        meta_info['chunk_id'] = i
-        copied_meta_info = copy.deepcopy(meta_info)
+    async def __enqueue_chunk(self, chunk, i, number_of_chunks, meta_info, audio_format=None):
+        copied_meta_info = PacketMetaInfo(meta_info, {'chunk_id': i} if audio_format is None else {'chunk_id': i, 'format': audio_format})
         if i == 0 and "is_first_chunk" in meta_info and meta_info["is_first_chunk"]:
             logger.info("Sending first chunk")
             copied_meta_info["is_first_chunk_of_entire_response"] = True
@@ -1814,7 +2025,7 @@ class TaskManager(BaseManager):
             copied_meta_info["is_first_chunk_of_entire_response"] = True
             copied_meta_info["is_final_chunk_of_entire_response"] = True
 
-        self.buffered_output_queue.put_nowait(create_ws_data_packet(chunk, copied_meta_info))
+        await self.__put_in_buffered_output_queue(create_ws_data_packet(chunk, copied_meta_info))
 
     def is_sequence_id_in_current_ids(self, sequence_id):
         return sequence_id in self.sequence_ids
@@ -1839,19 +2050,32 @@ class TaskManager(BaseManager):
                         # Check if the message is valid to process
                         if is_first_message or (not self.conversation_ended and sequence_id in self.sequence_ids):
                             logger.info(f"Processing message with sequence_id: {sequence_id}")
+                            self.turn_tracer.mark(turn_tracer.TTS_FIRST_BYTE, sequence_id)
 
                             if self.stream:
                                 if meta_info.get("is_first_chunk", False):
                                     first_chunk_generation_timestamp = time.time()
 
-                                if self.tools["output"].process_in_chunks(self.yield_chunks):
+                                # Native streams which aren't in the format of the output (e.g. another sample rate) are always converted
+                                native_sample_rate = meta_info.get('sample_rate', None)
+                                if self.output_frame_normalizer is not None and (self.tools["output"].process_in_chunks(self.yield_chunks) or (
+                                        native_sample_rate is not None and not self.output_frame_normalizer.is_target_format(meta_info.get('format'), native_sample_rate))):
+                                    end_of_stream = sequence_id == -1 or meta_info.get("end_of_synthesizer_stream", False)
+                                    frames = self.output_frame_normalizer.process(message['data'], meta_info.get('format', 'wav'), native_sample_rate or self.sampling_rate,
+                                                                                  sequence_id, end_of_stream)
+                                    if not frames and meta_info.get("is_first_chunk", False):
+                                        # The first audio of a response goes out right away, even if short of a frame
+                                        frames = self.output_frame_normalizer.drain()
+                                    for chunk_idx, chunk in enumerate(frames):
+                                        await self.__enqueue_chunk(chunk, chunk_idx, len(frames), meta_info, self.output_frame_normalizer.target_format)
+                                elif self.tools["output"].process_in_chunks(self.yield_chunks):
                                     number_of_chunks = math.ceil(len(message['data']) / self.output_chunk_size)
                                     for chunk_idx, chunk in enumerate(
                                             yield_chunks_from_memory(message['data'], chunk_size=self.output_chunk_size)
                                     ):
-                                        self.__enqueue_chunk(chunk, chunk_idx, number_of_chunks, meta_info)
+                                        await self.__enqueue_chunk(chunk, chunk_idx, number_of_chunks, meta_info)
                                 else:
-                                    self.buffered_output_queue.put_nowait(message)
+                                    await self.__put_in_buffered_output_queue(message)
                             else:
                                 # Non-streaming output
                                 logger.info("Stream not enabled, sending entire audio")
@@ -1873,11 +2097,8 @@ class TaskManager(BaseManager):
                         else:
                             logger.info(f"Skipping message with sequence_id: {sequence_id}")
 
-                        # Give control to other tasks
-                        sleep_time = 0.2
-                        if self.synthesizer_provider in ('cartesia', 'rime', 'sarvam', 'azuretts'):
-                            sleep_time = 0.01
-                        await asyncio.sleep(sleep_time)
+                        # Stay just ahead of playback instead of pulling the whole response in at once
+                        await self.__wait_for_audio_lead()
 
                 except asyncio.CancelledError:
                     logger.info("Synthesizer task was cancelled.")
@@ -1898,7 +2119,7 @@ class TaskManager(BaseManager):
             await self.tools["synthesizer"].cleanup()
 
     async def __send_preprocessed_audio(self, meta_info, text):
-        meta_info = copy.deepcopy(meta_info)
+        meta_info = PacketMetaInfo(meta_info)
         yield_in_chunks = self.yield_chunks
         try:
             #TODO: Either load IVR audio into memory before call or user s3 iter_cunks
@@ -1916,11 +2137,9 @@ class TaskManager(BaseManager):
             else:
                 if meta_info.get('message_category', None ) == 'filler':
                     logger.info(f"Getting {text} filler from local fs")
-                    audio = await get_raw_audio_bytes(f'{self.filler_preset_directory}/{text}.wav', local= True, is_location=True)
                     yield_in_chunks = False
                     if not self.turn_based_conversation and self.task_config['tools_config']['output'] != "default":
-                        logger.info(f"Got to convert it to pcm")
-                        audio_chunk = wav_bytes_to_pcm(resample(audio, format = "wav", target_sample_rate = 8000 ))
+                        audio_chunk = await get_audio_asset(f'{self.filler_preset_directory}/{text}.wav', 8000, "pcm")
                         meta_info["format"] = "pcm"
                 else:
                     start_time = time.perf_counter()
@@ -1930,7 +2149,7 @@ class TaskManager(BaseManager):
                     logger.info(f"Time to get response from S3 {time.perf_counter() - start_time }")
                     if not self.buffered_output_queue.empty():
                         logger.info(f"Output queue was not empty and hence emptying it")
-                        self.buffered_output_queue = asyncio.Queue()
+                        self.__flush_buffered_output_queue()
                     meta_info["format"] = "pcm"
                     if 'message_category' in meta_info and meta_info['message_category'] == "agent_welcome_message":
                         if audio_chunk is None:
@@ -1946,14 +2165,14 @@ class TaskManager(BaseManager):
                     number_of_chunks = math.ceil(len(audio_chunk) / 100000000)
                     logger.info(f"Audio chunk size {len(audio_chunk)}, chunk size {100000000}")
                     for chunk in yield_chunks_from_memory(audio_chunk, chunk_size=100000000):
-                        self.__enqueue_chunk(chunk, i, number_of_chunks, meta_info)
+                        await self.__enqueue_chunk(chunk, i, number_of_chunks, meta_info)
                         i += 1
                 elif audio_chunk is not None:
                     meta_info['chunk_id'] = 1
                     meta_info["is_first_chunk_of_entire_response"] = True
                     meta_info["is_final_chunk_of_entire_response"] = True
                     message = create_ws_data_packet(audio_chunk, meta_info)
-                    self.buffered_output_queue.put_nowait(message)
+                    await self.__put_in_buffered_output_queue(message)
 
         except Exception as e:
             traceback.print_exc()
@@ -1980,6 +2199,7 @@ class TaskManager(BaseManager):
                         await self.__send_preprocessed_audio(meta_info, get_md5_hash(text))
                     else:
                         self.synthesizer_characters += len(text)
+                        self.turn_tracer.mark(turn_tracer.TTS_REQUEST, meta_info.get("sequence_id"), meta_info.get("turn_id"))
                         await self.tools["synthesizer"].push(message)
                 else:
                     logger.info("other synthesizer models not supported yet")
@@ -2000,6 +2220,7 @@ class TaskManager(BaseManager):
         next_task = self._get_next_step(sequence, "transcriber")
         await self._handle_transcriber_output(next_task, message, meta_info)
         self.time_since_first_interim_result = (time.time() * 1000) - 1000
+        self.__notify_speaking_gate()
 
     """
     When the welcome message is playing we accumulate the transcript in the self.transcriber_message variable and once 
@@ -2007,61 +2228,178 @@ class TaskManager(BaseManager):
     """
     async def __handle_accumulated_message(self):
         logger.info("Setting up __handle_accumulated_message function")
+        await self.tools["input"].wait_for_welcome_message_played()
+        logger.info(f"Welcome message has been played")
+        self.first_message_passing_time = time.time()
+        if len(self.transcriber_message):
+            logger.info(f"Sending the accumulated transcribed message - {self.transcriber_message}")
+            await self.__send_first_message(self.transcriber_message)
+            self.transcriber_message = ""
+        self.handle_accumulated_message_task = None
+
+    def __notify_speaking_gate(self):
+        # Wakes the output loop up so that it re-evaluates the speaking deadline
+        self.speaking_gate_event.set()
+
+    def __get_remaining_speaking_delay(self):
+        if self.time_since_first_interim_result == -1:
+            return 0
+        if not self.let_remaining_audio_pass_through and not self.tools["input"].welcome_message_played():
+            return 0
+        time_since_first_interim_result = (time.time() * 1000) - self.time_since_first_interim_result
+        return max(self.required_delay_before_speaking - time_since_first_interim_result, 0)
+
+    async def __wait_until_allowed_to_speak(self):
+        """
+        Holds the output loop until `required_delay_before_speaking` has elapsed since the first interim result.
+        The deadline is re-armed whenever the transcriber moves it, so there's no polling involved.
+        """
         while True:
-            if self.tools["input"].welcome_message_played():
-                logger.info(f"Welcome message has been played")
-                self.first_message_passing_time = time.time()
-                if len(self.transcriber_message):
-                    logger.info(f"Sending the accumulated transcribed message - {self.transcriber_message}")
-                    await self.__send_first_message(self.transcriber_message)
-                    self.transcriber_message = ""
-                break
+            self.speaking_gate_event.clear()
+            remaining_delay = self.__get_remaining_speaking_delay()
+            if remaining_delay <= 0:
+                return
+            logger.info(f"##### Got to wait {remaining_delay} ms more before speaking. self.time_since_first_interim_result {self.time_since_first_interim_result}")
+            try:
+                await asyncio.wait_for(self.speaking_gate_event.wait(), timeout=remaining_delay / 1000)
+            except asyncio.TimeoutError:
+                pass
+
+    def __flush_buffered_output_queue(self):
+        self.buffered_output_queue.clear()
+        self.buffered_audio_duration = 0
+        self.audio_lead_event.set()
+
+    def __get_audio_duration(self, message):
+        if not isinstance(message.get('data'), (bytes, bytearray, memoryview)):
+            return 0
+        try:
+            return calculate_audio_duration(len(message['data']), self.sampling_rate, format=message['meta_info'].get('format', 'wav'))
+        except Exception:
+            return 0
 
-            await asyncio.sleep(0.1)
-        self.handle_accumulated_message_task = None
+    async def __put_in_buffered_output_queue(self, message):
+        self.buffered_audio_duration += self.__get_audio_duration(message)
+        await self.buffered_output_queue.put(message)
+
+    async def __wait_for_audio_lead(self):
+        """
+        Waits until the audio buffered downstream (queued for output plus handed over but not yet played) falls below
+        `synthesizer_lead_time`. Audio handed over drains with the clock, queued audio only once the output loop picks it up.
+        """
+        while True:
+            self.audio_lead_event.clear()
+            playback_lead = self.audio_clock.buffered()
+            excess_lead = self.buffered_audio_duration + playback_lead - self.synthesizer_lead_time
+            if excess_lead <= 0:
+                # Give control to other tasks
+                await asyncio.sleep(0)
+                return
+            timeout = excess_lead if excess_lead <= playback_lead else None
+            try:
+                await asyncio.wait_for(self.audio_lead_event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
 
     #Currently this loop only closes in case of interruption
     # but it shouldn't be the case.
+    async def __get_next_output_message(self):
+        """
+        Next message of the buffered output queue. With ambient noise, the silence until it arrives is filled with
+        ambient noise frames, each sent shortly before the audio handed over so far finishes playing.
+        """
+        while True:
+            if not self.ambient_noise:
+                return await self.buffered_output_queue.get()
+            # wait_for with a zero timeout gives up before the get runs, even when a message is already queued
+            if not self.buffered_output_queue.empty():
+                return self.buffered_output_queue.get_nowait()
+            if self.ambient_noise_mixer is None:
+                # The mixer is still being set up
+                timeout = self.ambient_noise_frame_duration
+            else:
+                timeout = self.audio_clock.buffered() - self.ambient_noise_frame_duration / 2
+                if timeout <= 0:
+                    await self.__send_ambient_noise_frame()
+                    continue
+            try:
+                return await asyncio.wait_for(self.buffered_output_queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if self.ambient_noise_mixer is not None:
+                    await self.__send_ambient_noise_frame()
+
+    def __split_into_frames(self, message):
+        """
+        Raw audio (mu-law or PCM) longer than `output_frame_duration` split into frames, so that the audio clock paces
+        it frame by frame. Only the first frame is the first chunk and only the last one ends the stream (and carries
+        the mark_id), other formats are sent as they are.
+        """
+        data = message.get('data')
+        meta_info = message['meta_info']
+        audio_format = meta_info.get('format', 'wav')
+        if not isinstance(data, (bytes, bytearray, memoryview)) or audio_format not in ('mulaw', 'pcm') or bytes(data[:4]) == b'RIFF':
+            return [message]
+        frame_size = max(1, int(self.sampling_rate * self.output_frame_duration)) * (1 if audio_format == 'mulaw' else 2)
+        if len(data) <= frame_size:
+            return [message]
+
+        offsets = range(0, len(data), frame_size)
+        frames = []
+        for index, offset in enumerate(offsets):
+            overrides = {}
+            if index > 0:
+                overrides.update({'is_first_chunk': False, 'is_first_chunk_of_entire_response': False})
+            if index < len(offsets) - 1:
+                overrides.update({'end_of_llm_stream': False, 'end_of_synthesizer_stream': False,
+                                  'is_final_chunk_of_entire_response': False, 'mark_id': None})
+            frames.append(create_ws_data_packet(data[offset:offset + frame_size], PacketMetaInfo(meta_info, overrides)))
+        return frames
+
+    async def __send_output_frames(self, message):
+        """Sends a message frame by frame against the audio clock, returns False if it was interrupted midway"""
+        sequence_id = message["meta_info"]["sequence_id"]
+        for frame in self.__split_into_frames(message):
+            await self.audio_clock.wait_for_send_window()
+            # The response may have been interrupted while waiting for the send window
+            if sequence_id not in self.sequence_ids:
+                logger.info(f'{sequence_id} was interrupted while waiting to be sent and hence not speaking')
+                return False
+            duration = self.__get_audio_duration(frame)
+            self.buffered_audio_duration = max(self.buffered_audio_duration - duration, 0)
+            self.tools["input"].update_is_audio_being_played(True)
+            if self.ambient_noise_mixer is not None and isinstance(frame['data'], (bytes, bytearray, memoryview)):
+                frame['data'] = self.ambient_noise_mixer.mix(frame['data'], frame['meta_info'].get('format', 'wav'))
+            await self.tools["output"].handle(frame)
+            self.turn_tracer.mark(turn_tracer.FIRST_AUDIO_SENT, sequence_id)
+            self.turn_tracer.mark(turn_tracer.LAST_AUDIO_SENT, sequence_id, overwrite=True)
+            self.audio_clock.on_sent(duration, sequence_id)
+            self.audio_lead_event.set()
+            if self.should_record:
+                try:
+                    self.conversation_recording.record_output(frame['data'], frame['meta_info'].get('format', 'wav'), self.sampling_rate)
+                except Exception as e:
+                    logger.info("Exception in __process_output_loop: {}".format(str(e)))
+        return True
+
     async def __process_output_loop(self):
         try:
             while True:
-                if (not self.let_remaining_audio_pass_through) and self.tools["input"].welcome_message_played():
-                    time_since_first_interim_result = (time.time() * 1000) - self.time_since_first_interim_result if self.time_since_first_interim_result != -1 else -1
-                    logger.info(f"##### It's been {time_since_first_interim_result} ms since first  interim result and required time to wait for it is {self.required_delay_before_speaking}. Hence sleeping for 100ms. self.time_since_first_interim_result {self.time_since_first_interim_result}")
-                    if time_since_first_interim_result != -1 and time_since_first_interim_result < self.required_delay_before_speaking:
-                        await asyncio.sleep(0.1) #sleep for 100ms and continue
-                        continue
-                    else:
-                        logger.info(f"First interim result hasn't been gotten yet and hence sleeping ")
-                        await asyncio.sleep(0.1)
-
-                    logger.info(f"##### Got to wait {self.required_delay_before_speaking} ms before speaking and alreasy waited {time_since_first_interim_result} since the first interim result")
-
-                elif self.let_remaining_audio_pass_through:
-                    time_since_first_interim_result = (time.time() *1000)- self.time_since_first_interim_result if self.time_since_first_interim_result != -1 else -1
-                    logger.info(f"##### In elif been {time_since_first_interim_result} ms since first  interim result and required time to wait for it is {self.required_delay_before_speaking}. Hence sleeping for 100ms. self.time_since_first_interim_result {self.time_since_first_interim_result}")
-                    if time_since_first_interim_result != -1 and time_since_first_interim_result < self.required_delay_before_speaking:
-                        await asyncio.sleep(0.1) #sleep for 100ms and continue
-                        continue
-                else:
-                    logger.info(f"Started transmitting at {time.time()}")
-
-                message = await self.buffered_output_queue.get()
+                message = await self.__get_next_output_message()
+                await self.__wait_until_allowed_to_speak()
+                logger.info(f"Started transmitting at {time.time()}")
 
                 if "end_of_conversation" in message['meta_info']:
                     await self.__process_end_of_conversation()
 
-                if 'sequence_id' in message['meta_info'] and message["meta_info"]["sequence_id"] in self.sequence_ids:
-                    self.tools["input"].update_is_audio_being_played(True)
-                    await self.tools["output"].handle(message)
-                    try:
-                        duration = calculate_audio_duration(len(message["data"]), self.sampling_rate, format = message['meta_info']['format'])
-                        self.conversation_recording['output'].append({'data': message['data'], "start_time": time.time(), "duration": duration})
-                    except Exception as e:
-                        duration = 0.256
-                        logger.info("Exception in __process_output_loop: {}".format(str(e)))
-                else:
-                    logger.info(f'{message["meta_info"]["sequence_id"]} is not in {self.sequence_ids} and hence not speaking')
+                should_speak = 'sequence_id' in message['meta_info'] and message["meta_info"]["sequence_id"] in self.sequence_ids
+                if not should_speak:
+                    logger.info(f'{message["meta_info"].get("sequence_id")} is not in {self.sequence_ids} and hence not speaking')
+                    self.buffered_audio_duration = max(self.buffered_audio_duration - self.__get_audio_duration(message), 0)
+                    self.audio_lead_event.set()
+                    continue
+
+                if not await self.__send_output_frames(message):
+                    self.audio_lead_event.set()
                     continue
 
                 if (message['meta_info'].get("end_of_llm_stream", False) or message['meta_info'].get("end_of_synthesizer_stream", False)) and \
@@ -2108,8 +2446,16 @@ class TaskManager(BaseManager):
 
     async def __check_for_completion(self):
         logger.info(f"Starting task to check for completion")
+        # Instead of polling, the task sleeps on the timer wheel until the next point at which the call could have to
+        # be hung up or the user asked if they're still there, checking again every 2 seconds while that can't be told
+        timer_wheel = get_timer_wheel()
+        check_interval = 2
+        delay = check_interval
         while True:
-            await asyncio.sleep(2)
+            if self.is_web_based_call:
+                delay = min(delay, int(self.task_config["task_config"]["call_terminate"]) - (time.time() - self.start_time))
+            await timer_wheel.sleep(max(delay, 0.1))
+            delay = check_interval
 
             if self.is_web_based_call and time.time() - self.start_time >= int(
                     self.task_config["task_config"]["call_terminate"]):
@@ -2155,15 +2501,26 @@ class TaskManager(BaseManager):
             else:
                 logger.info(f"Only {time_since_last_spoken_ai_word} seconds since last spoken time stamp and hence not cutting the phone call")
 
+            # Speech only pushes these points back, and once the user was asked the question can only come back
+            # after someone speaks again, i.e. no sooner than trigger_user_online_message_after from now
+            time_since_last_speech = min(time_since_last_spoken_ai_word, time_since_user_last_spoke)
+            delay = self.trigger_user_online_message_after
+            if self.hang_conversation_after > 0:
+                delay = min(delay, self.hang_conversation_after - time_since_last_speech)
+            if not self.asked_if_user_is_still_there:
+                delay = min(delay, self.trigger_user_online_message_after - time_since_last_speech)
+
     async def __check_for_backchanneling(self):
+        if not self.turn_based_conversation:
+            await preload_audio_assets(self.backchanneling_audios, 8000, "pcm")
         while True:
             if self.callee_speaking and time.time() - self.callee_speaking_start_time > self.backchanneling_start_delay:
                 filename = random.choice(self.filenames)
                 logger.info(f"Should send a random backchanneling words and sending them {filename}")
-                audio = await get_raw_audio_bytes(f"{self.backchanneling_audios}/{filename}", local= True, is_location=True)
                 if not self.turn_based_conversation and self.task_config['tools_config']['output'] != "default":
-                    audio = resample(audio, target_sample_rate= 8000, format="wav")
-                    audio = wav_bytes_to_pcm(audio)
+                    audio = await get_audio_asset(f"{self.backchanneling_audios}/{filename}", 8000, "pcm")
+                else:
+                    audio = await get_raw_audio_bytes(f"{self.backchanneling_audios}/{filename}", local= True, is_location=True)
                 await self.tools["output"].handle(create_ws_data_packet(audio, self.__get_updated_meta_info()))
             else:
                 logger.info(f"Callee isn't speaking and hence not sending or {time.time() - self.callee_speaking_start_time} is not greater than {self.backchanneling_start_delay}")
@@ -2221,33 +2578,30 @@ class TaskManager(BaseManager):
         except Exception as e:
             logger.error(f"Exception in __first_message {str(e)}")
 
-    async def __start_transmitting_ambient_noise(self):
+    async def __setup_ambient_noise_mixer(self):
+        """
+        Ambient noise is mixed into the outbound audio by the output loop, which also fills the silence in between
+        with it, so it takes no extra stream nor polling
+        """
         try:
-            audio = await get_raw_audio_bytes(f'{os.getenv("AMBIENT_NOISE_PRESETS_DIR")}/{self.soundtrack}', local=True, is_location=True)
-            audio = resample(audio, self.sampling_rate, format = "wav")
-            if self.task_config["tools_config"]["output"]["provider"] in SUPPORTED_OUTPUT_TELEPHONY_HANDLERS.keys():
-                audio = wav_bytes_to_pcm(audio)
-            logger.info(f"Length of audio {len(audio)} {self.sampling_rate}")
+            bed = await get_audio_asset(f'{os.getenv("AMBIENT_NOISE_PRESETS_DIR")}/{self.soundtrack}', self.sampling_rate, "pcm")
+            logger.info(f"Length of audio {len(bed)} {self.sampling_rate}")
             # TODO whenever this feature is redone ensure to have a look at the metadata of other messages which have the sequence_id of -1. Fields such as end_of_synthesizer_stream and end_of_llm_stream would need to be added here
             if self.should_record:
-                meta_info={'io': 'default', 'message_category': 'ambient_noise', "request_id": str(uuid.uuid4()), "sequence_id": -1, "type":'audio', 'format': 'wav'}
+                self.ambient_noise_meta_info = {'io': 'default', 'message_category': 'ambient_noise', "request_id": str(uuid.uuid4()), "sequence_id": -1, "type":'audio', 'format': 'wav'}
             else:
-
-                meta_info={'io': self.tools["output"].get_provider(), 'message_category': 'ambient_noise', 'stream_sid': self.stream_sid , "request_id": str(uuid.uuid4()), "cached": True, "type":'audio', "sequence_id": -1, 'format': 'pcm'}
-            while True:
-                logger.info(f"Before yielding ambient noise")
-                for chunk in yield_chunks_from_memory(audio, self.output_chunk_size*2):
-                    # Only play ambient noise if no content is being transmitted
-                    # Check if any real content audio (sequence_id > 0) is being played
-                    is_content_playing = self.tools["input"].is_audio_being_played_to_user()
-                    
-                    if not is_content_playing:
-                        logger.info(f"Transmitting ambient noise {len(chunk)}")
-                        await self.tools["output"].handle(create_ws_data_packet(chunk, meta_info=meta_info))
-                    logger.info("Sleeping for 800 ms")
-                    await asyncio.sleep(0.5)
+                self.ambient_noise_meta_info = {'io': self.tools["output"].get_provider(), 'message_category': 'ambient_noise', 'stream_sid': self.stream_sid , "request_id": str(uuid.uuid4()), "cached": True, "type":'audio', "sequence_id": -1, 'format': 'pcm'}
+            self.ambient_noise_mixer = AmbientNoiseMixer(bed, self.sampling_rate, self.ambient_noise_gain)
         except Exception as e:
-            logger.error(f"Something went wrong while transmitting noise {e}")
+            logger.error(f"Something went wrong while setting up ambient noise {e}")
+            # The output loop goes back to waiting for the agent's audio only
+            self.ambient_noise = False
+
+    async def __send_ambient_noise_frame(self):
+        duration = self.ambient_noise_frame_duration
+        frame = self.ambient_noise_mixer.next_frame(duration, self.ambient_noise_meta_info['format'])
+        await self.tools["output"].handle(create_ws_data_packet(frame, meta_info=self.ambient_noise_meta_info))
+        self.audio_clock.on_sent(duration, -1)
 
     async def handle_init_event(self, init_meta_data):
         """
@@ -2268,7 +2622,7 @@ class TaskManager(BaseManager):
                 system_prompt = self.system_prompt['content']
                 system_prompt = update_prompt_with_context(system_prompt, self.context_data)
                 self.system_prompt['content'] = system_prompt
-                self.history[0]['content'] = system_prompt
+                self.history[0] = {**self.history[0], 'content': system_prompt}
 
             if self.call_hangup_message and self.context_data:
                 self.call_hangup_message = update_prompt_with_context(self.call_hangup_message, self.context_data)
@@ -2278,7 +2632,7 @@ class TaskManager(BaseManager):
             logger.info(f"Updated agent welcome message after context data replacement - {agent_welcome_message}")
             self.kwargs["agent_welcome_message"] = agent_welcome_message
             if len(self.history) == 2 and agent_welcome_message and self.history[1]["role"] == "assistant":
-                self.history[1]["content"] = agent_welcome_message
+                self.history[1] = {**self.history[1], "content": agent_welcome_message}
 
             await self.tools["output"].send_init_acknowledgement()
             self.first_message_task = asyncio.create_task(self.__first_message())
@@ -2322,8 +2676,11 @@ class TaskManager(BaseManager):
 
                     if self.should_backchannel:
                         self.backchanneling_task = asyncio.create_task(self.__check_for_backchanneling())
+                    if self.use_fillers and self.filler_classifier is not None:
+                        # Converted once per process and voice, only the first call with this voice does the work
+                        asyncio.create_task(preload_audio_assets(self.filler_preset_directory, 8000, "pcm"))
                     if self.ambient_noise:
-                        self.ambient_noise_task = asyncio.create_task(self.__start_transmitting_ambient_noise())
+                        self.ambient_noise_task = asyncio.create_task(self.__setup_ambient_noise_mixer())
                 try:
                     await asyncio.gather(*tasks)
                 except asyncio.CancelledError as e:
@@ -2389,7 +2746,11 @@ class TaskManager(BaseManager):
                 tasks_to_cancel.append(process_task_cancellation(self.synthesizer_monitor_task, 'synthesizer_monitor_task'))
 
             if self._is_conversation_task():
+                # What the call waited for the ASR connection, and what setting it up took (the wait without pre-connect)
                 self.transcriber_latencies['connection_latency_ms'] = self.tools["transcriber"].connection_time
+                self.transcriber_latencies['connection_setup_latency_ms'] = self.tools["transcriber"].connection_setup_time
+                self.transcriber_latencies['preconnected'] = self.tools["transcriber"].preconnected
+                tasks_to_cancel.append(self.tools["transcriber"].close_preconnection())
                 self.synthesizer_latencies['connection_latency_ms'] = self.tools["synthesizer"].connection_time
                 
                 self.transcriber_latencies['turn_latencies'] = self.tools["transcriber"].turn_latencies
@@ -2398,7 +2759,7 @@ class TaskManager(BaseManager):
                 welcome_message_sent_ts = self.tools["output"].get_welcome_message_sent_ts()
 
                 output = {
-                    "messages": self.history,
+                    "messages": self.history.to_list(),
                     "conversation_time": time.time() - self.start_time,
                     "label_flow": self.label_flow,
                     "call_sid": self.call_sid,
@@ -2410,8 +2771,10 @@ class TaskManager(BaseManager):
                         "transcriber_latencies": self.transcriber_latencies,
                         "synthesizer_latencies": self.synthesizer_latencies,
                         "welcome_message_sent_ts": None,
-                        "stream_sid_ts": None
-                    }
+                        "stream_sid_ts": None,
+                        "turn_traces": self.turn_tracer.to_json()["turns"]
+                    },
+                    "pipeline_queue_stats": self.get_pipeline_queue_stats()
                 }
 
                 try:
@@ -2422,8 +2785,12 @@ class TaskManager(BaseManager):
                 except Exception as e:
                     logger.error(f"error in logging audio latency ts {str(e)}")
 
+                if os.getenv("LATENCY_TRACES_DIR"):
+                    await self.turn_tracer.export(os.getenv("LATENCY_TRACES_DIR"))
+
                 tasks_to_cancel.append(process_task_cancellation(self.output_task,'output_task'))
                 tasks_to_cancel.append(process_task_cancellation(self.hangup_task,'hangup_task'))
+                tasks_to_cancel.append(process_task_cancellation(self.completion_check_task, 'completion_check_task'))
                 tasks_to_cancel.append(process_task_cancellation(self.backchanneling_task, 'backchanneling_task'))
                 tasks_to_cancel.append(process_task_cancellation(self.ambient_noise_task, 'ambient_noise_task'))
                 # tasks_to_cancel.append(process_task_cancellation(self.initial_silence_task, 'initial_silence_task'))
@@ -2434,7 +2801,7 @@ class TaskManager(BaseManager):
 
                 output['recording_url'] = ""
                 if self.should_record:
-                    output['recording_url'] = await save_audio_file_to_s3(self.conversation_recording, self.sampling_rate, self.assistant_id, self.run_id)
+                    output['recording_url'] = await save_audio_file_to_s3(self.conversation_recording, self.assistant_id, self.run_id)
             else:
                 output = self.input_parameters
                 if self.task_config["task_type"] == "extraction":
@@ -6,6 +6,7 @@ from optimum.onnxruntime import ORTModelForSequenceClassification
 
 from bolna.classification.classification import BaseClassifier
 from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.resource_registry import resource_registry
 
 
 logger = configure_logger(__name__)
@@ -21,10 +22,16 @@ class DeBERTaClassifier(BaseClassifier):
         logger.info(f"Creating for {self.model_name}, classifier {model_id}")
         if filename is not None:
             self.model_args['file_name'] = filename
-        self.model = ORTModelForSequenceClassification.from_pretrained(**self.model_args)
-        self.tokenizer = AutoTokenizer.from_pretrained(model_id)
-        self.tokenizer.model_input_names = ['input_ids', 'attention_mask']
-        self.classifier = pipeline("zero-shot-classification", model=self.model, tokenizer=self.tokenizer)
+        # Model, tokenizer and pipeline only depend on the model, labels are passed on every classification
+        self.classifier = resource_registry.get_or_create("zero_shot_classifier", (model_id, filename), self.__create_pipeline)
+        self.model = self.classifier.model
+        self.tokenizer = self.classifier.tokenizer
+
+    def __create_pipeline(self):
+        model = ORTModelForSequenceClassification.from_pretrained(**self.model_args)
+        tokenizer = AutoTokenizer.from_pretrained(self.model_args['model_id'])
+        tokenizer.model_input_names = ['input_ids', 'attention_mask']
+        return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer)
         
     def classify(self, text):
         output = self.classifier(text, self.classification_labels, multi_label=self.multi_label)
@@ -67,5 +67,49 @@ TRANSFERING_CALL_FILLER = {
 
 DEFAULT_USER_ONLINE_MESSAGE = "Hey, are you still there?"
 DEFAULT_USER_ONLINE_MESSAGE_TRIGGER_DURATION = 6
+DEFAULT_SYNTHESIZER_LEAD_TIME_MS = 1000
+# Audio sent to the output ahead of what is being played, anything beyond waits in the buffered output queue
+DEFAULT_OUTPUT_SEND_AHEAD_MS = 200
+# Duration of the frames synthesized audio is cut into for the telephony outputs, a multiple of their 20 ms packets
+DEFAULT_OUTPUT_FRAME_MS = 200
+DEFAULT_SPECULATIVE_GENERATION_WINDOW_MS = 300
+# Duration of the media frames of the telephony providers
+TELEPHONY_MEDIA_FRAME_MS = 20
+# Number of inbound telephony media frames sent to the transcriber at once
+DEFAULT_INPUT_FRAMES_PER_BATCH = 10
+# Length of the ambient noise frames which fill the silence between agent responses, short so that the agent's audio
+# never waits behind more than one of them
+DEFAULT_AMBIENT_NOISE_FRAME_MS = 20
+# Resources shared by all the calls of a process
+DEFAULT_HTTPX_POOL_LIMITS = {"max_connections": 500, "max_keepalive_connections": 100, "keepalive_expiry": 30}
+# Connection pool and timeouts (seconds) of the aiohttp session shared by every call (TTS, webhooks, API tools), sized
+# for all the calls of the process rather than aiohttp's default of 100 connections and no timeout
+DEFAULT_AIOHTTP_POOL_LIMITS = {"limit": 1000, "limit_per_host": 250, "keepalive_timeout": 30}
+DEFAULT_AIOHTTP_TIMEOUT = {"total": 600, "connect": 10}
+DEFAULT_AUDIO_ASSET_CACHE_BYTES = 256 * 1024 * 1024
+# Time the shared VAD waits for the frames of other calls before running a batch
+DEFAULT_VAD_BATCH_WINDOW_MS = 5
+# Resolution of the timer wheel running the timeouts of every call (keepalives, utterance timeouts, silence checks)
+DEFAULT_TIMER_WHEEL_TICK_MS = 50
+# Audio frames whose send timestamps are kept per transcriber stream, and seconds of audio kept behind the position
+# of its latest result
+DEFAULT_FRAME_TIMESTAMP_CAPACITY = 4096
+DEFAULT_FRAME_TIMESTAMP_RETENTION_S = 60
+# Vosk model of the local (offline, CPU) transcriber, the time its shared service waits for the audio of other calls
+# before running a batch, and the threads recognizing the batches (None for one per CPU)
+DEFAULT_LOCAL_STT_MODEL = "vosk-model-small-en-us-0.15"
+DEFAULT_LOCAL_STT_BATCH_WINDOW_MS = 20
+DEFAULT_LOCAL_STT_WORKERS = None
+# Call recordings are kept in memory up to this size before being spooled to disk, and uploaded in parts of this size
+DEFAULT_RECORDING_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_RECORDING_UPLOAD_PART_BYTES = 8 * 1024 * 1024
+# Bounds (in packets) and overflow policy of the queues between the stages of a call
+DEFAULT_PIPELINE_QUEUE_CONFIG = {
+    "transcriber": {"maxsize": 500, "policy": "drop_oldest"},
+    "llm": {"maxsize": 100, "policy": "block"},
+    "synthesizer": {"maxsize": 500, "policy": "block"},
+    "transcriber_output": {"maxsize": 500, "policy": "block"},
+    "buffered_output": {"maxsize": 500, "policy": "block"},
+}
 DEFAULT_LANGUAGE_CODE = 'en'
 DEFAULT_TIMEZONE = 'America/Los_Angeles'
@@ -0,0 +1,67 @@
+import numpy as np
+
+from bolna.helpers.audio_codec import lin2ulaw, ulaw2lin
+from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.utils import wav_bytes_to_pcm_and_sample_rate, wrap_pcm_in_wav
+
+logger = configure_logger(__name__)
+
+
+class AmbientNoiseMixer:
+    """
+    Mixes a looping ambient noise bed into the outbound audio of a call. Agent audio has the next stretch of the bed
+    added to it (`mix()`) and the silence in between is filled with the bed alone (`next_frame()`), both reading from
+    the same position so that the bed plays as one continuous stream without gaps or overlaps.
+
+    The bed is mono 16 bit PCM at the sample rate of the outbound audio, the gain is applied to it once upfront.
+    """
+
+    def __init__(self, bed_pcm, sample_rate, gain=1.0):
+        bed = np.frombuffer(bed_pcm, dtype=np.int16, count=len(bed_pcm) // 2)
+        if len(bed) == 0:
+            raise ValueError("The ambient noise bed is empty")
+        if gain != 1.0:
+            bed = np.clip(np.rint(bed * gain), -32768, 32767).astype(np.int16)
+        self.__bed = bed
+        self.__position = 0
+        self.sample_rate = int(sample_rate)
+        self.gain = gain
+
+    def __next_samples(self, count):
+        start, end = self.__position, self.__position + count
+        if end <= len(self.__bed):
+            samples = self.__bed[start:end]
+        else:
+            samples = np.take(self.__bed, np.arange(start, end), mode='wrap')
+        self.__position = end % len(self.__bed)
+        return samples
+
+    def mix_pcm(self, pcm_data):
+        samples = np.frombuffer(pcm_data, dtype=np.int16, count=len(pcm_data) // 2)
+        mixed = samples.astype(np.int32)
+        mixed += self.__next_samples(len(samples))
+        np.clip(mixed, -32768, 32767, out=mixed)
+        # An odd trailing byte (half a sample) is passed through as is
+        return mixed.astype(np.int16).tobytes() + bytes(pcm_data[2 * len(samples):])
+
+    def mix(self, data, audio_format):
+        """Agent audio with the ambient noise added, in the same format ("pcm", "mulaw" or "wav")"""
+        if audio_format == 'pcm':
+            return self.mix_pcm(data)
+        elif audio_format == 'mulaw':
+            return lin2ulaw(self.mix_pcm(ulaw2lin(data)))
+        elif audio_format == 'wav':
+            pcm_data, sample_rate = wav_bytes_to_pcm_and_sample_rate(bytes(data))
+            if sample_rate == self.sample_rate:
+                return wrap_pcm_in_wav(self.mix_pcm(pcm_data), sample_rate)
+        logger.info(f"Not mixing ambient noise into {audio_format} audio")
+        return data
+
+    def next_frame(self, duration, audio_format='pcm'):
+        """`duration` seconds of the ambient noise alone, to be played while the agent is silent"""
+        pcm_data = self.__next_samples(int(duration * self.sample_rate)).tobytes()
+        if audio_format == 'mulaw':
+            return lin2ulaw(pcm_data)
+        elif audio_format == 'wav':
+            return wrap_pcm_in_wav(pcm_data, self.sample_rate)
+        return pcm_data
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from collections import deque
+
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+
+class AudioClock:
+    """
+    Real time clock of the audio handed to the output handler. Every message sent is laid on a timeline right after
+    the previous one (or now, if the line went idle), so at any time we know how much of it has been played and
+    how much is still buffered on the client/telephony side, without waiting for the mark round trips.
+
+    The output loop sends audio frame by frame, each once the buffered audio falls to `send_ahead` seconds. That
+    much audio is always queued on the client/telephony side as a jitter buffer against network delays, and what
+    has to be cleared on an interruption (and was synthesized for nothing) stays at about one frame plus `send_ahead`.
+    """
+
+    def __init__(self, send_ahead=0.2):
+        self.send_ahead = send_ahead
+        self.reset()
+
+    def reset(self):
+        self.deadline = 0  # monotonic time at which the audio sent so far finishes playing
+        self.sent = 0.0  # seconds of audio sent since the last reset
+        self.__segments = deque()  # (start, end, sequence_id) of the audio which isn't entirely played yet
+
+    def __drop_played_segments(self, now):
+        while self.__segments and self.__segments[0][1] <= now:
+            self.__segments.popleft()
+
+    def on_sent(self, duration, sequence_id=None):
+        now = time.monotonic()
+        self.__drop_played_segments(now)
+        start = max(self.deadline, now)
+        self.deadline = start + duration
+        self.sent += duration
+        self.__segments.append((start, self.deadline, sequence_id))
+
+    def buffered(self):
+        """Seconds of audio sent which are still to be played"""
+        return max(self.deadline - time.monotonic(), 0)
+
+    def played(self):
+        """Seconds of audio played since the last reset"""
+        return self.sent - self.buffered()
+
+    def playing_sequence_id(self):
+        """sequence_id of the audio being played right now, None when the line is idle"""
+        now = time.monotonic()
+        self.__drop_played_segments(now)
+        if self.__segments and self.__segments[0][0] <= now:
+            return self.__segments[0][2]
+        return None
+
+    async def wait_for_send_window(self):
+        delay = self.buffered() - self.send_ahead
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def interrupt(self):
+        """Resets the clock on an interruption and returns the seconds played and cut off since the last reset"""
+        buffered = self.buffered()
+        played, cut_off = self.sent - buffered, buffered
+        self.reset()
+        return played, cut_off
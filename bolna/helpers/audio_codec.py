@@ -0,0 +1,147 @@
+import numpy as np
+
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+# G.711 mu-law and A-law codecs for 16 bit PCM, bit exact with the audioop module (removed in Python 3.13).
+# Every 16 bit sample and every 8 bit code is looked up in a table built once at import time so that encoding and
+# decoding are a single vectorized np.take. The `*_into` variants write into a preallocated buffer (bytearray,
+# memoryview or numpy array) instead of allocating their output.
+# The point is running without audioop, not outrunning it: encoding is faster than audioop on long buffers, but
+# decoding stays behind its C loop (about 2x on 1 s buffers, much more on 20 ms frames where the NumPy call
+# overhead dominates), see benchmarks/audio_codec_benchmark.py.
+
+_SEG_ULAW_END = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+_SEG_ALAW_END = np.array([0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF])
+_ULAW_BIAS = 0x84
+_ULAW_CLIP = 8159
+
+
+def _build_ulaw_encode_table():
+    # Indexed by the 16 bit sample reinterpreted as uint16, the codec works on the 14 most significant bits
+    pcm = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(pcm), _ULAW_CLIP) + (_ULAW_BIAS >> 2)
+    segment = np.searchsorted(_SEG_ULAW_END, magnitude)
+    code = (np.minimum(segment, 7) << 4) | ((magnitude >> (np.minimum(segment, 7) + 1)) & 0xF)
+    code = np.where(segment >= 8, 0x7F, code)
+    return (code ^ mask).astype(np.uint8)
+
+
+def _build_ulaw_decode_table():
+    code = ~np.arange(256, dtype=np.int32) & 0xFF
+    t = (((code & 0xF) << 3) + _ULAW_BIAS) << ((code & 0x70) >> 4)
+    return np.where(code & 0x80, _ULAW_BIAS - t, t - _ULAW_BIAS).astype(np.int16)
+
+
+def _build_alaw_encode_table():
+    # The codec works on the 13 most significant bits
+    pcm = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 3
+    mask = np.where(pcm >= 0, 0xD5, 0x55)
+    magnitude = np.where(pcm >= 0, pcm, -pcm - 1)
+    segment = np.searchsorted(_SEG_ALAW_END, magnitude)
+    shift = np.where(segment < 2, 1, np.minimum(segment, 7))
+    code = (np.minimum(segment, 7) << 4) | ((magnitude >> shift) & 0xF)
+    code = np.where(segment >= 8, 0x7F, code)
+    return (code ^ mask).astype(np.uint8)
+
+
+def _build_alaw_decode_table():
+    code = np.arange(256, dtype=np.int32) ^ 0x55
+    segment = (code & 0x70) >> 4
+    t = (code & 0xF) << 4
+    t = np.where(segment == 0, t + 8, (t + 0x108) << np.maximum(segment - 1, 0))
+    return np.where(code & 0x80, t, -t).astype(np.int16)
+
+
+def _build_pair_decode_table(decode_table):
+    # Decodes two codes at once: indexed by two consecutive codes read as one uint16, holds the two samples as a uint32
+    pairs = np.arange(65536, dtype=np.uint16).view(np.uint8).reshape(-1, 2)
+    return np.ascontiguousarray(decode_table[pairs]).view(np.uint32).reshape(-1)
+
+
+ULAW_ENCODE_TABLE = _build_ulaw_encode_table()
+ULAW_DECODE_TABLE = _build_ulaw_decode_table()
+ULAW_PAIR_DECODE_TABLE = _build_pair_decode_table(ULAW_DECODE_TABLE)
+ALAW_ENCODE_TABLE = _build_alaw_encode_table()
+ALAW_DECODE_TABLE = _build_alaw_decode_table()
+ALAW_PAIR_DECODE_TABLE = _build_pair_decode_table(ALAW_DECODE_TABLE)
+
+
+def _pcm_samples(pcm_data):
+    if len(pcm_data) % 2:
+        raise ValueError("16 bit PCM must hold a whole number of samples")
+    return np.frombuffer(pcm_data, dtype=np.uint16)
+
+
+def _output_view(out, length, dtype):
+    try:
+        return np.frombuffer(out, dtype=dtype, count=length)
+    except ValueError:
+        raise ValueError(f"Output buffer of {memoryview(out).nbytes} bytes is too small for {length * np.dtype(dtype).itemsize} bytes")
+
+
+def _encode(table, pcm_data):
+    return np.take(table, _pcm_samples(pcm_data), mode='clip').tobytes()
+
+
+def _encode_into(table, pcm_data, out):
+    samples = _pcm_samples(pcm_data)
+    np.take(table, samples, out=_output_view(out, len(samples), np.uint8), mode='clip')
+    return len(samples)
+
+
+def _decode(table, pair_table, encoded_data):
+    if len(encoded_data) % 2 == 0:
+        return np.take(pair_table, np.frombuffer(encoded_data, dtype=np.uint16), mode='clip').tobytes()
+    return np.take(table, np.frombuffer(encoded_data, dtype=np.uint8), mode='clip').tobytes()
+
+
+def _decode_into(table, pair_table, encoded_data, out):
+    length = len(encoded_data)
+    if length % 2 == 0:
+        np.take(pair_table, np.frombuffer(encoded_data, dtype=np.uint16), out=_output_view(out, length // 2, np.uint32), mode='clip')
+    else:
+        np.take(table, np.frombuffer(encoded_data, dtype=np.uint8), out=_output_view(out, length, np.int16), mode='clip')
+    return 2 * length
+
+
+def lin2ulaw(pcm_data):
+    """16 bit PCM to mu-law, same output as audioop.lin2ulaw(pcm_data, 2)"""
+    return _encode(ULAW_ENCODE_TABLE, pcm_data)
+
+
+def ulaw2lin(ulaw_data):
+    """mu-law to 16 bit PCM, same output as audioop.ulaw2lin(ulaw_data, 2)"""
+    return _decode(ULAW_DECODE_TABLE, ULAW_PAIR_DECODE_TABLE, ulaw_data)
+
+
+def lin2alaw(pcm_data):
+    """16 bit PCM to A-law, same output as audioop.lin2alaw(pcm_data, 2)"""
+    return _encode(ALAW_ENCODE_TABLE, pcm_data)
+
+
+def alaw2lin(alaw_data):
+    """A-law to 16 bit PCM, same output as audioop.alaw2lin(alaw_data, 2)"""
+    return _decode(ALAW_DECODE_TABLE, ALAW_PAIR_DECODE_TABLE, alaw_data)
+
+
+def lin2ulaw_into(pcm_data, out):
+    """Encodes into the writable buffer `out` and returns the number of bytes written"""
+    return _encode_into(ULAW_ENCODE_TABLE, pcm_data, out)
+
+
+def ulaw2lin_into(ulaw_data, out):
+    """Decodes into the writable buffer `out` and returns the number of bytes written"""
+    return _decode_into(ULAW_DECODE_TABLE, ULAW_PAIR_DECODE_TABLE, ulaw_data, out)
+
+
+def lin2alaw_into(pcm_data, out):
+    """Encodes into the writable buffer `out` and returns the number of bytes written"""
+    return _encode_into(ALAW_ENCODE_TABLE, pcm_data, out)
+
+
+def alaw2lin_into(alaw_data, out):
+    """Decodes into the writable buffer `out` and returns the number of bytes written"""
+    return _decode_into(ALAW_DECODE_TABLE, ALAW_PAIR_DECODE_TABLE, alaw_data, out)
@@ -0,0 +1,50 @@
+import binascii
+
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+
+class AudioFrameBuffer:
+    """
+    Preallocated buffer which batches the small media frames of telephony providers (20 ms each) before they are sent
+    to the transcriber. Frames are decoded straight from their base64 payload and written back to back through a
+    memoryview, so neither a list of frames nor a join is needed per batch.
+
+    A full batch is handed over as a single bytes object (the only copy) because the transcribers keep hold of the
+    audio they receive, after which the buffer is reused for the next batch.
+    """
+
+    def __init__(self, frames_per_batch=10, frame_size=320):
+        self.frames_per_batch = max(1, int(frames_per_batch))
+        self.frames = 0
+        self.size = 0
+        self.__buffer = bytearray(self.frames_per_batch * frame_size)
+        self.__view = memoryview(self.__buffer)
+
+    def __grow(self, required_size):
+        buffer = bytearray(max(required_size, 2 * len(self.__buffer)))
+        buffer[:self.size] = self.__view[:self.size]
+        self.__view.release()
+        self.__buffer = buffer
+        self.__view = memoryview(self.__buffer)
+
+    def append(self, frame):
+        """Appends a frame, returns True once the batch is complete"""
+        end = self.size + len(frame)
+        if end > len(self.__buffer):
+            self.__grow(end)
+        self.__view[self.size:end] = frame
+        self.size = end
+        self.frames += 1
+        return self.frames >= self.frames_per_batch
+
+    def append_base64(self, payload):
+        return self.append(binascii.a2b_base64(payload))
+
+    def flush(self):
+        """Returns the frames batched so far and empties the buffer"""
+        batch = bytes(self.__view[:self.size])
+        self.frames = 0
+        self.size = 0
+        return batch
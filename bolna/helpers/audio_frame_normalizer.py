@@ -0,0 +1,132 @@
+import io
+
+from pydub import AudioSegment
+
+from bolna.constants import DEFAULT_OUTPUT_FRAME_MS
+from bolna.helpers.audio_codec import lin2ulaw, ulaw2lin
+from bolna.helpers.audio_resampler import StreamingResampler
+from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.utils import wav_bytes_to_pcm_and_sample_rate
+
+logger = configure_logger(__name__)
+
+# Sent by the synthesizers to close a stream, passed on for the handlers to send their final mark
+END_OF_STREAM_FRAME = b'\x00\x00'
+
+
+class AudioFrameNormalizer:
+    """
+    Single conversion stage between the synthesizer and the output handler of a call. Whatever the synthesizer
+    produces (mu-law, raw PCM, PCM wrapped in WAV headers, mp3...) at whatever rate, comes out as frames of
+    `frame_duration_ms` in the encoding and at the rate the output expects ("mulaw" or "pcm").
+
+    Payloads which are already in the target encoding and rate are only cut into frames (memoryview slices, no copy),
+    the others are decoded, resampled with a streaming resampler and encoded once. The audio which doesn't fill a
+    frame is carried over to the next payload of the same response and flushed at its end.
+    """
+
+    def __init__(self, target_format, sample_rate=8000, frame_duration_ms=DEFAULT_OUTPUT_FRAME_MS):
+        if target_format not in ("mulaw", "pcm"):
+            raise ValueError(f"Unsupported target format {target_format}")
+        self.target_format = target_format
+        self.sample_rate = int(sample_rate)
+        self.bytes_per_sample = 1 if target_format == "mulaw" else 2
+        self.frame_size = max(1, int(self.sample_rate * frame_duration_ms / 1000)) * self.bytes_per_sample
+        self.fast_path_payloads = 0
+        self.converted_payloads = 0
+        self.__resamplers = {}
+        self.sequence_id = None
+        self.reset()
+
+    def reset(self):
+        self.__carry = bytearray()
+        self.__leftover_byte = b''
+        for resampler in self.__resamplers.values():
+            resampler.reset()
+
+    def is_target_format(self, audio_format, sample_rate):
+        return audio_format == self.target_format and int(sample_rate) == self.sample_rate
+
+    def __resample(self, pcm_data, sample_rate):
+        if sample_rate == self.sample_rate:
+            return pcm_data
+        resampler = self.__resamplers.get(sample_rate)
+        if resampler is None:
+            resampler = self.__resamplers[sample_rate] = StreamingResampler(sample_rate, self.sample_rate)
+        return resampler.process(pcm_data)
+
+    def __encode(self, pcm_data):
+        pcm_data = self.__leftover_byte + bytes(pcm_data)
+        if len(pcm_data) % 2:
+            pcm_data, self.__leftover_byte = pcm_data[:-1], pcm_data[-1:]
+        else:
+            self.__leftover_byte = b''
+        return lin2ulaw(pcm_data) if self.target_format == "mulaw" else pcm_data
+
+    def __to_target(self, data, audio_format, sample_rate):
+        if data[:4] == b'RIFF':
+            pcm_data, sample_rate = wav_bytes_to_pcm_and_sample_rate(bytes(data))
+        elif audio_format == "mulaw":
+            if self.target_format == "mulaw" and sample_rate == self.sample_rate:
+                self.fast_path_payloads += 1
+                return data
+            pcm_data = ulaw2lin(data)
+        elif audio_format in ("pcm", "wav"):
+            # "wav" payloads without a header are raw PCM
+            if self.target_format == "pcm" and sample_rate == self.sample_rate and not self.__leftover_byte:
+                self.fast_path_payloads += 1
+                return data
+            pcm_data = data
+        else:
+            audio = AudioSegment.from_file(io.BytesIO(bytes(data)), format=audio_format).set_channels(1).set_sample_width(2)
+            pcm_data, sample_rate = audio.raw_data, audio.frame_rate
+        self.converted_payloads += 1
+        return self.__encode(self.__resample(pcm_data, sample_rate))
+
+    def __flush_resamplers(self):
+        tail = b''.join(resampler.flush() for resampler in self.__resamplers.values())
+        return self.__encode(tail) if tail else b''
+
+    def __cut(self, audio):
+        frames = []
+        view = memoryview(audio)
+        if self.__carry:
+            missing = self.frame_size - len(self.__carry)
+            self.__carry += view[:missing]
+            view = view[missing:]
+            if len(self.__carry) < self.frame_size:
+                return frames
+            frames.append(bytes(self.__carry))
+            self.__carry = bytearray()
+        complete = len(view) - len(view) % self.frame_size
+        frames.extend(view[i:i + self.frame_size] for i in range(0, complete, self.frame_size))
+        self.__carry += view[complete:]
+        return frames
+
+    def drain(self):
+        """Audio carried over so far as a (short) frame, e.g. to send the first chunk of a response right away"""
+        if not self.__carry:
+            return []
+        frame, self.__carry = bytes(self.__carry), bytearray()
+        return [frame]
+
+    def process(self, data, audio_format, sample_rate, sequence_id=None, end_of_stream=False):
+        """
+        Frames of a synthesizer payload. With `end_of_stream` the response is over and everything left is flushed,
+        closed by the end of stream frame if no audio was left.
+        """
+        if sequence_id != self.sequence_id:
+            # Anything left of the previous response (e.g. interrupted) is dropped
+            self.reset()
+            self.sequence_id = sequence_id
+
+        frames = self.__cut(self.__to_target(data, audio_format, int(sample_rate))) if data else []
+        if end_of_stream:
+            tail = self.__flush_resamplers()
+            if tail:
+                frames.extend(self.__cut(tail))
+            frames.extend(self.drain())
+            self.__leftover_byte = b''
+            if not frames:
+                frames.append(END_OF_STREAM_FRAME)
+        return frames
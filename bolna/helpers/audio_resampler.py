@@ -0,0 +1,139 @@
+import math
+import threading
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+# Zero crossings of the windowed sinc on every side of the output sample (at the lower of the two rates)
+FILTER_ZERO_CROSSINGS = 16
+# Fraction of the lower Nyquist frequency kept by the anti-aliasing filter
+FILTER_ROLLOFF = 0.945
+FILTER_KAISER_BETA = 8.6
+
+_filter_banks = {}
+_filter_banks_lock = threading.Lock()
+
+
+def _design_filter_bank(orig_sample_rate, target_sample_rate):
+    """
+    Windowed sinc low pass filter split into `up` phases of `2 * half_width` taps. Phase p holds the taps used for an
+    output sample falling p/up of an input sample after the input sample it is anchored on.
+    """
+    gcd = math.gcd(orig_sample_rate, target_sample_rate)
+    up, down = target_sample_rate // gcd, orig_sample_rate // gcd
+    cutoff = FILTER_ROLLOFF * min(1.0, up / down)
+    half_width = int(math.ceil(FILTER_ZERO_CROSSINGS / cutoff))
+
+    taps = np.arange(-half_width + 1, half_width + 1, dtype=np.float64)
+    phases = np.arange(up, dtype=np.float64)[:, None] / up
+    distance = taps[None, :] - phases
+    window = np.i0(FILTER_KAISER_BETA * np.sqrt(np.clip(1 - (distance / half_width) ** 2, 0, None))) / np.i0(FILTER_KAISER_BETA)
+    bank = cutoff * np.sinc(cutoff * distance) * window
+    # Unity gain at DC for every phase
+    bank /= bank.sum(axis=1, keepdims=True)
+    return up, down, half_width, bank.astype(np.float32)
+
+
+def get_filter_bank(orig_sample_rate, target_sample_rate):
+    """Filter banks are designed once per (source, target) rate pair and shared by every resampler of the process"""
+    key = (int(orig_sample_rate), int(target_sample_rate))
+    filter_bank = _filter_banks.get(key)
+    if filter_bank is None:
+        with _filter_banks_lock:
+            filter_bank = _filter_banks.get(key)
+            if filter_bank is None:
+                filter_bank = _filter_banks[key] = _design_filter_bank(*key)
+    return filter_bank
+
+
+class StreamingResampler:
+    """
+    Polyphase resampler for mono 16 bit PCM which is fed chunk by chunk. The samples which the filter still needs and
+    the position of the next output sample are carried from one chunk to the next, so a stream resampled in chunks is
+    identical to the stream resampled at once (no clicks at the chunk edges).
+
+    `process()` returns whatever output is already computable and `flush()` returns the tail once the stream is over,
+    after which the resampler can be reused for another stream.
+    """
+
+    def __init__(self, orig_sample_rate, target_sample_rate):
+        self.orig_sample_rate = int(orig_sample_rate)
+        self.target_sample_rate = int(target_sample_rate)
+        self.passthrough = self.orig_sample_rate == self.target_sample_rate
+        if not self.passthrough:
+            self.up, self.down, self.half_width, self.filter_bank = get_filter_bank(self.orig_sample_rate, self.target_sample_rate)
+        self.reset()
+
+    def reset(self):
+        self.__leftover_byte = b''
+        self.__input_samples = 0  # total number of input samples of the stream
+        self.__next_output = 0  # index of the next output sample of the stream
+        if not self.passthrough:
+            # The filter looks half_width samples back, the stream is considered silent before its start
+            self.__buffer = np.zeros(self.half_width, dtype=np.float32)
+            self.__buffer_start = -self.half_width  # stream index of __buffer[0]
+
+    def __to_samples(self, pcm_bytes):
+        pcm_bytes = self.__leftover_byte + pcm_bytes
+        if len(pcm_bytes) % 2:
+            pcm_bytes, self.__leftover_byte = pcm_bytes[:-1], pcm_bytes[-1:]
+        else:
+            self.__leftover_byte = b''
+        return np.frombuffer(pcm_bytes, dtype=np.int16)
+
+    def __resample(self, last_output):
+        if last_output < self.__next_output:
+            return b''
+        positions = np.arange(self.__next_output, last_output + 1, dtype=np.int64) * self.down
+        anchors, phases = np.divmod(positions, self.up)
+        # Row i of the (read only, not copied) window view holds the taps of the output sample anchored on i + half_width - 1
+        windows = sliding_window_view(self.__buffer, 2 * self.half_width)[anchors - self.half_width + 1 - self.__buffer_start]
+        if self.up == 1:
+            output = windows @ self.filter_bank[0]
+        else:
+            output = np.einsum('ij,ij->i', windows, self.filter_bank[phases])
+        self.__next_output = last_output + 1
+
+        # Only keep the samples which the next output sample still needs
+        next_anchor = (self.__next_output * self.down) // self.up
+        drop = next_anchor - self.half_width + 1 - self.__buffer_start
+        if drop > 0:
+            self.__buffer = self.__buffer[drop:]
+            self.__buffer_start += drop
+        return np.clip(np.rint(output), -32768, 32767).astype(np.int16).tobytes()
+
+    def process(self, pcm_bytes):
+        samples = self.__to_samples(pcm_bytes)
+        if self.passthrough or len(samples) == 0:
+            self.__input_samples += len(samples)
+            return samples.tobytes()
+        self.__buffer = np.concatenate((self.__buffer, samples.astype(np.float32)))
+        self.__input_samples += len(samples)
+        # An output sample anchored on input sample i needs the samples up to i + half_width
+        last_anchor = self.__input_samples - 1 - self.half_width
+        if last_anchor < 0:
+            return b''
+        return self.__resample(((last_anchor + 1) * self.up - 1) // self.down)
+
+    def flush(self):
+        """Output samples which were waiting for samples past the end of the stream, considered silent"""
+        if self.passthrough:
+            self.reset()
+            return b''
+        total_output = -(-self.__input_samples * self.up // self.down)
+        self.__buffer = np.concatenate((self.__buffer, np.zeros(self.half_width, dtype=np.float32)))
+        tail = self.__resample(total_output - 1)
+        self.reset()
+        return tail
+
+
+def resample_pcm(pcm_bytes, orig_sample_rate, target_sample_rate):
+    """Resamples a complete mono 16 bit PCM buffer"""
+    if int(orig_sample_rate) == int(target_sample_rate):
+        return pcm_bytes
+    resampler = StreamingResampler(orig_sample_rate, target_sample_rate)
+    return resampler.process(pcm_bytes) + resampler.flush()
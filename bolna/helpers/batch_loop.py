@@ -0,0 +1,52 @@
+import asyncio
+
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+
+class BatchLoop:
+    """
+    Tick loop of the services shared by every call of the process (VADService, LocalSTTService), which process the
+    work waiting in all their streams together. Streams with work waiting are marked ready with `notify()`, a tick
+    starts as soon as one is, after waiting `batch_window` seconds for the work of other streams, and `tick()` is
+    called with the ready streams (keyed by id, it removes the ones it is done with) as long as some are left.
+    """
+
+    def __init__(self, name, tick, batch_window):
+        self.name = name
+        self.tick = tick
+        self.batch_window = batch_window
+        self.ready_streams = {}
+        self.__wake_event = None
+        self.__task = None
+
+    def start(self):
+        if self.__task is None or self.__task.done():
+            self.__wake_event = asyncio.Event()
+            self.__task = asyncio.create_task(self.__run())
+
+    def notify(self, stream):
+        self.ready_streams[id(stream)] = stream
+        self.__wake_event.set()
+
+    def discard(self, stream):
+        self.ready_streams.pop(id(stream), None)
+
+    async def __run(self):
+        while True:
+            await self.__wake_event.wait()
+            if self.batch_window > 0:
+                await asyncio.sleep(self.batch_window)
+            self.__wake_event.clear()
+            try:
+                while self.ready_streams:
+                    await self.tick(self.ready_streams)
+            except Exception as e:
+                logger.error(f"Error while running the {self.name}: {e}")
+
+    async def close(self):
+        if self.__task is not None:
+            self.__task.cancel()
+            await asyncio.gather(self.__task, return_exceptions=True)
+            self.__task = None
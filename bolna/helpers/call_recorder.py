@@ -0,0 +1,148 @@
+import asyncio
+import io
+import struct
+import time
+from tempfile import SpooledTemporaryFile
+
+import numpy as np
+from pydub import AudioSegment
+
+from bolna.constants import DEFAULT_RECORDING_SPOOL_MAX_BYTES
+from bolna.helpers.audio_resampler import resample_pcm
+from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.utils import wav_bytes_to_pcm_and_sample_rate
+
+logger = configure_logger(__name__)
+
+WAV_HEADER_SIZE = 44
+INPUT_CHANNEL = 0
+OUTPUT_CHANNEL = 1
+BYTES_PER_FRAME = 4  # one 16 bit sample per channel
+
+
+class CallRecorder:
+    """
+    Records a call as a stereo 16 bit WAV file, the user on the left channel and the agent on the right one, without
+    holding the call in memory. The agent audio is written as it is played, at its offset from the start of the
+    recording, into a spooled temporary file which moves to disk once it outgrows `spool_max_size`.
+
+    The user audio reaches us encoded in the container of the client (e.g. webm from the browser) which can only be
+    decoded as a whole, so it is spooled as received and written into its channel once the call is over.
+    """
+
+    def __init__(self, sample_rate=24000, spool_max_size=DEFAULT_RECORDING_SPOOL_MAX_BYTES):
+        self.sample_rate = int(sample_rate)
+        self.spool_max_size = spool_max_size
+        self.started = None  # time.time() of the first recorded audio, the start of the recording
+        self.input_started = None
+        self.frames = 0
+        self.__output_end = 0  # frame at which the agent audio played so far ends
+        self.__recording = None
+        self.__input = None
+
+    @property
+    def duration(self):
+        return self.frames / self.sample_rate
+
+    def __header(self):
+        data_size = self.frames * BYTES_PER_FRAME
+        return struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 36 + data_size, b'WAVE', b'fmt ', 16, 1, 2, self.sample_rate,
+                           self.sample_rate * BYTES_PER_FRAME, BYTES_PER_FRAME, 16, b'data', data_size)
+
+    def __position(self, timestamp):
+        return max(0, int(round((timestamp - self.started) * self.sample_rate)))
+
+    def __write_channel(self, channel, position, pcm_data):
+        samples = np.frombuffer(pcm_data, dtype=np.int16, count=len(pcm_data) // 2)
+        if len(samples) == 0:
+            return
+        if self.__recording is None:
+            self.__recording = SpooledTemporaryFile(max_size=self.spool_max_size)
+            self.__recording.write(self.__header())
+
+        offset = WAV_HEADER_SIZE + position * BYTES_PER_FRAME
+        frames = np.zeros((len(samples), 2), dtype=np.int16)
+        # Keep the other channel of the frames which were already written (past the end of the file reads nothing)
+        self.__recording.seek(offset)
+        existing = self.__recording.read(len(samples) * BYTES_PER_FRAME)
+        if existing:
+            frames.reshape(-1)[:len(existing) // 2] = np.frombuffer(existing, dtype=np.int16)
+        frames[:, channel] = samples
+        # Writing past the end of the file fills the gap with zeros, i.e. silence
+        self.__recording.seek(offset)
+        self.__recording.write(frames.tobytes())
+        self.frames = max(self.frames, position + len(samples))
+
+    def __to_pcm(self, data, audio_format, sample_rate):
+        if data[:4] == b'RIFF':
+            pcm_data, sample_rate = wav_bytes_to_pcm_and_sample_rate(data)
+        elif audio_format == 'pcm':
+            pcm_data = data
+        else:
+            audio = AudioSegment.from_file(io.BytesIO(data), format=audio_format).set_channels(1).set_sample_width(2)
+            pcm_data, sample_rate = audio.raw_data, audio.frame_rate
+        return resample_pcm(pcm_data, sample_rate, self.sample_rate)
+
+    def record_input(self, data, timestamp=None):
+        timestamp = timestamp or time.time()
+        if self.started is None:
+            self.started = timestamp
+        if self.__input is None:
+            self.input_started = timestamp
+            self.__input = SpooledTemporaryFile(max_size=self.spool_max_size)
+        self.__input.write(data)
+
+    def record_output(self, data, audio_format='wav', sample_rate=None, timestamp=None):
+        """
+        Writes agent audio played at `timestamp`. Audio which is sent ahead of time is placed right after the audio
+        played before it, as the client queues it.
+        """
+        timestamp = timestamp or time.time()
+        if self.started is None:
+            self.started = timestamp
+        pcm_data = self.__to_pcm(bytes(data), audio_format, sample_rate or self.sample_rate)
+        position = max(self.__position(timestamp), self.__output_end)
+        self.__write_channel(OUTPUT_CHANNEL, position, pcm_data)
+        self.__output_end = position + len(pcm_data) // 2
+
+    def __write_input(self):
+        self.__input.seek(0)
+        # Anything but WAV goes through ffmpeg which probes the container
+        audio_format = 'wav' if self.__input.read(4) == b'RIFF' else None
+        self.__input.seek(0)
+        try:
+            audio = AudioSegment.from_file(self.__input, format=audio_format).set_channels(1).set_sample_width(2)
+        except Exception as e:
+            logger.error(f"Could not decode the input audio of the recording: {e}")
+            return
+        pcm_data = resample_pcm(audio.raw_data, audio.frame_rate, self.sample_rate)
+        position = self.__position(self.input_started)
+        chunk_size = 2 * self.sample_rate  # one second at a time
+        for start in range(0, len(pcm_data), chunk_size):
+            self.__write_channel(INPUT_CHANNEL, position + start // 2, pcm_data[start:start + chunk_size])
+
+    def __finalize(self):
+        if self.__input is not None:
+            self.__write_input()
+        if self.__recording is None:
+            return None
+        self.__recording.seek(0)
+        self.__recording.write(self.__header())
+        self.__recording.seek(0)
+        return self.__recording
+
+    async def finalize(self):
+        """
+        Completes the recording once the call is over and returns it as a file object positioned at its start, or None
+        if nothing was recorded. The file stays valid until `close()` is called.
+        """
+        # Decoding the input and rewriting its channel may take a while for long calls
+        recording = await asyncio.to_thread(self.__finalize)
+        logger.info(f"Recorded {self.duration:.1f} seconds of audio")
+        return recording
+
+    def close(self):
+        for spooled_file in (self.__recording, self.__input):
+            if spooled_file is not None:
+                spooled_file.close()
+        self.__recording = self.__input = None
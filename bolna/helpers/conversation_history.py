@@ -0,0 +1,149 @@
+import copy
+from collections.abc import Sequence
+
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+
+def format_message(message, use_system_prompt=False, include_tools=False):
+    role = message['role']
+    if message['content'] is None:
+        logger.info("Continuing the loop as content received is None")
+        return ""
+    content = message['content']
+
+    if use_system_prompt and role == 'system':
+        try:
+            return "system: " + content + "\n"
+        except Exception:
+            return ""
+    if role == 'assistant':
+        return "assistant: " + content + "\n"
+    elif role == 'user':
+        return "user: " + content + "\n"
+    elif include_tools and role == 'tool':
+        return "tool_response: " + content + "\n"
+    return ""
+
+
+class _MessageLog:
+    """Append-only list of messages shared by every history snapshot pointing to it"""
+    __slots__ = ("messages", "formatted")
+
+    def __init__(self, messages, formatted=None):
+        self.messages = messages
+        # (use_system_prompt, include_tools) -> formatted string of every message, computed lazily
+        self.formatted = {} if formatted is None else formatted
+
+    def formatted_pieces(self, length, use_system_prompt, include_tools):
+        pieces = self.formatted.setdefault((use_system_prompt, include_tools), [])
+        for message in self.messages[len(pieces):length]:
+            pieces.append(format_message(message, use_system_prompt, include_tools))
+        return pieces
+
+
+class ConversationHistory(Sequence):
+    """
+    Append-only conversation history with structural sharing.
+
+    Snapshots share the underlying message log and only remember how many messages they can see, so taking a
+    snapshot, appending a message or formatting the transcript for the request logs costs O(new messages) instead of
+    a copy of the whole transcript. Messages are treated as immutable: edits go through `history[i] = message`,
+    which is recorded in an override local to that history and never leaks into other snapshots.
+    """
+    __slots__ = ("_log", "_length", "_overrides")
+
+    def __init__(self, messages=None):
+        messages = list(messages) if messages is not None else []
+        self._log = _MessageLog(messages)
+        self._length = len(messages)
+        self._overrides = {}
+
+    def _normalize_index(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("conversation history index out of range")
+        return index
+
+    def _fork(self):
+        # Some other snapshot appended past our end, so we get our own copy of the log before appending
+        formatted = {key: pieces[:self._length] for key, pieces in self._log.formatted.items()}
+        self._log = _MessageLog(self._log.messages[:self._length], formatted)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        index = self._normalize_index(index)
+        if index in self._overrides:
+            return self._overrides[index]
+        return self._log.messages[index]
+
+    def __setitem__(self, index, message):
+        self._overrides[self._normalize_index(index)] = message
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        messages = self._log.messages
+        for index in range(self._length):
+            yield self._overrides.get(index, messages[index])
+
+    def append(self, message):
+        messages = self._log.messages
+        if len(messages) > self._length:
+            # The snapshot this history was taken from already appended the very same message, so just share it
+            if messages[self._length] is message:
+                self._length += 1
+                return
+            self._fork()
+        self._log.messages.append(message)
+        self._length += 1
+
+    def extend(self, messages):
+        for message in messages:
+            self.append(message)
+
+    def snapshot(self):
+        history = ConversationHistory.__new__(ConversationHistory)
+        history._log = self._log
+        history._length = self._length
+        history._overrides = dict(self._overrides)
+        return history
+
+    def copy(self):
+        return self.snapshot()
+
+    def to_list(self):
+        return list(self)
+
+    # Concatenation gives a plain list like it did when the history was one, e.g. [system_message] + history
+    def __add__(self, other):
+        if isinstance(other, (list, ConversationHistory)):
+            return self.to_list() + list(other)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, list):
+            return other + self.to_list()
+        return NotImplemented
+
+    def format(self, use_system_prompt=False, include_tools=False):
+        pieces = self._log.formatted_pieces(self._length, use_system_prompt, include_tools)[:self._length]
+        for index, message in self._overrides.items():
+            pieces[index] = format_message(message, use_system_prompt, include_tools)
+        return "".join(pieces)
+
+    def __copy__(self):
+        return self.snapshot()
+
+    def __deepcopy__(self, memo):
+        return ConversationHistory(copy.deepcopy(self.to_list(), memo))
+
+    def __reduce__(self):
+        return ConversationHistory, (self.to_list(),)
+
+    def __repr__(self):
+        return repr(self.to_list())
@@ -0,0 +1,57 @@
+import bisect
+from array import array
+
+from bolna.constants import DEFAULT_FRAME_TIMESTAMP_CAPACITY
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+
+class FrameTimestampIndex:
+    """
+    Send timestamps of the audio frames streamed to a transcriber, looked up by position in the audio (seconds since
+    the start of the stream) to measure the latency of its results.
+
+    Frames are appended in order, so their positions stay sorted in flat arrays of doubles which are searched by
+    bisection. Only the last `capacity` frames are kept and `trim()` drops the frames the transcriber has moved past,
+    the arrays being compacted once half of what they hold was dropped.
+    """
+
+    def __init__(self, capacity=DEFAULT_FRAME_TIMESTAMP_CAPACITY):
+        self.capacity = capacity
+        self.__starts = array('d')
+        self.__ends = array('d')
+        self.__send_timestamps = array('d')
+        self.__first = 0  # index of the oldest frame kept
+
+    def __len__(self):
+        return len(self.__ends) - self.__first
+
+    def append(self, frame_start, frame_end, send_timestamp):
+        self.__starts.append(frame_start)
+        self.__ends.append(frame_end)
+        self.__send_timestamps.append(send_timestamp)
+        if len(self) > self.capacity:
+            self.__first += 1
+            self.__compact()
+
+    def find(self, position):
+        """Send timestamp of the frame containing `position`, None if no such frame is indexed"""
+        index = bisect.bisect_left(self.__ends, position, self.__first)
+        if index < len(self.__ends) and self.__starts[index] <= position:
+            return self.__send_timestamps[index]
+        return None
+
+    def trim(self, position):
+        """Drops the frames which end before `position`"""
+        index = bisect.bisect_left(self.__ends, position, self.__first)
+        if index > self.__first:
+            self.__first = index
+            self.__compact()
+
+    def __compact(self):
+        if self.__first * 2 < len(self.__ends):
+            return
+        for values in (self.__starts, self.__ends, self.__send_timestamps):
+            del values[:self.__first]
+        self.__first = 0
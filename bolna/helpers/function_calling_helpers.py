@@ -1,9 +1,9 @@
 import asyncio
 import json
 
-import aiohttp
 from bolna.helpers.logger_config import configure_logger
 from bolna.helpers.utils import convert_to_request_log
+from bolna.helpers.resource_registry import resource_registry
 
 logger = configure_logger(__name__)
 
@@ -34,21 +34,21 @@ async def trigger_api(url, method, param, api_token, headers_data, meta_info, ru
 
         await asyncio.sleep(0.7)
 
-        async with aiohttp.ClientSession() as session:
-            if method.lower() == "get":
-                logger.info(f"Sending request {request_body}, {url}, {headers}")
-                async with session.get(url, params=api_params, headers=headers) as response:
+        session = resource_registry.get_aiohttp_session()
+        if method.lower() == "get":
+            logger.info(f"Sending request {request_body}, {url}, {headers}")
+            async with session.get(url, params=api_params, headers=headers) as response:
+                response_text = await response.text()
+        elif method.lower() == "post":
+            if content_type == "json":
+                async with session.post(url, json=api_params, headers=headers) as response:
+                    response_text = await response.text()
+            elif content_type == "form":
+                normalized_api_params = normalize_for_form(api_params)
+                async with session.post(url, data=normalized_api_params, headers=headers) as response:
                     response_text = await response.text()
-            elif method.lower() == "post":
-                if content_type == "json":
-                    async with session.post(url, json=api_params, headers=headers) as response:
-                        response_text = await response.text()
-                elif content_type == "form":
-                    normalized_api_params = normalize_for_form(api_params)
-                    async with session.post(url, data=normalized_api_params, headers=headers) as response:
-                        response_text = await response.text()
 
-            return response_text
+        return response_text
     except Exception as e:
         message = f"ERROR CALLING API: Please check your API: {e}"
         logger.error(message)
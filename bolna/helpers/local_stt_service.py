@@ -0,0 +1,217 @@
+import asyncio
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import vosk
+from websockets.protocol import State
+
+from bolna.constants import DEFAULT_LOCAL_STT_BATCH_WINDOW_MS, DEFAULT_LOCAL_STT_MODEL, DEFAULT_LOCAL_STT_WORKERS
+from bolna.helpers.batch_loop import BatchLoop
+from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.resource_registry import resource_registry
+
+logger = configure_logger(__name__)
+
+VOSK_MODEL_URL = "https://alphacephei.com/vosk/models/{}.zip"
+# Audio fed to a recognizer at once, short enough for the endpointer to close an utterance where it ends
+CHUNK_DURATION = 0.2
+
+
+def download_vosk_model(model_name=DEFAULT_LOCAL_STT_MODEL, model_url=VOSK_MODEL_URL):
+    save_path = os.path.expanduser('~/.cache/bolna/vosk/')
+    model_path = os.path.join(save_path, model_name)
+
+    if os.path.isdir(model_path):
+        logger.info(f'Model already exists at {model_path}')
+        return model_path
+
+    os.makedirs(save_path, exist_ok=True)
+    archive_path = f"{model_path}.zip"
+    logger.info(f"Downloading Vosk model {model_name}")
+    try:
+        with requests.get(model_url.format(model_name), stream=True) as response:
+            response.raise_for_status()
+            with open(archive_path, 'wb') as file:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    file.write(chunk)
+        with zipfile.ZipFile(archive_path) as archive:
+            archive.extractall(save_path)
+        logger.info(f'Model downloaded to {model_path}')
+    except Exception as e:
+        logger.error(f"Failed to download the model. {e}")
+    finally:
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+
+    return model_path
+
+
+def load_vosk_model(path):
+    vosk.SetLogLevel(-1)
+    return vosk.Model(path)
+
+
+class LocalSTTStream:
+    """
+    Recognition of one audio stream (e.g. the inbound audio of a call) by the shared LocalSTTService. It is used like
+    the websocket connections of the remote transcribers: 16 bit PCM is sent with `send()` as it arrives and iterating
+    over the stream returns its results until it is closed.
+
+    Results are `partial` events, the hypothesis of the current utterance each time it changes, and `final` events,
+    the utterance closed by the endpointer once `endpointing_ms` of silence followed it. Both are timestamped with
+    the seconds of audio since the start of the stream they were recognized at. `finish()` flushes the audio sent so
+    far (its last utterance comes out as a `final` event) and closes the stream.
+    """
+
+    def __init__(self, service, recognizer, sample_rate):
+        self.service = service
+        self.recognizer = recognizer
+        self.sample_rate = int(sample_rate)
+        self.state = State.OPEN
+        self.finishing = False
+        self.pending = bytearray()
+        self.partial = ""
+        self.processed_samples = 0
+        self.events = asyncio.Queue()
+        self.__leftover_byte = b''
+
+    async def send(self, pcm_data):
+        if self.state is not State.OPEN or self.finishing:
+            return
+        pcm_data = self.__leftover_byte + bytes(pcm_data)
+        if len(pcm_data) % 2:
+            pcm_data, self.__leftover_byte = pcm_data[:-1], pcm_data[-1:]
+        else:
+            self.__leftover_byte = b''
+        if pcm_data:
+            self.pending += pcm_data
+            self.service.notify(self)
+
+    async def finish(self):
+        if self.state is not State.OPEN or self.finishing:
+            return
+        self.finishing = True
+        self.service.notify(self)
+
+    def on_events(self, events):
+        for event in events:
+            self.events.put_nowait(event)
+
+    async def close(self):
+        if self.state is State.CLOSED:
+            return
+        self.state = State.CLOSED
+        self.pending.clear()
+        self.service.close_stream(self)
+        self.events.put_nowait(None)
+
+    async def __aiter__(self):
+        while True:
+            event = await self.events.get()
+            if event is None:
+                return
+            yield event
+
+
+class LocalSTTService:
+    """
+    Offline speech recognition (Vosk, Kaldi models decoded on the CPU) shared by every call of the process. The model
+    is loaded once and each stream keeps its own recognizer. The audio waiting in all the streams is recognized
+    together per tick, one job per stream on a shared pool of `workers` threads (Vosk releases the GIL while
+    decoding), so that the event loop isn't held by the recognition and the audio of a stream is decoded in order.
+    The ticks are run by a BatchLoop, a stream is ready once audio was sent to it or it is finishing.
+    """
+
+    def __init__(self, model=DEFAULT_LOCAL_STT_MODEL, batch_window_ms=DEFAULT_LOCAL_STT_BATCH_WINDOW_MS,
+                 workers=DEFAULT_LOCAL_STT_WORKERS):
+        path = model if os.path.isdir(model) else download_vosk_model(model)
+        self.model = resource_registry.get_or_create("vosk_model", path, lambda: load_vosk_model(path))
+        self.executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count(), thread_name_prefix="local_stt")
+        self.runs = 0
+        self.jobs = 0
+        self.audio_duration = 0.0
+        self.__batch_loop = BatchLoop("local speech recognition", self.__tick, batch_window_ms / 1000)
+
+    def open_stream(self, sample_rate=16000, endpointing_ms=None):
+        self.__batch_loop.start()
+        recognizer = vosk.KaldiRecognizer(self.model, int(sample_rate))
+        recognizer.SetWords(True)
+        if endpointing_ms and hasattr(recognizer, "SetEndpointerDelays"):
+            # Older Vosk releases use the fixed endpointing rules of the model
+            recognizer.SetEndpointerDelays(5.0, int(endpointing_ms) / 1000, 20.0)
+        return LocalSTTStream(self, recognizer, sample_rate)
+
+    def notify(self, stream):
+        self.__batch_loop.notify(stream)
+
+    def close_stream(self, stream):
+        self.__batch_loop.discard(stream)
+
+    @staticmethod
+    def __final_event(stream, result):
+        result = json.loads(result)
+        words = result.get("result") or []
+        stream.partial = ""
+        return {"type": "final", "text": result.get("text", ""), "words": words,
+                "timestamp": words[-1]["end"] if words else stream.processed_samples / stream.sample_rate}
+
+    def recognize(self, stream, audio, flush):
+        """Events of the audio sent to a stream since its previous job, run in the worker threads"""
+        events = []
+        recognizer = stream.recognizer
+        chunk_size = int(stream.sample_rate * CHUNK_DURATION) * 2
+        for offset in range(0, len(audio), chunk_size):
+            chunk = audio[offset:offset + chunk_size]
+            stream.processed_samples += len(chunk) // 2
+            if recognizer.AcceptWaveform(chunk):
+                events.append(self.__final_event(stream, recognizer.Result()))
+                continue
+            partial = json.loads(recognizer.PartialResult()).get("partial", "")
+            if partial != stream.partial:
+                stream.partial = partial
+                if partial:
+                    events.append({"type": "partial", "text": partial,
+                                   "timestamp": stream.processed_samples / stream.sample_rate})
+        if flush:
+            events.append(self.__final_event(stream, recognizer.FinalResult()))
+        return events
+
+    async def __tick(self, ready_streams):
+        batch = []
+        for stream in ready_streams.values():
+            audio, stream.pending = bytes(stream.pending), bytearray()
+            batch.append((stream, audio, stream.finishing))
+        ready_streams.clear()
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(loop.run_in_executor(self.executor, self.recognize, stream, audio, flush)
+                                         for stream, audio, flush in batch), return_exceptions=True)
+        self.runs += 1
+        self.jobs += len(batch)
+        for (stream, audio, flush), events in zip(batch, results):
+            self.audio_duration += len(audio) / 2 / stream.sample_rate
+            if isinstance(events, Exception):
+                logger.error(f"Error while recognizing a local stream: {events}")
+                events = []
+            if stream.state is State.CLOSED:
+                continue
+            stream.on_events(events)
+            if flush:
+                await stream.close()
+
+    def stats(self):
+        return {"runs": self.runs, "jobs": self.jobs, "audio_duration": round(self.audio_duration, 3),
+                "ready_streams": len(self.__batch_loop.ready_streams),
+                "average_batch_size": self.jobs / self.runs if self.runs else 0}
+
+    async def close(self):
+        await self.__batch_loop.close()
+        self.executor.shutdown(wait=False)
+
+
+def get_local_stt_service(model=DEFAULT_LOCAL_STT_MODEL):
+    """The LocalSTTService of the process for `model` (a Vosk model name, downloaded once, or the path of a model)"""
+    return resource_registry.get_or_create("local_stt_service", model, lambda: LocalSTTService(model))
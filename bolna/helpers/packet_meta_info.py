@@ -0,0 +1,106 @@
+import copy
+from collections.abc import MutableMapping
+
+_MISSING = object()
+_DELETED = object()
+
+# Beyond this many shared layers lookups get slower than a flat copy, so the layers are merged
+MAX_SHARED_LAYERS = 4
+
+
+class PacketMetaInfo(MutableMapping):
+    """
+    Copy-on-write meta_info attached to every ws data packet.
+
+    Turn level data (request_id, sequence_id, text, ...) is kept in frozen layers which are shared between all the
+    packets derived from it. Per packet fields such as is_md5_hash, llm_generated, chunk_id or mark_id are written into
+    a small overlay owned by the packet, hence deriving a packet never clones the whole meta_info.
+    It behaves like a dict so the handlers reading `packet["meta_info"]` keep working as is.
+    """
+    __slots__ = ("_layers", "_overlay")
+
+    def __init__(self, base=None, overlay=None):
+        if base is None:
+            self._layers = ()
+        elif isinstance(base, PacketMetaInfo):
+            self._layers = base._freeze()
+        else:
+            self._layers = (dict(base),)
+        self._overlay = {} if overlay is None else dict(overlay)
+
+    def _freeze(self):
+        # Moves the writes done so far into a shared layer so that derived packets don't see any later writes
+        if self._overlay:
+            layers = self._layers + (self._overlay,)
+            if len(layers) > MAX_SHARED_LAYERS:
+                layers = (self._flatten(layers),)
+            self._layers = layers
+            self._overlay = {}
+        return self._layers
+
+    @staticmethod
+    def _flatten(layers):
+        merged = {}
+        for layer in layers:
+            merged.update(layer)
+        return {key: value for key, value in merged.items() if value is not _DELETED}
+
+    def _lookup(self, key):
+        value = self._overlay.get(key, _MISSING)
+        if value is _MISSING:
+            for layer in reversed(self._layers):
+                value = layer.get(key, _MISSING)
+                if value is not _MISSING:
+                    break
+        return value
+
+    def __getitem__(self, key):
+        value = self._lookup(key)
+        if value is _MISSING or value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._overlay[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if any(key in layer for layer in self._layers):
+            self._overlay[key] = _DELETED
+        else:
+            del self._overlay[key]
+
+    def __contains__(self, key):
+        value = self._lookup(key)
+        return value is not _MISSING and value is not _DELETED
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        if value is _MISSING or value is _DELETED:
+            return default
+        return value
+
+    def copy(self):
+        return PacketMetaInfo(self)
+
+    def to_dict(self):
+        return self._flatten(self._layers + (self._overlay,))
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return PacketMetaInfo(copy.deepcopy(self.to_dict(), memo))
+
+    def __reduce__(self):
+        return PacketMetaInfo, (self.to_dict(),)
+
+    def __repr__(self):
+        return repr(self.to_dict())
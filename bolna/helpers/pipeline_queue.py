@@ -0,0 +1,130 @@
+import asyncio
+import time
+from collections import deque
+
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+QUEUE_POLICIES = (BLOCK, DROP_OLDEST)
+
+
+class PipelineQueue(asyncio.Queue):
+    """
+    Bounded asyncio.Queue between two stages of the pipeline which keeps counters about its own usage.
+
+    When the queue is full, a `block` queue makes the producer wait (backpressure, e.g. for LLM tokens or synthesized
+    audio) whereas a `drop_oldest` queue evicts the oldest audio packet (e.g. stale user audio which is useless once
+    late). Control packets (end of stream, close sentinels...) are never evicted, they go over the bound if need be.
+    Every item is timestamped when enqueued so that the time spent waiting in the queue can be reported by `stats()`.
+    """
+
+    def __init__(self, name, maxsize=0, policy=BLOCK):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy {policy}, expected one of {QUEUE_POLICIES}")
+        super().__init__(maxsize)
+        self.name = name
+        self.policy = policy
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped_count = 0
+        self.flushed_count = 0
+        self.max_depth = 0
+        self.total_wait_time = 0
+        self.max_wait_time = 0
+        self.blocked_put_count = 0
+        self.total_blocked_time = 0
+        self.last_get_time = None  # monotonic time at which the consumer last took an item
+
+    def _init(self, maxsize):
+        # Items are stored along with the monotonic time at which they were enqueued
+        self._queue = deque()
+
+    def _put(self, item):
+        self._queue.append((time.monotonic(), item))
+        self.put_count += 1
+        self.max_depth = max(self.max_depth, len(self._queue))
+
+    def _get(self):
+        enqueued_at, item = self._queue.popleft()
+        self.last_get_time = time.monotonic()
+        wait_time = self.last_get_time - enqueued_at
+        self.get_count += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        return item
+
+    def _discard_oldest(self):
+        self._queue.popleft()
+        self.task_done()
+        self._wakeup_next(self._putters)
+
+    @staticmethod
+    def is_droppable(item):
+        """Whether a `drop_oldest` queue may evict `item`: audio packets only, never the control packets"""
+        if not isinstance(item, dict):
+            return False
+        meta_info = item.get("meta_info") or {}
+        return isinstance(item.get("data"), (bytes, bytearray, memoryview)) and meta_info.get("eos") is not True
+
+    def __discard_oldest_droppable(self):
+        for index, (_, item) in enumerate(self._queue):
+            if self.is_droppable(item):
+                del self._queue[index]
+                self.task_done()
+                return True
+        return False
+
+    def __put_over_bound(self, item):
+        self._put(item)
+        self._unfinished_tasks += 1
+        self._finished.clear()
+        self._wakeup_next(self._getters)
+
+    def put_nowait(self, item):
+        if self.policy == DROP_OLDEST and self.full():
+            if not self.__discard_oldest_droppable():
+                # Nothing but control packets queued, which must reach the consumer
+                return self.__put_over_bound(item)
+            self.dropped_count += 1
+            if self.dropped_count == 1 or self.dropped_count % 100 == 0:
+                logger.warning(f"{self.name} queue is full, dropped {self.dropped_count} stale items so far")
+        super().put_nowait(item)
+
+    async def put(self, item):
+        if self.policy == DROP_OLDEST or not self.full():
+            return self.put_nowait(item)
+
+        self.blocked_put_count += 1
+        start_time = time.monotonic()
+        try:
+            return await super().put(item)
+        finally:
+            self.total_blocked_time += time.monotonic() - start_time
+
+    def clear(self):
+        """Drops everything currently queued, e.g. on interruption. Returns the number of dropped items"""
+        count = 0
+        while not self.empty():
+            self._discard_oldest()
+            count += 1
+        self.flushed_count += count
+        return count
+
+    def stats(self):
+        return {
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "depth": self.qsize(),
+            "max_depth": self.max_depth,
+            "put_count": self.put_count,
+            "get_count": self.get_count,
+            "dropped_count": self.dropped_count,
+            "flushed_count": self.flushed_count,
+            "avg_wait_time_ms": round(self.total_wait_time * 1000 / self.get_count, 3) if self.get_count else 0,
+            "max_wait_time_ms": round(self.max_wait_time * 1000, 3),
+            "blocked_put_count": self.blocked_put_count,
+            "total_blocked_time_ms": round(self.total_blocked_time * 1000, 3),
+        }
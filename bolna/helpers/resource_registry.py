@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+
+import aiohttp
+import httpx
+
+from bolna.constants import DEFAULT_AIOHTTP_POOL_LIMITS, DEFAULT_AIOHTTP_TIMEOUT, DEFAULT_AUDIO_ASSET_CACHE_BYTES, \
+    DEFAULT_HTTPX_POOL_LIMITS
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+
+def _get_running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class AudioAssetCache:
+    """LRU cache of raw audio bytes (preprocessed responses, fillers, backchannels, ambient noise) bounded in bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_AUDIO_ASSET_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.__assets = OrderedDict()
+
+    def get(self, key):
+        audio = self.__assets.get(key)
+        if audio is None:
+            self.misses += 1
+            return None
+        self.__assets.move_to_end(key)
+        self.hits += 1
+        return audio
+
+    def put(self, key, audio):
+        if audio is None or len(audio) > self.max_bytes:
+            return
+        previous = self.__assets.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self.__assets[key] = audio
+        self.size += len(audio)
+        while self.size > self.max_bytes:
+            _, evicted = self.__assets.popitem(last=False)
+            self.size -= len(evicted)
+
+    def __len__(self):
+        return len(self.__assets)
+
+    def stats(self):
+        return {"assets": len(self.__assets), "size_bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+
+class ResourceRegistry:
+    """
+    Process wide registry of the resources which don't need to be owned by a single call: HTTP connection pools,
+    ONNX sessions, embedding models, classifiers and audio assets. Every TaskManager of the process draws from it so
+    that the memory used per concurrent call is only the call's own state.
+
+    Models are registered through `get_or_create(kind, key, factory)` which builds them once (thread safely, as some
+    of them are loaded from executor threads) and keeps them for the lifetime of the process. Connection pools are
+    bound to the event loop they are used from.
+    """
+
+    def __init__(self):
+        self.__lock = threading.RLock()  # factories may register the resources they are built from
+        self.__resources = {}
+        self.__httpx_clients = {}
+        self.__aiohttp_sessions = weakref.WeakKeyDictionary()
+        self.audio_assets = AudioAssetCache()
+
+    def get_or_create(self, kind, key, factory):
+        resource_key = (kind, key)
+        resource = self.__resources.get(resource_key)
+        if resource is None:
+            with self.__lock:
+                resource = self.__resources.get(resource_key)
+                if resource is None:
+                    logger.info(f"Creating shared {kind} for {key}")
+                    resource = factory()
+                    self.__resources[resource_key] = resource
+        return resource
+
+    def get_httpx_client(self, name="default", http2=False):
+        """Shared httpx.AsyncClient, e.g. for the OpenAI/Azure SDK clients of every call"""
+        client_key = (name, http2, _get_running_loop())
+        client = self.__httpx_clients.get(client_key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(**DEFAULT_HTTPX_POOL_LIMITS),
+                timeout=httpx.Timeout(600.0, connect=10.0),
+                http2=http2
+            )
+            self.__httpx_clients[client_key] = client
+        return client
+
+    def get_aiohttp_session(self):
+        """
+        Shared aiohttp.ClientSession of the running event loop. It must not be closed (nor used as a context manager)
+        by its users, it is closed by `close()` when the process shuts down.
+        """
+        loop = asyncio.get_running_loop()
+        session = self.__aiohttp_sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**DEFAULT_AIOHTTP_POOL_LIMITS),
+                timeout=aiohttp.ClientTimeout(**DEFAULT_AIOHTTP_TIMEOUT)
+            )
+            self.__aiohttp_sessions[loop] = session
+        return session
+
+    def stats(self):
+        return {
+            "resources": sorted(f"{kind}:{key}" for kind, key in self.__resources),
+            "httpx_clients": len(self.__httpx_clients),
+            "aiohttp_sessions": len(self.__aiohttp_sessions),
+            "audio_assets": self.audio_assets.stats()
+        }
+
+    async def close(self):
+        loop = _get_running_loop()
+        for client_key, client in list(self.__httpx_clients.items()):
+            if client_key[2] in (None, loop):
+                await client.aclose()
+                del self.__httpx_clients[client_key]
+        session = self.__aiohttp_sessions.pop(loop, None) if loop is not None else None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+resource_registry = ResourceRegistry()
@@ -0,0 +1,66 @@
+import asyncio
+import re
+
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+_END_OF_STREAM = object()
+
+
+def normalize_transcript(transcript):
+    """Transcripts are compared without case, punctuation or extra spaces since finals often only re-punctuate"""
+    return " ".join(re.sub(r"[^\w\s']", " ", (transcript or "").lower()).split())
+
+
+class SpeculativeGeneration:
+    """
+    LLM generation started on a stable interim transcript before the final transcript arrived.
+
+    The LLM messages are buffered rather than acted upon, hence nothing is synthesized, stored into the history or
+    called (function calls) until the generation is committed because the final transcript matched. Committing hands
+    over the buffered messages, followed by the ones still being generated, through `stream()`.
+    """
+
+    def __init__(self, transcript):
+        self.transcript = transcript
+        self.normalized_transcript = normalize_transcript(transcript)
+        self.meta_info = None
+        self.task = None
+        self.committed = False
+        self.__buffer = asyncio.Queue()
+
+    def start(self, coroutine):
+        self.task = asyncio.create_task(coroutine)
+
+    def matches(self, transcript):
+        return self.meta_info is not None and self.normalized_transcript == normalize_transcript(transcript)
+
+    async def consume(self, llm_stream):
+        try:
+            async for llm_message in llm_stream:
+                self.__buffer.put_nowait(llm_message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in speculative generation for '{self.transcript}': {e}")
+            self.__buffer.put_nowait(e)
+        finally:
+            self.__buffer.put_nowait(_END_OF_STREAM)
+
+    async def stream(self):
+        try:
+            while True:
+                llm_message = await self.__buffer.get()
+                if llm_message is _END_OF_STREAM:
+                    return
+                if isinstance(llm_message, Exception):
+                    raise llm_message
+                yield llm_message
+        finally:
+            # Stop generating if whoever consumes the stream stopped early (e.g. interruption)
+            self.cancel()
+
+    def cancel(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
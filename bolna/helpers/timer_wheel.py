@@ -0,0 +1,193 @@
+import asyncio
+import math
+
+from bolna.constants import DEFAULT_TIMER_WHEEL_TICK_MS
+from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.resource_registry import resource_registry
+
+logger = configure_logger(__name__)
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+# Each level covers SLOTS times the span of the one below, 64 ** 4 ticks is over 9 days at 50 ms
+LEVELS = 4
+MAX_TICKS = SLOTS ** LEVELS - 1
+
+
+def _set_result(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class TimerHandle:
+    __slots__ = ("wheel", "callback", "args", "expiry", "bucket", "cancelled")
+
+    def __init__(self, wheel, callback, args, expiry):
+        self.wheel = wheel
+        self.callback = callback
+        self.args = args
+        self.expiry = expiry  # tick at which the timer fires
+        self.bucket = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.wheel.cancel(self)
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel running the timers of every call of the process (keepalives, utterance timeouts, silence
+    checks...) from a single event loop timer, instead of a sleeping coroutine per call and per timeout.
+
+    Arming (`call_later()`) and cancelling a timer are O(1). The event loop is only woken up at the ticks which have
+    timers due or timers to move down from an upper level, and never while no timer is armed. Timers fire within a
+    tick of their delay, never before.
+    """
+
+    def __init__(self, tick_ms=DEFAULT_TIMER_WHEEL_TICK_MS):
+        self.tick = tick_ms / 1000
+        self.pending = 0
+        self.wakeups = 0
+        self.fired = 0
+        self.__levels = [[{} for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self.__loop = None
+        self.__origin = 0.0
+        self.__current_tick = 0
+        self.__wakeup_handle = None
+        self.__wakeup_tick = None
+
+    def __now_tick(self):
+        # The event loop may run a timer up to its clock resolution early
+        return int((self.__loop.time() - self.__origin) / self.tick + 1e-6)
+
+    def __bind(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self.__loop:
+            # Timers armed from another (closed) event loop can't run anymore, e.g. between two asyncio.run()
+            if self.__wakeup_handle is not None:
+                self.__wakeup_handle.cancel()
+            self.__levels = [[{} for _ in range(SLOTS)] for _ in range(LEVELS)]
+            self.__loop, self.__origin = loop, loop.time()
+            self.__current_tick, self.pending = 0, 0
+            self.__wakeup_handle = self.__wakeup_tick = None
+        elif not self.pending:
+            # Nothing is armed, the wheel jumps to now instead of walking the ticks it was idle for
+            self.__current_tick = self.__now_tick()
+
+    def __insert(self, handle):
+        ticks = min(handle.expiry - self.__current_tick, MAX_TICKS)
+        if ticks <= 0:
+            level, target = 0, self.__current_tick
+        else:
+            level = 0
+            while ticks >> (SLOT_BITS * (level + 1)):
+                level += 1
+            target = self.__current_tick + ticks
+        bucket = self.__levels[level][(target >> (SLOT_BITS * level)) & SLOT_MASK]
+        bucket[handle] = None
+        handle.bucket = bucket
+        # Tick at which the bucket is fired (level 0) or cascaded to the level below
+        return target >> (SLOT_BITS * level) << (SLOT_BITS * level)
+
+    def call_later(self, delay, callback, *args):
+        """Calls `callback(*args)` in `delay` seconds, like `loop.call_later()`, returns a handle to cancel it"""
+        self.__bind()
+        expiry = max(math.ceil((self.__loop.time() + delay - self.__origin) / self.tick), self.__current_tick + 1)
+        handle = TimerHandle(self, callback, args, expiry)
+        due_tick = self.__insert(handle)
+        self.pending += 1
+        if self.__wakeup_tick is None or due_tick < self.__wakeup_tick:
+            self.__schedule_wakeup(due_tick)
+        return handle
+
+    def cancel(self, handle):
+        if handle.cancelled:
+            return
+        handle.cancelled = True
+        if handle.bucket is not None:
+            del handle.bucket[handle]
+            handle.bucket = None
+            self.pending -= 1
+
+    async def sleep(self, delay):
+        """`asyncio.sleep()` on the wheel"""
+        future = asyncio.get_running_loop().create_future()
+        handle = self.call_later(delay, _set_result, future)
+        try:
+            await future
+        finally:
+            handle.cancel()
+
+    def __cascade(self):
+        # Timers of the upper levels move down once the levels below have gone round
+        for level in range(LEVELS - 1, 0, -1):
+            if self.__current_tick & ((1 << (SLOT_BITS * level)) - 1):
+                continue
+            slot = (self.__current_tick >> (SLOT_BITS * level)) & SLOT_MASK
+            bucket, self.__levels[level][slot] = self.__levels[level][slot], {}
+            for handle in bucket:
+                self.__insert(handle)
+
+    def __fire(self):
+        bucket = self.__levels[0][self.__current_tick & SLOT_MASK]
+        while bucket:
+            # Callbacks may cancel the other timers of the bucket
+            handle = next(iter(bucket))
+            del bucket[handle]
+            handle.bucket = None
+            handle.cancelled = True
+            self.pending -= 1
+            self.fired += 1
+            try:
+                handle.callback(*handle.args)
+            except Exception as e:
+                logger.error(f"Error in timer callback {handle.callback}: {e}")
+
+    def __next_due_tick(self):
+        """Next tick with level 0 timers due or upper level timers to cascade, the earliest of the two"""
+        due_tick = None
+        for offset in range(1, SLOTS):
+            if self.__levels[0][(self.__current_tick + offset) & SLOT_MASK]:
+                due_tick = self.__current_tick + offset
+                break
+        boundary = self.__current_tick
+        for _ in range(SLOTS):
+            boundary = (boundary >> SLOT_BITS) + 1 << SLOT_BITS
+            if due_tick is not None and boundary >= due_tick:
+                return due_tick
+            for level in range(1, LEVELS):
+                if boundary & ((1 << (SLOT_BITS * level)) - 1):
+                    break
+                if self.__levels[level][(boundary >> (SLOT_BITS * level)) & SLOT_MASK]:
+                    return boundary
+        # Nothing found this far ahead, the wheel wakes up at the last boundary scanned to look further
+        return boundary if due_tick is None else min(due_tick, boundary)
+
+    def __schedule_wakeup(self, tick):
+        if self.__wakeup_handle is not None:
+            self.__wakeup_handle.cancel()
+        self.__wakeup_tick = tick
+        self.__wakeup_handle = self.__loop.call_at(self.__origin + tick * self.tick, self.__run)
+
+    def __run(self):
+        self.__wakeup_handle = self.__wakeup_tick = None
+        self.wakeups += 1
+        now_tick = self.__now_tick()
+        while self.pending and self.__current_tick < now_tick:
+            # Straight to the next tick with something to do, the ticks in between have no timers nor cascades
+            self.__current_tick = min(self.__next_due_tick(), now_tick)
+            self.__cascade()
+            self.__fire()
+        if self.pending:
+            next_tick = max(self.__next_due_tick(), self.__current_tick + 1)
+            if self.__wakeup_tick is None or next_tick < self.__wakeup_tick:
+                self.__schedule_wakeup(next_tick)
+
+    def stats(self):
+        return {"pending": self.pending, "wakeups": self.wakeups, "fired": self.fired}
+
+
+def get_timer_wheel():
+    """The TimerWheel of the process"""
+    return resource_registry.get_or_create("timer_wheel", None, TimerWheel)
@@ -0,0 +1,157 @@
+import json
+import os
+import time
+import uuid
+
+import aiofiles
+
+from bolna.helpers.logger_config import configure_logger
+
+logger = configure_logger(__name__)
+
+# Hand-offs of a turn in the order they are expected to happen
+ASR_LAST_AUDIO_SENT = "asr_last_audio_sent"
+FINAL_TRANSCRIPT = "final_transcript"
+LLM_REQUEST = "llm_request"
+LLM_FIRST_TOKEN = "llm_first_token"
+LLM_LAST_TOKEN = "llm_last_token"
+TTS_REQUEST = "tts_request"
+TTS_FIRST_BYTE = "tts_first_byte"
+FIRST_AUDIO_SENT = "first_audio_sent"
+LAST_AUDIO_SENT = "last_audio_sent"
+
+# name -> (start event, end event) of the spans reported for every turn
+TURN_STAGES = {
+    "transcriber": (ASR_LAST_AUDIO_SENT, FINAL_TRANSCRIPT),
+    "llm_first_token": (LLM_REQUEST, LLM_FIRST_TOKEN),
+    "llm_stream": (LLM_REQUEST, LLM_LAST_TOKEN),
+    "synthesizer_first_byte": (TTS_REQUEST, TTS_FIRST_BYTE),
+    "output_first_audio": (TTS_FIRST_BYTE, FIRST_AUDIO_SENT),
+    "playback": (FIRST_AUDIO_SENT, LAST_AUDIO_SENT),
+    "turn": (FINAL_TRANSCRIPT, FIRST_AUDIO_SENT),
+}
+
+
+class TurnTrace:
+    __slots__ = ("turn_id", "sequence_id", "events")
+
+    def __init__(self, turn_id, sequence_id):
+        self.turn_id = turn_id
+        self.sequence_id = sequence_id
+        self.events = {}  # event name -> time.monotonic()
+
+    def durations(self):
+        durations = {}
+        for stage, (start_event, end_event) in TURN_STAGES.items():
+            if start_event in self.events and end_event in self.events:
+                durations[stage] = round((self.events[end_event] - self.events[start_event]) * 1000, 3)
+        return durations
+
+
+class TurnTracer:
+    """
+    Records monotonic timestamps of the hand-offs between transcriber, LLM, synthesizer and output for every turn,
+    keyed by sequence_id, so that the time spent in every stage of a turn can be read out of a single trace.
+
+    Traces can be exported as plain JSON or as OTLP/JSON (one trace per call, one span per turn with a child span per
+    stage) which any OpenTelemetry collector can ingest.
+    """
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id
+        self.turns = {}
+        # Monotonic timestamps are converted to wall clock only when exporting
+        self.monotonic_origin = time.monotonic()
+        self.wall_clock_origin = time.time()
+
+    def mark(self, event, sequence_id, turn_id=None, timestamp=None, overwrite=False):
+        """Records `event` for the turn of `sequence_id`. Only the first occurrence is kept unless `overwrite` is set"""
+        if sequence_id is None or sequence_id == -1:
+            return
+        trace = self.turns.get(sequence_id)
+        if trace is None:
+            trace = self.turns[sequence_id] = TurnTrace(turn_id, sequence_id)
+        elif trace.turn_id is None:
+            trace.turn_id = turn_id
+        if overwrite or event not in trace.events:
+            trace.events[event] = time.monotonic() if timestamp is None else timestamp
+
+    def from_wall_clock(self, timestamp):
+        """Monotonic timestamp of a wall clock one (seconds since the epoch), e.g. recorded by another component"""
+        return self.monotonic_origin + timestamp - self.wall_clock_origin
+
+    def has_event(self, event, sequence_id):
+        trace = self.turns.get(sequence_id)
+        return trace is not None and event in trace.events
+
+    def __to_unix_nano(self, monotonic_ts):
+        return int((self.wall_clock_origin + monotonic_ts - self.monotonic_origin) * 1e9)
+
+    def to_json(self):
+        turns = []
+        for trace in self.turns.values():
+            start = min(trace.events.values()) if trace.events else 0
+            turns.append({
+                "turn_id": trace.turn_id,
+                "sequence_id": trace.sequence_id,
+                "start_time": self.__to_unix_nano(start) / 1e9 if trace.events else None,
+                "events_ms": {event: round((ts - start) * 1000, 3) for event, ts in sorted(trace.events.items(), key=lambda item: item[1])},
+                "durations_ms": trace.durations()
+            })
+        return {"run_id": self.run_id, "turns": turns}
+
+    def to_otlp(self):
+        trace_id = uuid.uuid5(uuid.NAMESPACE_OID, str(self.run_id)).hex
+        spans = []
+        for trace in self.turns.values():
+            if not trace.events:
+                continue
+            turn_span_id = os.urandom(8).hex()
+            attributes = [
+                {"key": "bolna.run_id", "value": {"stringValue": str(self.run_id)}},
+                {"key": "bolna.sequence_id", "value": {"intValue": str(trace.sequence_id)}}
+            ]
+            if trace.turn_id is not None:
+                turn_id_value = {"intValue": str(trace.turn_id)} if isinstance(trace.turn_id, int) else {"stringValue": str(trace.turn_id)}
+                attributes.append({"key": "bolna.turn_id", "value": turn_id_value})
+            spans.append({
+                "traceId": trace_id,
+                "spanId": turn_span_id,
+                "name": "turn",
+                "kind": 1,
+                "startTimeUnixNano": str(self.__to_unix_nano(min(trace.events.values()))),
+                "endTimeUnixNano": str(self.__to_unix_nano(max(trace.events.values()))),
+                "attributes": attributes,
+                "events": [{"timeUnixNano": str(self.__to_unix_nano(ts)), "name": event} for event, ts in trace.events.items()]
+            })
+            for stage, (start_event, end_event) in TURN_STAGES.items():
+                if stage == "turn" or start_event not in trace.events or end_event not in trace.events:
+                    continue
+                spans.append({
+                    "traceId": trace_id,
+                    "spanId": os.urandom(8).hex(),
+                    "parentSpanId": turn_span_id,
+                    "name": stage,
+                    "kind": 1,
+                    "startTimeUnixNano": str(self.__to_unix_nano(trace.events[start_event])),
+                    "endTimeUnixNano": str(self.__to_unix_nano(trace.events[end_event])),
+                    "attributes": attributes
+                })
+
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "bolna"}}]},
+                "scopeSpans": [{"scope": {"name": "bolna.turn_tracer"}, "spans": spans}]
+            }]
+        }
+
+    async def export(self, traces_dir):
+        """Writes `<run_id>.json` and `<run_id>.otlp.json` into `traces_dir`"""
+        try:
+            os.makedirs(traces_dir, exist_ok=True)
+            async with aiofiles.open(os.path.join(traces_dir, f"{self.run_id}.json"), mode='w') as trace_file:
+                await trace_file.write(json.dumps(self.to_json()))
+            async with aiofiles.open(os.path.join(traces_dir, f"{self.run_id}.otlp.json"), mode='w') as trace_file:
+                await trace_file.write(json.dumps(self.to_otlp()))
+        except Exception as e:
+            logger.error(f"Error while exporting turn traces for {self.run_id}: {e}")
@@ -4,7 +4,6 @@ import asyncio
 import time
 import math
 import re
-import copy
 import hashlib
 import os
 import traceback
@@ -21,7 +20,12 @@ from contextlib import AsyncExitStack
 from dotenv import load_dotenv
 from pydantic import create_model
 from .logger_config import configure_logger
-from bolna.constants import PREPROCESS_DIR, PRE_FUNCTION_CALL_MESSAGE, DEFAULT_LANGUAGE_CODE, TRANSFERING_CALL_FILLER
+from .packet_meta_info import PacketMetaInfo
+from .conversation_history import ConversationHistory, format_message
+from .resource_registry import resource_registry
+from .audio_resampler import resample_pcm
+from .audio_codec import lin2ulaw
+from bolna.constants import PREPROCESS_DIR, PRE_FUNCTION_CALL_MESSAGE, DEFAULT_LANGUAGE_CODE, TRANSFERING_CALL_FILLER, DEFAULT_RECORDING_UPLOAD_PART_BYTES
 from bolna.prompts import DATE_PROMPT
 from pydub import AudioSegment
 
@@ -56,10 +60,10 @@ def write_json_file(file_path, data):
 
 
 def create_ws_data_packet(data, meta_info=None, is_md5_hash=False, llm_generated=False):
-    metadata = copy.deepcopy(meta_info)
+    metadata = None
     if meta_info is not None: #It'll be none in case we connect through dashboard playground
-        metadata["is_md5_hash"] = is_md5_hash
-        metadata["llm_generated"] = llm_generated
+        # Packets share the turn level meta_info and only own the per packet fields
+        metadata = PacketMetaInfo(meta_info, {"is_md5_hash": is_md5_hash, "llm_generated": llm_generated})
     return {
         'data': data,
         'meta_info': metadata
@@ -103,6 +107,41 @@ def wav_bytes_to_pcm(wav_bytes):
         return data.tobytes()
 
 
+def wav_bytes_to_pcm_and_sample_rate(wav_bytes):
+    """Mono 16 bit PCM of a WAV file along with its sample rate"""
+    try:
+        with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+            sample_rate, channels, sample_width = wav_file.getframerate(), wav_file.getnchannels(), wav_file.getsampwidth()
+            pcm_data = wav_file.readframes(wav_file.getnframes())
+        if sample_width == 2:
+            if channels > 1:
+                samples = np.frombuffer(pcm_data, dtype=np.int16).reshape(-1, channels)
+                pcm_data = samples.mean(axis=1).astype(np.int16).tobytes()
+            return pcm_data, sample_rate
+    except (wave.Error, EOFError):
+        # e.g. float WAV files which the wave module can't read
+        pass
+    sample_rate, data = wavfile.read(io.BytesIO(wav_bytes))
+    if data.ndim > 1:
+        data = data.mean(axis=1).astype(data.dtype)
+    if data.dtype == np.int32:
+        data = (data >> 16).astype(np.int16)
+    elif data.dtype != np.int16:
+        data = float32_to_int16(data.astype(np.float32))
+    return data.tobytes(), sample_rate
+
+
+def wrap_pcm_in_wav(pcm_data, sample_rate):
+    """Mono 16 bit PCM as a WAV file, only a header is added"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm_data)
+    return buffer.getvalue()
+
+
 # def wav_bytes_to_pcm(wav_bytes):
 #     wav_buffer = io.BytesIO(wav_bytes)
 #     with wave.open(wav_buffer, 'rb') as wav_file:
@@ -118,11 +157,7 @@ def wav_bytes_to_pcm(wav_bytes):
 
 
 def raw_to_mulaw(raw_bytes):
-    # Convert bytes to numpy array of int16 values
-    samples = np.frombuffer(raw_bytes, dtype=np.int16)
-    samples = samples.astype(np.float32) / (2 ** 15)
-    mulaw_encoded = mu_law_encode(samples)
-    return mulaw_encoded
+    return lin2ulaw(raw_bytes)
 
 
 async def get_s3_file(bucket_name = BUCKET_NAME, file_key = ""):
@@ -195,8 +230,43 @@ async def store_file(bucket_name=None, file_key=None, file_data=None, content_ty
             logger.error(f"Could not save local file {e}")
 
 
+async def store_file_in_parts(bucket_name=None, file_key=None, file_obj=None, part_size=DEFAULT_RECORDING_UPLOAD_PART_BYTES):
+    """Streams a file object to S3 with a multipart upload, so that only one part at a time is held in memory"""
+    session = AioSession()
+
+    async with AsyncExitStack() as exit_stack:
+        s3_client = await exit_stack.enter_async_context(session.create_client('s3'))
+        upload_id = None
+        try:
+            part = await asyncio.to_thread(file_obj.read, part_size)
+            next_part = await asyncio.to_thread(file_obj.read, part_size)
+            if not next_part:
+                await s3_client.put_object(Bucket=bucket_name, Key=file_key, Body=part)
+                return
+
+            upload = await s3_client.create_multipart_upload(Bucket=bucket_name, Key=file_key)
+            upload_id = upload['UploadId']
+            parts = []
+            while part:
+                part_number = len(parts) + 1
+                response = await s3_client.upload_part(Bucket=bucket_name, Key=file_key, UploadId=upload_id,
+                                                       PartNumber=part_number, Body=part)
+                parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+                part, next_part = next_part, await asyncio.to_thread(file_obj.read, part_size)
+            await s3_client.complete_multipart_upload(Bucket=bucket_name, Key=file_key, UploadId=upload_id,
+                                                      MultipartUpload={'Parts': parts})
+        except Exception as e:
+            logger.error(f'Exception occurred while uploading {file_key} in parts: {e}')
+            if upload_id is not None:
+                try:
+                    await s3_client.abort_multipart_upload(Bucket=bucket_name, Key=file_key, UploadId=upload_id)
+                except (BotoCoreError, ClientError) as error:
+                    logger.error(error)
+
+
 async def get_raw_audio_bytes(filename, agent_name = None, audio_format='mp3', assistant_id=None, local = False, is_location = False):
     # we are already storing pcm formatted audio in the filler config. No need to encode/decode them further
+    # Assets are shared by every call of the process, local files are keyed by their mtime so that edits are picked up
     audio_data = None
     if local:
         if not is_location:
@@ -204,9 +274,13 @@ async def get_raw_audio_bytes(filename, agent_name = None, audio_format='mp3', a
         else:
             file_name = filename
         if os.path.isfile(file_name):
-            with open(file_name, 'rb') as file:
-                # Read the entire file content into a variable
-                audio_data = file.read()
+            cache_key = ("local", file_name, os.path.getmtime(file_name))
+            audio_data = resource_registry.audio_assets.get(cache_key)
+            if audio_data is None:
+                with open(file_name, 'rb') as file:
+                    # Read the entire file content into a variable
+                    audio_data = file.read()
+                resource_registry.audio_assets.put(cache_key, audio_data)
         else:
             audio_data = None
     else:
@@ -214,13 +288,59 @@ async def get_raw_audio_bytes(filename, agent_name = None, audio_format='mp3', a
             object_key = f"{assistant_id}/audio/{filename}.{audio_format}"
         else:
             object_key = filename
-            
-        logger.info(f"Reading {object_key}")
-        audio_data = await get_s3_file(BUCKET_NAME, object_key)
 
+        cache_key = ("s3", BUCKET_NAME, object_key)
+        audio_data = resource_registry.audio_assets.get(cache_key)
+        if audio_data is None:
+            logger.info(f"Reading {object_key}")
+            audio_data = await get_s3_file(BUCKET_NAME, object_key)
+            resource_registry.audio_assets.put(cache_key, audio_data)
+
+    return audio_data
+
+
+def convert_audio_asset(file_name, sample_rate=None, encoding="wav"):
+    with open(file_name, 'rb') as file:
+        pcm_data, orig_sample_rate = wav_bytes_to_pcm_and_sample_rate(file.read())
+    sample_rate = sample_rate or orig_sample_rate
+    pcm_data = resample_pcm(pcm_data, orig_sample_rate, sample_rate)
+    if encoding == "pcm":
+        return pcm_data
+    elif encoding == "mulaw":
+        return lin2ulaw(pcm_data)
+    return wrap_pcm_in_wav(pcm_data, sample_rate)
+
+
+async def get_audio_asset(file_name, sample_rate=None, encoding="wav"):
+    """
+    Local WAV clip (filler, backchannel, ambient noise) ready to be sent: resampled to `sample_rate` and encoded as
+    `encoding` ("wav", "pcm" or "mulaw"). The conversion is done once per process for every (clip, rate, encoding)
+    and calls get the cached bytes by reference.
+    """
+    if not os.path.isfile(file_name):
+        return None
+    cache_key = ("asset", file_name, os.path.getmtime(file_name), sample_rate, encoding)
+    audio_data = resource_registry.audio_assets.get(cache_key)
+    if audio_data is None:
+        audio_data = await asyncio.to_thread(convert_audio_asset, file_name, sample_rate, encoding)
+        resource_registry.audio_assets.put(cache_key, audio_data)
     return audio_data
 
 
+async def preload_audio_assets(directory, sample_rate=None, encoding="wav"):
+    """Converts every WAV clip of a preset directory ahead of its first use"""
+    try:
+        file_names = [file_name for file_name in os.listdir(directory) if file_name.endswith(".wav")]
+    except OSError as e:
+        logger.error(f"Could not list the audio assets of {directory}: {e}")
+        return
+    for file_name in file_names:
+        try:
+            await get_audio_asset(os.path.join(directory, file_name), sample_rate, encoding)
+        except Exception as e:
+            logger.error(f"Could not preload {directory}/{file_name}: {e}")
+
+
 def get_md5_hash(text):
     return hashlib.md5(text.encode()).hexdigest()
 
@@ -247,27 +367,9 @@ def get_required_input_types(task):
 
 
 def format_messages(messages, use_system_prompt=False, include_tools=False):
-    formatted_string = ""
-    for message in messages:
-        role = message['role']
-        if message['content'] is None:
-            logger.info(f"Continuing the loop as content received is None")
-            continue
-        content = message['content']
-
-        if use_system_prompt and role == 'system':
-            try:
-                formatted_string += "system: " + content + "\n"
-            except Exception as e:
-                a = 1
-        if role == 'assistant':
-            formatted_string += "assistant: " + content + "\n"
-        elif role == 'user':
-            formatted_string += "user: " + content + "\n"
-        elif include_tools and role == 'tool':
-            formatted_string += "tool_response: " + content + "\n"
-
-    return formatted_string
+    if isinstance(messages, ConversationHistory):
+        return messages.format(use_system_prompt=use_system_prompt, include_tools=include_tools)
+    return "".join(format_message(message, use_system_prompt, include_tools) for message in messages)
 
 
 def update_prompt_with_context(prompt, context_data):
@@ -351,9 +453,10 @@ def clean_json_string(json_str):
 
 
 def yield_chunks_from_memory(audio_bytes, chunk_size=512):
-    total_length = len(audio_bytes)
-    for i in range(0, total_length, chunk_size):
-        yield audio_bytes[i:i + chunk_size]
+    # The chunks are memoryview slices sharing the audio rather than copies of it
+    audio_view = memoryview(audio_bytes)
+    for i in range(0, len(audio_view), chunk_size):
+        yield audio_view[i:i + chunk_size]
 
 
 def pcm_to_wav_bytes(pcm_data, sample_rate=16000, num_channels=1, sample_width=2):
@@ -379,16 +482,15 @@ def convert_audio_to_wav(audio_bytes, source_format = 'flac'):
 
 
 def resample(audio_bytes, target_sample_rate, format = "mp3"):
-    audio_buffer = io.BytesIO(audio_bytes)
-    waveform, orig_sample_rate = torchaudio.load(audio_buffer, format = format)
+    if format == "wav":
+        pcm_data, orig_sample_rate = wav_bytes_to_pcm_and_sample_rate(audio_bytes)
+    else:
+        audio = AudioSegment.from_file(io.BytesIO(audio_bytes), format=format).set_channels(1).set_sample_width(2)
+        pcm_data, orig_sample_rate = audio.raw_data, audio.frame_rate
     if orig_sample_rate == target_sample_rate:
         return audio_bytes
-    resampler = torchaudio.transforms.Resample(orig_sample_rate, target_sample_rate)
-    audio_waveform = resampler(waveform)
-    audio_buffer = io.BytesIO()
     logger.info(f"Resampling from {orig_sample_rate} to {target_sample_rate}")
-    torchaudio.save(audio_buffer, audio_waveform, target_sample_rate, format="wav")
-    return audio_buffer.getvalue()
+    return wrap_pcm_in_wav(resample_pcm(pcm_data, orig_sample_rate, target_sample_rate), target_sample_rate)
 
 
 def merge_wav_bytes(wav_files_bytes):
@@ -473,62 +575,19 @@ async def write_request_logs(message, run_id):
             await log_file.write(log_string)
 
 
-async def save_audio_file_to_s3(conversation_recording, sampling_rate = 24000, assistant_id=None, run_id=None):
-    last_frame_end_time = conversation_recording['output'][0]['start_time']
-    logger.info(f"LENGTH OF OUTPUT AUDIO {len(conversation_recording['output'])}")
-    initial_gap = (last_frame_end_time - conversation_recording["metadata"]["started"] ) *1000
-    logger.info(f"Initial gap {initial_gap}")
-    combined_audio = AudioSegment.silent(duration=initial_gap, frame_rate=sampling_rate)
-    for i, frame in enumerate(conversation_recording['output']):
-        frame_start_time =  frame['start_time']
-        logger.info(f"Processing frame {i}, fram start time = {last_frame_end_time}, frame start time= {frame_start_time}")
-        if last_frame_end_time < frame_start_time:
-            gap_duration_samples = frame_start_time - last_frame_end_time
-            silence = AudioSegment.silent(duration=gap_duration_samples*1000, frame_rate=sampling_rate)
-            combined_audio += silence
-        last_frame_end_time = frame_start_time + frame['duration']
-        frame_as = AudioSegment.from_file(io.BytesIO(frame['data']), format = "wav")
-        combined_audio +=frame_as
-
-    webm_segment = AudioSegment.from_file(io.BytesIO(conversation_recording['input']["data"]))
-    wav_bytes = io.BytesIO()
-    webm_segment.export(wav_bytes, format="wav")
-    wav_bytes.seek(0)  # Reset the pointer to the start
-    waveform, sample_rate = torchaudio.load(wav_bytes)
-    resampler = torchaudio.transforms.Resample(orig_freq=sample_rate, new_freq=sampling_rate)
-    downsampled_waveform = resampler(waveform)
-    torchaudio_wavio = io.BytesIO()
-    torchaudio.save(torchaudio_wavio, downsampled_waveform, sampling_rate, format= "wav")
-    audio_segment_bytes = io.BytesIO()
-    combined_audio.export(audio_segment_bytes, format="wav")
-    audio_segment_bytes.seek(0)
-    waveform_audio_segment, sample_rate = torchaudio.load(audio_segment_bytes)
-
-    if waveform_audio_segment.shape[0] > 1:
-        waveform_audio_segment = waveform_audio_segment[:1, :]
-
-    # Adjust shapes to be [1, N] if not already
-    downsampled_waveform = downsampled_waveform.unsqueeze(0) if downsampled_waveform.dim() == 1 else downsampled_waveform
-    waveform_audio_segment = waveform_audio_segment.unsqueeze(0) if waveform_audio_segment.dim() == 1 else waveform_audio_segment
-
-    # Ensure both waveforms have the same length
-    max_length = max(downsampled_waveform.size(1), waveform_audio_segment.size(1))
-    downsampled_waveform_padded = torch.nn.functional.pad(downsampled_waveform, (0, max_length - downsampled_waveform.size(1)))
-    waveform_audio_segment_padded = torch.nn.functional.pad(waveform_audio_segment, (0, max_length - waveform_audio_segment.size(1)))
-    stereo_waveform = torch.cat((downsampled_waveform_padded, waveform_audio_segment_padded), 0)
-
-    # Verify the stereo waveform shape is [2, M]
-    assert stereo_waveform.shape[0] == 2, "Stereo waveform should have 2 channels."
-    key = f'{assistant_id + run_id}.wav'
-
-    audio_buffer = io.BytesIO()
-    torchaudio.save(audio_buffer, stereo_waveform, 24000, format="wav")
-    audio_buffer.seek(0)
-
-    logger.info(f"Storing in {RECORDING_BUCKET_URL}{key}")
-    await store_file(bucket_name=RECORDING_BUCKET_NAME, file_key=key, file_data=audio_buffer, content_type="wav")
-    
-    return f'{RECORDING_BUCKET_URL}{key}'
+async def save_audio_file_to_s3(conversation_recording, assistant_id=None, run_id=None):
+    """Uploads the recording of a call (a CallRecorder) and returns its URL"""
+    try:
+        recording = await conversation_recording.finalize()
+        if recording is None:
+            logger.info("No audio was recorded for this call")
+            return ""
+        key = f'{assistant_id + run_id}.wav'
+        logger.info(f"Storing in {RECORDING_BUCKET_URL}{key}")
+        await store_file_in_parts(bucket_name=RECORDING_BUCKET_NAME, file_key=key, file_obj=recording)
+        return f'{RECORDING_BUCKET_URL}{key}'
+    finally:
+        conversation_recording.close()
 
 
 def list_number_of_wav_files_in_directory(directory):
@@ -1,10 +1,8 @@
-import os
-import subprocess
-import requests
 import torch
 import numpy as np
-import onnxruntime
 from .logger_config import configure_logger
+from .resource_registry import resource_registry
+from .vad_service import SILERO_VAD_MODEL_URL, create_vad_session, download_silero_vad_model
 logger = configure_logger(__name__)
 
 
@@ -12,11 +10,8 @@ class VAD():
 
     def __init__(self):
         path = self.download()
-        opts = onnxruntime.SessionOptions()
-        opts.log_severity_level = 3
-        opts.inter_op_num_threads = 1
-        opts.intra_op_num_threads = 1
-        self.session = onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'], sess_options=opts)
+        # The session is stateless (the LSTM state is kept per instance), hence a single one serves every call
+        self.session = resource_registry.get_or_create("onnx_session", path, lambda: self.create_session(path))
         self.reset_states()
         self.sample_rates = [8000, 16000]
 
@@ -89,24 +84,9 @@ class VAD():
         return stacked.cpu()
 
     @staticmethod
-    def download(model_url="https://github.com/snakers4/silero-vad/raw/master/files/silero_vad.onnx"):
-        save_path = os.path.expanduser('~/.cache/bolna/')
-        model_filename = os.path.join(save_path, "silero_vad.onnx")
+    def create_session(path):
+        return create_vad_session(path)
 
-        if os.path.exists(model_filename):
-            logger.info(f'Model already exists at {model_filename}')
-        else:
-            os.makedirs(save_path, exist_ok=True)
-            logger.info("Downloading VAD model")
-            try:
-                response = requests.get(model_url)
-                if response.status_code == 200:
-                    with open(model_filename, 'wb') as file:
-                        file.write(response.content)
-                    logger.info(f'Model downloaded to {model_filename}')
-                else:
-                    logger.error(f'Failed to download the model. Status code: {response.status_code}')
-            except Exception as e:
-                logger.error(f"Failed to download the model. {e}")
-
-        return model_filename
+    @staticmethod
+    def download(model_url=SILERO_VAD_MODEL_URL):
+        return download_silero_vad_model(model_url)
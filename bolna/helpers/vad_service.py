@@ -0,0 +1,232 @@
+import asyncio
+import os
+from collections import deque
+
+import numpy as np
+import onnxruntime
+import requests
+
+from bolna.constants import DEFAULT_VAD_BATCH_WINDOW_MS
+from bolna.helpers.audio_resampler import StreamingResampler
+from bolna.helpers.batch_loop import BatchLoop
+from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.resource_registry import resource_registry
+
+logger = configure_logger(__name__)
+
+SILERO_VAD_MODEL_URL = "https://github.com/snakers4/silero-vad/raw/master/files/silero_vad.onnx"
+SUPPORTED_SAMPLE_RATES = (8000, 16000)
+# Samples per inference (32 ms) and, for the models carrying a single state tensor (v5 onwards), number of samples
+# of the previous frame prepended to the next one
+FRAME_SIZES = {8000: 256, 16000: 512}
+CONTEXT_SIZES = {8000: 32, 16000: 64}
+
+
+def download_silero_vad_model(model_url=SILERO_VAD_MODEL_URL):
+    save_path = os.path.expanduser('~/.cache/bolna/')
+    model_filename = os.path.join(save_path, "silero_vad.onnx")
+
+    if os.path.exists(model_filename):
+        logger.info(f'Model already exists at {model_filename}')
+    else:
+        os.makedirs(save_path, exist_ok=True)
+        logger.info("Downloading VAD model")
+        try:
+            response = requests.get(model_url)
+            if response.status_code == 200:
+                with open(model_filename, 'wb') as file:
+                    file.write(response.content)
+                logger.info(f'Model downloaded to {model_filename}')
+            else:
+                logger.error(f'Failed to download the model. Status code: {response.status_code}')
+        except Exception as e:
+            logger.error(f"Failed to download the model. {e}")
+
+    return model_filename
+
+
+def create_vad_session(path):
+    opts = onnxruntime.SessionOptions()
+    opts.log_severity_level = 3
+    opts.inter_op_num_threads = 1
+    opts.intra_op_num_threads = 1
+    return onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'], sess_options=opts)
+
+
+class VADStream:
+    """
+    Voice activity of one audio stream (e.g. the inbound audio of a call), evaluated by the shared VADService.
+
+    16 bit PCM is pushed as it arrives and `get_event()` returns the `speech_start` and `speech_end` events, timestamped
+    in seconds of audio since the start of the stream. Speech starts on the first frame whose probability reaches
+    `threshold` and ends once the probability stayed below `threshold - 0.15` for `min_silence_duration_ms`.
+    """
+
+    def __init__(self, service, sample_rate=16000, threshold=0.5, min_silence_duration_ms=300):
+        self.service = service
+        self.sample_rate = int(sample_rate)
+        self.threshold = threshold
+        self.negative_threshold = max(threshold - 0.15, 0.01)
+        self.min_silence_duration_ms = min_silence_duration_ms
+
+        self.resampler = None
+        self.step = 1
+        if self.sample_rate in SUPPORTED_SAMPLE_RATES:
+            self.model_sample_rate = self.sample_rate
+        elif self.sample_rate % 16000 == 0:
+            self.model_sample_rate, self.step = 16000, self.sample_rate // 16000
+        else:
+            self.model_sample_rate = 16000
+            self.resampler = StreamingResampler(self.sample_rate, 16000)
+        self.frame_size = FRAME_SIZES[self.model_sample_rate]
+
+        self.events = asyncio.Queue()
+        self.closed = False
+        self.generation = 0
+        self.reset()
+
+    def reset(self):
+        self.generation += 1  # results of the inferences started before are dropped
+        self.frames = deque()
+        self.service.close_stream(self)  # back in the next tick once frames are pushed again
+        self.state = self.service.initial_state(self.model_sample_rate)
+        self.speaking = False
+        self.probability = 0.0
+        self.processed_samples = 0
+        self.__pending = np.zeros(0, dtype=np.float32)
+        self.__leftover_byte = b''
+        self.__silence_start = None
+        if self.resampler is not None:
+            self.resampler.reset()
+
+    def push(self, pcm_data):
+        if self.closed:
+            return
+        pcm_data = self.__leftover_byte + bytes(pcm_data)
+        if len(pcm_data) % 2:
+            pcm_data, self.__leftover_byte = pcm_data[:-1], pcm_data[-1:]
+        else:
+            self.__leftover_byte = b''
+        if self.resampler is not None:
+            pcm_data = self.resampler.process(pcm_data)
+        samples = np.frombuffer(pcm_data, dtype=np.int16)[::self.step].astype(np.float32) / 32768
+
+        samples = np.concatenate((self.__pending, samples))
+        complete = len(samples) - len(samples) % self.frame_size
+        if complete:
+            self.frames.extend(samples[:complete].reshape(-1, self.frame_size))
+            self.service.notify(self)
+        self.__pending = samples[complete:]
+
+    def on_probability(self, probability):
+        self.probability = probability
+        self.processed_samples += self.frame_size
+        timestamp = self.processed_samples / self.model_sample_rate
+        if probability >= self.threshold:
+            self.__silence_start = None
+            if not self.speaking:
+                self.speaking = True
+                self.events.put_nowait({"type": "speech_start", "timestamp": timestamp - self.frame_size / self.model_sample_rate, "probability": probability})
+        elif self.speaking and probability < self.negative_threshold:
+            if self.__silence_start is None:
+                self.__silence_start = timestamp - self.frame_size / self.model_sample_rate
+            if (timestamp - self.__silence_start) * 1000 >= self.min_silence_duration_ms:
+                self.speaking = False
+                self.events.put_nowait({"type": "speech_end", "timestamp": self.__silence_start, "probability": probability})
+                self.__silence_start = None
+
+    async def get_event(self):
+        return await self.events.get()
+
+    def close(self):
+        self.closed = True
+        self.frames.clear()
+        self.service.close_stream(self)
+
+
+class VADService:
+    """
+    Silero VAD shared by every call of the process. Each stream keeps its own model state while the frames waiting in
+    all the streams are evaluated together, one frame per stream in a single batched `session.run` per tick (per
+    sample rate), in a worker thread so that the event loop isn't held by the inference. The ticks are run by a
+    BatchLoop, a stream is ready while it has frames waiting.
+
+    The service is infrastructure for now, no stage of the call pipeline opens streams on it yet (endpointing and
+    barge-in come from the transcribers). Building it downloads the model and loads the session, from the event loop
+    use `load_vad_service()` which does it in a worker thread.
+    """
+
+    def __init__(self, model_path=None, batch_window_ms=DEFAULT_VAD_BATCH_WINDOW_MS):
+        path = model_path or download_silero_vad_model()
+        self.session = resource_registry.get_or_create("onnx_session", path, lambda: create_vad_session(path))
+        # Silero v4 carries its LSTM state as (h, c), v5 onwards as a single tensor along with the previous samples
+        self.single_state = "state" in {model_input.name for model_input in self.session.get_inputs()}
+        self.runs = 0
+        self.frames = 0
+        self.__batch_loop = BatchLoop("VAD", self.__tick, batch_window_ms / 1000)
+
+    def initial_state(self, sample_rate):
+        if self.single_state:
+            return np.zeros((2, 128), dtype=np.float32), np.zeros(CONTEXT_SIZES[sample_rate], dtype=np.float32)
+        return np.zeros((2, 64), dtype=np.float32), np.zeros((2, 64), dtype=np.float32)
+
+    def open_stream(self, sample_rate=16000, threshold=0.5, min_silence_duration_ms=300):
+        self.__batch_loop.start()
+        return VADStream(self, sample_rate, threshold, min_silence_duration_ms)
+
+    def notify(self, stream):
+        self.__batch_loop.notify(stream)
+
+    def close_stream(self, stream):
+        self.__batch_loop.discard(stream)
+
+    def infer(self, sample_rate, frames, states):
+        """Speech probability of a batch of frames, one per stream, along with the next state of every stream"""
+        first_states, second_states = (np.stack(state) for state in zip(*states))
+        sample_rate_input = np.array(sample_rate, dtype=np.int64)
+        if self.single_state:
+            audio = np.concatenate((second_states, frames), axis=1)
+            output, next_state = self.session.run(None, {'input': audio, 'state': first_states.transpose(1, 0, 2), 'sr': sample_rate_input})
+            next_states = zip(next_state.transpose(1, 0, 2), audio[:, -CONTEXT_SIZES[sample_rate]:])
+        else:
+            output, h, c = self.session.run(None, {'input': frames, 'h': first_states.transpose(1, 0, 2),
+                                                   'c': second_states.transpose(1, 0, 2), 'sr': sample_rate_input})
+            next_states = zip(h.transpose(1, 0, 2), c.transpose(1, 0, 2))
+        return output.reshape(-1), [(first.copy(), second.copy()) for first, second in next_states]
+
+    async def __tick(self, ready_streams):
+        batches = {}
+        for stream in ready_streams.values():
+            if not stream.frames:
+                continue
+            batches.setdefault(stream.model_sample_rate, []).append((stream, stream.generation, stream.frames.popleft()))
+        for stream_id in [stream_id for stream_id, stream in ready_streams.items() if not stream.frames]:
+            del ready_streams[stream_id]
+
+        for sample_rate, batch in batches.items():
+            streams, generations, frames = zip(*batch)
+            probabilities, states = await asyncio.to_thread(self.infer, sample_rate, np.stack(frames), [stream.state for stream in streams])
+            self.runs += 1
+            self.frames += len(batch)
+            for stream, generation, probability, state in zip(streams, generations, probabilities, states):
+                if stream.closed or stream.generation != generation:
+                    continue
+                stream.state = state
+                stream.on_probability(float(probability))
+
+    def stats(self):
+        return {"runs": self.runs, "frames": self.frames, "ready_streams": len(self.__batch_loop.ready_streams),
+                "average_batch_size": self.frames / self.runs if self.runs else 0}
+
+    async def close(self):
+        await self.__batch_loop.close()
+
+
+def get_vad_service(model_path=None):
+    """The VADService of the process"""
+    return resource_registry.get_or_create("vad_service", model_path, lambda: VADService(model_path))
+
+
+async def load_vad_service(model_path=None):
+    """`get_vad_service()` without blocking the event loop while the model is downloaded and loaded"""
+    return await asyncio.to_thread(get_vad_service, model_path)
@@ -25,9 +25,17 @@ class DefaultInputHandler:
         self.queue = queue
         self.conversation_recording = conversation_recording
         self.is_welcome_message_played = is_welcome_message_played
+        self.welcome_message_played_event = asyncio.Event()
+        if is_welcome_message_played:
+            self.welcome_message_played_event.set()
         # This variable stores the response which has been heard by the user
         self.response_heard_by_user = ""
         self._is_audio_being_played_to_user = False
+        # Set while nothing is being played to the user, driven by the mark messages
+        self.audio_playback_finished_event = asyncio.Event()
+        self.audio_playback_finished_event.set()
+        # Set whenever a mark message has been processed, waiters clear it before waiting
+        self.mark_event_processed_event = asyncio.Event()
         self.observable_variables = observable_variables
         self.mark_event_meta_data = mark_event_meta_data
         self.audio_chunks_received = 0
@@ -47,10 +55,26 @@ class DefaultInputHandler:
             self.update_start_ts = time.time()
             logger.info(f"updating ts as mark_message received: {self.update_start_ts}")
         self._is_audio_being_played_to_user = value
+        if value:
+            self.audio_playback_finished_event.clear()
+        else:
+            self.audio_playback_finished_event.set()
 
     def is_audio_being_played_to_user(self):
         return self._is_audio_being_played_to_user
 
+    async def wait_for_audio_playback_to_finish(self):
+        await self.audio_playback_finished_event.wait()
+
+    async def wait_for_mark_event(self, timeout=None):
+        """Waits until the next mark message has been processed. Returns False if `timeout` elapsed first"""
+        self.mark_event_processed_event.clear()
+        try:
+            await asyncio.wait_for(self.mark_event_processed_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     def get_response_heard_by_user(self):
         response = self.response_heard_by_user
         self.response_heard_by_user = ""
@@ -73,11 +97,20 @@ class DefaultInputHandler:
     def welcome_message_played(self):
         return self.is_welcome_message_played
 
+    async def wait_for_welcome_message_played(self):
+        await self.welcome_message_played_event.wait()
+
     def get_mark_event_meta_data_obj(self, packet):
         mark_id = packet["name"]
         return self.mark_event_meta_data.fetch_data(mark_id)
 
     def process_mark_message(self, packet):
+        try:
+            self.__handle_mark_message(packet)
+        finally:
+            self.mark_event_processed_event.set()
+
+    def __handle_mark_message(self, packet):
         mark_event_meta_data_obj = self.get_mark_event_meta_data_obj(packet)
         if not mark_event_meta_data_obj:
             logger.info(f"No object retrieved from global dict of mark_event_meta_data for received mark event - {packet}")
@@ -102,6 +135,7 @@ class DefaultInputHandler:
                 logger.info("Received mark event for agent_welcome_message")
                 self.audio_chunks_received = 0
                 self.is_welcome_message_played = True
+                self.welcome_message_played_event.set()
 
             elif message_type == "agent_hangup":
                 logger.info(f"Agent hangup has been triggered")
@@ -120,13 +154,11 @@ class DefaultInputHandler:
                 'sequence': self.input_types['audio']
             })
         if self.conversation_recording:
-            if self.conversation_recording["metadata"]["started"] ==0:
-                self.conversation_recording["metadata"]["started"] = time.time()
-            self.conversation_recording['input']['data'] += data
+            self.conversation_recording.record_input(data)
 
         self.queues['transcriber'].put_nowait(ws_data_packet)
     
-    def __process_text(self, text):
+    async def __process_text(self, text):
         logger.info(f"Sequences {self.input_types}")
         ws_data_packet = create_ws_data_packet(
             data=text,
@@ -138,7 +170,7 @@ class DefaultInputHandler:
 
         if self.turn_based_conversation:
             ws_data_packet["meta_info"]["bypass_synth"] = True
-        self.queues['llm'].put_nowait(ws_data_packet)
+        await self.queues['llm'].put(ws_data_packet)
 
     async def _listen(self):
         try:
@@ -183,7 +215,7 @@ class DefaultInputHandler:
 
         elif message["type"] == "text":
             logger.info(f"Received text: {message['data']}")
-            self.__process_text(message['data'])
+            await self.__process_text(message['data'])
 
         elif message["type"] == "mark":
             logger.info(f"Received mark event")
@@ -1,10 +1,11 @@
 import traceback
 from .default import DefaultInputHandler
 import asyncio
-import base64
 import json
 from starlette.websockets import WebSocketDisconnect
 from dotenv import load_dotenv
+from bolna.constants import DEFAULT_INPUT_FRAMES_PER_BATCH
+from bolna.helpers.audio_frame_buffer import AudioFrameBuffer
 from bolna.helpers.utils import create_ws_data_packet
 from bolna.helpers.logger_config import configure_logger
 
@@ -14,13 +15,12 @@ load_dotenv()
 
 class TelephonyInputHandler(DefaultInputHandler):
     def __init__(self, queues, websocket=None, input_types=None, mark_event_meta_data=None, turn_based_conversation=False,
-                 is_welcome_message_played=False, observable_variables=None):
+                 is_welcome_message_played=False, observable_variables=None, frames_per_batch=DEFAULT_INPUT_FRAMES_PER_BATCH):
         super().__init__(queues, websocket, input_types, mark_event_meta_data, turn_based_conversation,
                          is_welcome_message_played=is_welcome_message_played, observable_variables=observable_variables)
         self.stream_sid = None
         self.call_sid = None
-        self.buffer = []
-        self.message_count = 0
+        self.frame_buffer = AudioFrameBuffer(frames_per_batch)
         # self.mark_event_meta_data = mark_event_meta_data
         self.last_media_received = 0
         self.io_provider = None
@@ -72,7 +72,6 @@ class TelephonyInputHandler(DefaultInputHandler):
         return False
 
     async def _listen(self):
-        buffer = []
         while True:
             try:
                 message = await self.websocket.receive_text()
@@ -82,16 +81,9 @@ class TelephonyInputHandler(DefaultInputHandler):
                     await self.call_start(packet)
                 elif packet['event'] == 'media':
                     media_data = packet['media']
-                    media_audio = base64.b64decode(media_data['payload'])
                     media_ts = int(media_data["timestamp"])
 
                     if 'chunk' in packet['media'] or ('track' in packet['media'] and packet['media']['track'] == 'inbound'):
-                        meta_info = {
-                            'io': self.io_provider,
-                            'call_sid': self.call_sid,
-                            'stream_sid': self.stream_sid,
-                            'sequence': self.input_types['audio']
-                        }
                         '''
                         if self.last_media_received + 20 < media_ts:
                             bytes_to_fill = 8 * (media_ts - (self.last_media_received + 20))
@@ -99,15 +91,16 @@ class TelephonyInputHandler(DefaultInputHandler):
                             #await self.ingest_audio(b"\xff" * bytes_to_fill, meta_info)
                         '''
                         self.last_media_received = media_ts
-                        buffer.append(media_audio)
-                        self.message_count += 1
-
-                        # Send 100 ms of audio to deepgram
-                        if self.message_count == 10:
-                            merged_audio = b''.join(buffer)
-                            buffer = []
-                            await self.ingest_audio(merged_audio, meta_info)
-                            self.message_count = 0
+
+                        # Send the audio to the transcriber once frames_per_batch frames have been received
+                        if self.frame_buffer.append_base64(media_data['payload']):
+                            meta_info = {
+                                'io': self.io_provider,
+                                'call_sid': self.call_sid,
+                                'stream_sid': self.stream_sid,
+                                'sequence': self.input_types['audio']
+                            }
+                            await self.ingest_audio(self.frame_buffer.flush(), meta_info)
                     else:
                         logger.info("Getting media elements but not inbound media")
 
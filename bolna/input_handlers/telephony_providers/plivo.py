@@ -1,6 +1,7 @@
 import os
 import plivo as plivosdk
 from dotenv import load_dotenv
+from bolna.constants import DEFAULT_INPUT_FRAMES_PER_BATCH
 from bolna.input_handlers.telephony import TelephonyInputHandler
 from bolna.helpers.logger_config import configure_logger
 
@@ -10,9 +11,10 @@ load_dotenv()
 
 class PlivoInputHandler(TelephonyInputHandler):
     def __init__(self, queues, websocket=None, input_types=None, mark_event_meta_data=None, turn_based_conversation=False,
-                 is_welcome_message_played=False, observable_variables=None):
+                 is_welcome_message_played=False, observable_variables=None, frames_per_batch=DEFAULT_INPUT_FRAMES_PER_BATCH):
         super().__init__(queues, websocket, input_types, mark_event_meta_data, turn_based_conversation,
-                         is_welcome_message_played=is_welcome_message_played, observable_variables=observable_variables)
+                         is_welcome_message_played=is_welcome_message_played, observable_variables=observable_variables,
+                         frames_per_batch=frames_per_batch)
         self.io_provider = 'plivo'
         self.client = plivosdk.RestClient(os.getenv('PLIVO_AUTH_ID'), os.getenv('PLIVO_AUTH_TOKEN'))
 
@@ -1,3 +1,4 @@
+from bolna.constants import DEFAULT_INPUT_FRAMES_PER_BATCH
 from bolna.input_handlers.telephony import TelephonyInputHandler
 from dotenv import load_dotenv
 from bolna.helpers.logger_config import configure_logger
@@ -8,9 +9,10 @@ load_dotenv()
 
 class TwilioInputHandler(TelephonyInputHandler):
     def __init__(self, queues, websocket=None, input_types=None, mark_event_meta_data=None, turn_based_conversation=False,
-                 is_welcome_message_played=False, observable_variables=None):
+                 is_welcome_message_played=False, observable_variables=None, frames_per_batch=DEFAULT_INPUT_FRAMES_PER_BATCH):
         super().__init__(queues, websocket, input_types, mark_event_meta_data, turn_based_conversation,
-                         is_welcome_message_played=is_welcome_message_played, observable_variables=observable_variables)
+                         is_welcome_message_played=is_welcome_message_played, observable_variables=observable_variables,
+                         frames_per_batch=frames_per_batch)
         self.io_provider = 'twilio'
 
     async def call_start(self, packet):
@@ -1,11 +1,11 @@
 import os
 import json
-import httpx
 from dotenv import load_dotenv
 from openai import AsyncAzureOpenAI, AuthenticationError, PermissionDeniedError, NotFoundError, RateLimitError, APIError, APIConnectionError, BadRequestError
 
 from bolna.constants import DEFAULT_LANGUAGE_CODE
 from bolna.helpers.utils import convert_to_request_log, compute_function_pre_call_message, now_ms
+from bolna.helpers.resource_registry import resource_registry
 from .llm import BaseLLM
 from bolna.helpers.logger_config import configure_logger
 
@@ -40,12 +40,8 @@ class AzureLLM(BaseLLM):
         api_key = kwargs.get('llm_key', os.getenv('AZURE_OPENAI_API_KEY'))
         api_version = kwargs.get("api_version", os.getenv('AZURE_OPENAI_API_VERSION', '2024-12-01-preview'))
 
-        limits = httpx.Limits(
-            max_connections=50,
-            max_keepalive_connections=50,
-            keepalive_expiry=30
-        )
-        http_client = httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(600.0, connect=10.0))
+        # Connection pool shared by every call of the process
+        http_client = resource_registry.get_httpx_client("azure_openai")
 
         self.async_client = AsyncAzureOpenAI(
             azure_endpoint=azure_endpoint,
@@ -65,7 +61,7 @@ class AzureLLM(BaseLLM):
         model_args = {
             **self.model_args,
             "response_format": response_format,
-            "messages": messages,
+            "messages": list(messages),
             "stream": True,
             "stop": ["User:"],
             "user": f"{self.run_id}#{meta_info.get('turn_id', '')}" if meta_info else self.run_id
@@ -221,7 +217,7 @@ class AzureLLM(BaseLLM):
             completion = await self.async_client.chat.completions.create(
                 model=self.model,
                 temperature=0.0,
-                messages=messages,
+                messages=list(messages),
                 stream=False,
                 response_format=response_format
             )
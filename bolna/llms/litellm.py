@@ -68,7 +68,7 @@ class LiteLLM(BaseLLM):
         called_fun = None
 
         model_args = self.model_args.copy()
-        model_args["messages"] = messages
+        model_args["messages"] = list(messages)
         model_args["stream"] = True
         model_args["stop"] = ["User:"]
 
@@ -237,7 +237,7 @@ class LiteLLM(BaseLLM):
         text = ""
         model_args = self.model_args.copy()
         model_args["model"] = self.model
-        model_args["messages"] = messages
+        model_args["messages"] = list(messages)
         model_args["stream"] = stream
 
         if request_json:
@@ -1,5 +1,4 @@
 import os
-import httpx
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 from openai import AsyncOpenAI, OpenAI, AuthenticationError, PermissionDeniedError, NotFoundError, RateLimitError, APIError, APIConnectionError
@@ -7,6 +6,7 @@ import json
 
 from bolna.constants import DEFAULT_LANGUAGE_CODE
 from bolna.helpers.utils import convert_to_request_log, compute_function_pre_call_message, now_ms
+from bolna.helpers.resource_registry import resource_registry
 from .llm import BaseLLM
 from bolna.helpers.logger_config import configure_logger
 
@@ -38,16 +38,8 @@ class OpenAiLLM(BaseLLM):
         if kwargs.get("service_tier") == "priority":
             self.model_args["service_tier"] = "priority"
 
-        limits = httpx.Limits(
-            max_connections=50,
-            max_keepalive_connections=50,
-            keepalive_expiry=30
-        )
-        http_client = httpx.AsyncClient(
-            limits=limits,
-            timeout=httpx.Timeout(600.0, connect=10.0),
-            http2=True
-        )
+        # Connection pool shared by every call of the process
+        http_client = resource_registry.get_httpx_client("openai", http2=True)
 
         if kwargs.get("provider", "openai") == "custom":
             base_url = kwargs.get("base_url")
@@ -83,7 +75,7 @@ class OpenAiLLM(BaseLLM):
         model_args = {
             **self.model_args,
             "response_format": response_format,
-            "messages": messages,
+            "messages": list(messages),
             "stream": True,
             "stop": ["User:"],
             "user": f"{self.run_id}#{meta_info['turn_id']}"
@@ -240,7 +232,7 @@ class OpenAiLLM(BaseLLM):
         response_format = self.get_response_format(request_json)
 
         try:
-            completion = await self.async_client.chat.completions.create(model=self.model, temperature=0.0, messages=messages,
+            completion = await self.async_client.chat.completions.create(model=self.model, temperature=0.0, messages=list(messages),
                                                                          stream=False, response_format=response_format)
             res = completion.choices[0].message.content
             return res
@@ -4,6 +4,7 @@ from sklearn.metrics.pairwise import cosine_similarity
 from fastembed import TextEmbedding
 
 from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.resource_registry import resource_registry
 from bolna.memory.cache.base_cache import BaseCache
 
 logger = configure_logger(__name__)
@@ -13,7 +14,7 @@ class VectorCache(BaseCache):
     def __init__(self, index_provider=None, embedding_model="BAAI/bge-small-en-v1.5"):
         super().__init__()
         self.index_provider = index_provider
-        self.embedding_model = TextEmbedding(model_name=embedding_model)
+        self.embedding_model = resource_registry.get_or_create("embedding_model", embedding_model, lambda: TextEmbedding(model_name=embedding_model))
         self.documents: List[str] = []
         self.embeddings: List[List[float]] = []
 
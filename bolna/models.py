@@ -2,6 +2,7 @@ import json
 from typing import Optional, List, Union, Dict, Callable
 from pydantic import BaseModel, Field, field_validator, ValidationError, Json, model_validator
 from pydantic_core import PydanticCustomError
+from .constants import DEFAULT_INPUT_FRAMES_PER_BATCH, DEFAULT_SYNTHESIZER_LEAD_TIME_MS
 from .providers import *
 
 AGENT_WELCOME_MESSAGE = "This call is being recorded for quality assurance and training. Please speak now."
@@ -88,6 +89,7 @@ class Transcriber(BaseModel):
     keywords: Optional[str] = None
     task:Optional[str] = "transcribe"
     provider: Optional[str] = "deepgram"
+    input_frames_per_batch: Optional[int] = DEFAULT_INPUT_FRAMES_PER_BATCH  # telephony media frames (20 ms each) sent at once
 
     @field_validator("provider")
     def validate_model(cls, value):
@@ -383,6 +385,10 @@ class ConversationConfig(BaseModel):
     check_if_user_online: Optional[bool] = True
     generate_precise_transcript: Optional[bool] = False
     dtmf_enabled: Optional[bool] = False
+    synthesizer_lead_time_ms: Optional[int] = DEFAULT_SYNTHESIZER_LEAD_TIME_MS  # milliseconds of audio to keep queued ahead of playback
+    speculative_generation: Optional[bool] = False  # start the LLM on interim transcripts which stopped changing
+    speculative_generation_window_ms: Optional[int] = 300
+    pipeline_queues: Optional[Dict[str, Dict[str, Union[int, str]]]] = None  # per stage maxsize/policy overrides
 
     @field_validator('hangup_after_silence', mode='before')
     def set_hangup_after_silence(cls, v):
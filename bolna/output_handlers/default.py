@@ -16,6 +16,8 @@ class DefaultOutputHandler:
         self.queue = queue
         self.io_provider = io_provider
         self.is_chunking_supported = True
+        # Encoding synthesized audio is normalized to before reaching the handler, None to pass it as produced
+        self.audio_format = None
         self.is_last_hangup_chunk_sent = False
         # self.is_welcome_message_sent = False
         self.is_web_based_call = is_web_based_call
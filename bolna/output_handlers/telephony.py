@@ -1,7 +1,6 @@
 import base64
 import json
 import os
-import audioop
 import time
 import uuid
 import traceback
@@ -42,7 +41,7 @@ class TelephonyOutputHandler(DefaultOutputHandler):
 
             try:
                 if len(audio_chunk) == 1:
-                    audio_chunk += b'\x00'
+                    audio_chunk = bytes(audio_chunk) + b'\x00'
 
                 if audio_chunk and self.stream_sid and len(audio_chunk) != 1:
                     if audio_chunk != b'\x00\x00':
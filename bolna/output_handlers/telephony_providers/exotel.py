@@ -1,8 +1,8 @@
 import base64
 import json
-import audioop
 from dotenv import load_dotenv
 from bolna.output_handlers.telephony import TelephonyOutputHandler
+from bolna.helpers.audio_codec import ulaw2lin
 from bolna.helpers.logger_config import configure_logger
 
 logger = configure_logger(__name__)
@@ -15,6 +15,7 @@ class ExotelOutputHandler(TelephonyOutputHandler):
 
         super().__init__(io_provider, websocket, mark_event_meta_data, log_dir_name)
         self.is_chunking_supported = True
+        self.audio_format = 'pcm'
 
     async def handle_interruption(self):
         logger.info("interrupting because user spoke in between")
@@ -30,7 +31,7 @@ class ExotelOutputHandler(TelephonyOutputHandler):
         # If audio is mulaw, convert it to PCM
         if audio_format == "mulaw":
             logger.info(f"Converting mulaw to PCM for Exotel")
-            audio_data = audioop.ulaw2lin(audio_data, 2)
+            audio_data = ulaw2lin(audio_data)
 
         base64_audio = base64.b64encode(audio_data).decode("ascii")
         message = {
@@ -14,6 +14,7 @@ class PlivoOutputHandler(TelephonyOutputHandler):
 
         super().__init__(io_provider, websocket, mark_event_meta_data, log_dir_name)
         self.is_chunking_supported = True
+        self.audio_format = 'mulaw'
 
     async def handle_interruption(self):
         logger.info("interrupting because user spoke in between")
@@ -1,8 +1,8 @@
 import base64
 import json
 import os
-import audioop
 from dotenv import load_dotenv
+from bolna.helpers.audio_codec import lin2ulaw
 from bolna.helpers.logger_config import configure_logger
 from bolna.output_handlers.telephony import TelephonyOutputHandler
 
@@ -16,6 +16,7 @@ class TwilioOutputHandler(TelephonyOutputHandler):
 
         super().__init__(io_provider, websocket, mark_event_meta_data, log_dir_name)
         self.is_chunking_supported = True
+        self.audio_format = 'mulaw'
 
     async def handle_interruption(self):
         logger.info("interrupting because user spoke in between")
@@ -29,7 +30,7 @@ class TwilioOutputHandler(TelephonyOutputHandler):
     async def form_media_message(self, audio_data, audio_format="wav"):
         if audio_format != "mulaw":
             logger.info(f"Converting to mulaw")
-            audio_data = audioop.lin2ulaw(audio_data, 2)
+            audio_data = lin2ulaw(audio_data)
         base64_audio = base64.b64encode(audio_data).decode("utf-8")
         message = {
             'event': 'media',
@@ -1,6 +1,8 @@
-import io
-import torchaudio
+from bolna.helpers.audio_resampler import StreamingResampler
 from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.timer_wheel import get_timer_wheel
+from bolna.helpers.utils import resample, wav_bytes_to_pcm_and_sample_rate
+from websockets.protocol import State
 import asyncio
 import re
 
@@ -8,6 +10,9 @@ logger = configure_logger(__name__)
 
 
 class BaseSynthesizer:
+    # (encoding, sample rate) pairs the provider can stream as raw audio, encodings being "mulaw" or "pcm" (16 bit)
+    native_output_formats = ()
+
     def __init__(self, task_manager_instance=None, stream=True, buffer_size=40, event_loop=None):
         self.stream = stream
         self.buffer_size = buffer_size
@@ -15,6 +20,7 @@ class BaseSynthesizer:
         self.task_manager_instance = task_manager_instance
         self.connection_time = None
         self.turn_latencies = []
+        self.stream_resampler = None
 
     def clear_internal_queue(self):
         logger.info(f"Clearing out internal queue")
@@ -41,6 +47,16 @@ class BaseSynthesizer:
     async def monitor_connection(self):
         pass
 
+    async def wait_for_connection_change(self, websocket, retry_delay=1):
+        """
+        Used by `monitor_connection()` between its checks: returns once `websocket` gets closed, or after `retry_delay`
+        seconds when there is no open connection to wait on (e.g. the last attempt failed).
+        """
+        if websocket is not None and websocket.state is not State.CLOSED:
+            await websocket.wait_closed()
+        else:
+            await get_timer_wheel().sleep(retry_delay)
+
     async def cleanup(self):
         pass
 
@@ -66,15 +82,41 @@ class BaseSynthesizer:
         return re.sub(r'\s+', ' ', s.strip())
 
     def resample(self, audio_bytes):
-        audio_buffer = io.BytesIO(audio_bytes)
-        waveform, orig_sample_rate = torchaudio.load(audio_buffer)
-        resampler = torchaudio.transforms.Resample(orig_sample_rate, 8000)
-        audio_waveform = resampler(waveform)
-        audio_buffer = io.BytesIO()
-        torchaudio.save(audio_buffer, audio_waveform, 8000, format="wav")
-        audio_buffer.seek(0)
-        audio_data = audio_buffer.read()
-        return audio_data
+        return resample(audio_bytes, 8000, format="wav")
+
+    def resample_stream(self, wav_bytes, target_sample_rate):
+        """
+        Resamples a WAV chunk of the audio stream being received into 16 bit PCM. The resampler carries its state from
+        one chunk to the next, hence `reset_stream_resampler()` must be called once the stream is over.
+        """
+        pcm_data, sample_rate = wav_bytes_to_pcm_and_sample_rate(wav_bytes)
+        if self.stream_resampler is None or self.stream_resampler.orig_sample_rate != sample_rate or \
+                self.stream_resampler.target_sample_rate != int(target_sample_rate):
+            self.stream_resampler = StreamingResampler(sample_rate, target_sample_rate)
+        return self.stream_resampler.process(pcm_data)
+
+    def reset_stream_resampler(self):
+        # The samples held back are the last few milliseconds of filter delay of the utterance, i.e. trailing silence
+        if self.stream_resampler is not None:
+            self.stream_resampler.reset()
+
+    @classmethod
+    def negotiate_output_format(cls, target_format, sample_rate):
+        """
+        Native format to request for an output expecting `target_format` at `sample_rate`, picking the cheapest to
+        bring to the target: the target itself (no conversion), the other encoding at the same rate (a table lookup per
+        sample), then PCM at another rate (a resample), the closest rate above the target first. None when the provider
+        can't supply any of them and has to be asked for its default format (e.g. mp3, which is decoded in process).
+        """
+        formats = set(cls.native_output_formats)
+        other_format = "pcm" if target_format == "mulaw" else "mulaw"
+        candidates = [(target_format, sample_rate), (other_format, sample_rate)]
+        candidates += sorted((native_format for native_format in formats if native_format[0] == "pcm"),
+                             key=lambda native_format: (native_format[1] < sample_rate, abs(native_format[1] - sample_rate)))
+        for candidate in candidates:
+            if candidate in formats:
+                return candidate
+        return None
 
     def get_engine(self):
         return "default"
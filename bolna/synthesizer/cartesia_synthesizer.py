@@ -1,12 +1,10 @@
 import asyncio
-import copy
 import uuid
 import time
 import websockets
 from websockets.exceptions import InvalidHandshake
 import base64
 import json
-import aiohttp
 import os
 import traceback
 import time
@@ -14,12 +12,17 @@ from collections import deque
 
 from .base_synthesizer import BaseSynthesizer
 from bolna.helpers.logger_config import configure_logger
-from bolna.helpers.utils import convert_audio_to_wav, create_ws_data_packet, resample
+from bolna.helpers.utils import create_ws_data_packet
+from bolna.helpers.packet_meta_info import PacketMetaInfo
+from bolna.helpers.resource_registry import resource_registry
 
 logger = configure_logger(__name__)
 
 
 class CartesiaSynthesizer(BaseSynthesizer):
+    native_output_formats = tuple((encoding, sample_rate) for encoding in ("mulaw", "pcm")
+                                  for sample_rate in (8000, 16000, 22050, 24000, 44100))
+
     def __init__(self, voice_id, voice, language="en", model="sonic-english", audio_format="mp3", sampling_rate="16000",
                  stream=False, buffer_size=400, synthesizer_key=None, caching=True, **kwargs):
         super().__init__(kwargs.get("task_manager_instance", None), stream)
@@ -32,7 +35,9 @@ class CartesiaSynthesizer(BaseSynthesizer):
         self.websocket_connection = None
         self.connection_open = False
         self.sampling_rate = sampling_rate
-        self.use_mulaw = True
+        # Native (encoding, sample rate) negotiated by the task manager for the output handler, mu-law at 8kHz otherwise
+        self.output_format = kwargs.get("output_format", None) or ("mulaw", 8000)
+        self.use_mulaw = self.output_format[0] == "mulaw"
         self.first_chunk_generated = False
         self.last_text_sent = False
         self.text_queue = deque()
@@ -85,8 +90,8 @@ class CartesiaSynthesizer(BaseSynthesizer):
             },
             "output_format": {
                 "container": "raw",
-                "encoding": "pcm_mulaw",
-                "sample_rate": 8000
+                "encoding": "pcm_mulaw" if self.use_mulaw else "pcm_s16le",
+                "sample_rate": self.output_format[1]
             }
         }
 
@@ -168,16 +173,16 @@ class CartesiaSynthesizer(BaseSynthesizer):
             'Cartesia-Version': self.version
         }
 
-        async with aiohttp.ClientSession() as session:
-            if payload is not None:
-                async with session.post(self.api_url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        data = await response.read()
-                        return data
-                    else:
-                        logger.error(f"Error: {response.status} - {await response.text()}")
-            else:
-                logger.info("Payload was null")
+        session = resource_registry.get_aiohttp_session()
+        if payload is not None:
+            async with session.post(self.api_url, headers=headers, json=payload) as response:
+                if response.status == 200:
+                    data = await response.read()
+                    return data
+                else:
+                    logger.error(f"Error: {response.status} - {await response.text()}")
+        else:
+            logger.info("Payload was null")
 
     async def synthesize(self, text):
         audio = await self.__generate_http(text)
@@ -218,15 +223,13 @@ class CartesiaSynthesizer(BaseSynthesizer):
                             self.meta_info['synthesizer_latency'] = first_result_latency
                     except Exception:
                         pass
-                audio = ""
-
                 if self.use_mulaw:
                     self.meta_info['format'] = 'mulaw'
-                    audio = message
                 else:
-                    self.meta_info['format'] = "wav"
-                    audio = resample(convert_audio_to_wav(message, source_format="mp3"), int(self.sampling_rate),
-                                     format="wav")
+                    self.meta_info['format'] = 'pcm'
+                self.meta_info['sample_rate'] = self.output_format[1]
+                # A whole (silent) sample for the end of stream marker
+                audio = b'\x00\x00' if message == b'\x00' and not self.use_mulaw else message
 
                 if not self.first_chunk_generated:
                     self.meta_info["is_first_chunk"] = True
@@ -292,7 +295,7 @@ class CartesiaSynthesizer(BaseSynthesizer):
             return None
 
     async def monitor_connection(self):
-        # Periodically check if the connection is still alive
+        # Re-establishes the connection whenever it gets closed
         consecutive_failures = 0
         max_failures = 3
 
@@ -309,7 +312,7 @@ class CartesiaSynthesizer(BaseSynthesizer):
                 else:
                     self.websocket_holder["websocket"] = result
                     consecutive_failures = 0  # Reset on success
-            await asyncio.sleep(1)
+            await self.wait_for_connection_change(self.websocket_holder["websocket"])
 
     def update_context(self, meta_info):
         self.context_id = str(uuid.uuid4())
@@ -321,7 +324,7 @@ class CartesiaSynthesizer(BaseSynthesizer):
             meta_info, text, self.current_text = message.get("meta_info"), message.get("data"), message.get("data")
             self.synthesized_characters += len(text) if text is not None else 0
             end_of_llm_stream = "end_of_llm_stream" in meta_info and meta_info["end_of_llm_stream"]
-            self.meta_info = copy.deepcopy(meta_info)
+            self.meta_info = PacketMetaInfo(meta_info)
             meta_info["text"] = text
             if not self.context_id:
                 self.update_context(meta_info)
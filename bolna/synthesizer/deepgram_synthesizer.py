@@ -1,11 +1,11 @@
-import copy
 import time
-import aiohttp
 import os
 import uuid
 from dotenv import load_dotenv
 from bolna.helpers.logger_config import configure_logger
 from bolna.helpers.utils import convert_audio_to_wav, create_ws_data_packet
+from bolna.helpers.packet_meta_info import PacketMetaInfo
+from bolna.helpers.resource_registry import resource_registry
 from bolna.memory.cache.inmemory_scalar_cache import InmemoryScalarCache
 from .base_synthesizer import BaseSynthesizer
 
@@ -16,6 +16,8 @@ DEEPGRAM_TTS_URL = "https://{}/v1/speak".format(DEEPGRAM_HOST)
 
 
 class DeepgramSynthesizer(BaseSynthesizer):
+    native_output_formats = (("mulaw", 8000), ("mulaw", 16000), ("pcm", 8000), ("pcm", 16000), ("pcm", 24000))
+
     def __init__(self, voice_id, voice, audio_format="pcm", sampling_rate="8000", stream=False, buffer_size=400, caching=True,
                  model="aura-zeus-en", **kwargs):
         super().__init__(kwargs.get("task_manager_instance", None), stream, buffer_size)
@@ -23,6 +25,11 @@ class DeepgramSynthesizer(BaseSynthesizer):
         self.voice = voice
         self.voice_id = voice_id
         self.sample_rate = str(sampling_rate)
+        # Native (encoding, sample rate) negotiated by the task manager for the output handler, if any
+        self.output_format = kwargs.get("output_format", None)
+        if self.output_format:
+            self.format = "mulaw" if self.output_format[0] == "mulaw" else "linear16"
+            self.sample_rate = str(self.output_format[1])
         self.model = model
         self.first_chunk_generated = False
         self.api_key = kwargs.get("transcriber_key", os.getenv('DEEPGRAM_AUTH_TOKEN'))
@@ -56,18 +63,18 @@ class DeepgramSynthesizer(BaseSynthesizer):
             "text": text
         }
         try:
-            async with aiohttp.ClientSession() as session:
-                if payload is not None:
-                    async with session.post(url, headers=headers, json=payload) as response:
-                        if response.status == 200:
-                            chunk = await response.read()
-                            logger.info(f"status for deepgram request {response.status} response {len(await response.read())}")
-                            return chunk
-                        else:
-                            logger.info(f"status for deepgram reques {response.status} response {await response.read()}")
-                            return b'\x00'
-                else:
-                    logger.info("Payload was null")
+            session = resource_registry.get_aiohttp_session()
+            if payload is not None:
+                async with session.post(url, headers=headers, json=payload) as response:
+                    if response.status == 200:
+                        chunk = await response.read()
+                        logger.info(f"status for deepgram request {response.status} response {len(await response.read())}")
+                        return chunk
+                    else:
+                        logger.info(f"status for deepgram reques {response.status} response {await response.read()}")
+                        return b'\x00'
+            else:
+                logger.info("Payload was null")
         except Exception as e:
             logger.error("something went wrong")
 
@@ -133,7 +140,8 @@ class DeepgramSynthesizer(BaseSynthesizer):
                     meta_info['synthesizer_latency'] = meta_info['synthesizer_first_result_latency']
             except Exception:
                 pass
-            meta_info['format'] = 'mulaw'
+            meta_info['format'] = 'pcm' if self.format == "linear16" else 'mulaw'
+            meta_info['sample_rate'] = int(self.sample_rate)
             meta_info["text_synthesized"] = f"{text} "
             meta_info["mark_id"] = str(uuid.uuid4())
             # Compute total stream duration (HTTP single-shot)
@@ -146,4 +154,4 @@ class DeepgramSynthesizer(BaseSynthesizer):
 
     async def push(self, message):
         logger.info(f"Pushed message to internal queue {message}")
-        self.internal_queue.put_nowait(copy.deepcopy(message))
+        self.internal_queue.put_nowait({'data': message['data'], 'meta_info': PacketMetaInfo(message['meta_info'])})
@@ -1,11 +1,9 @@
 import asyncio
-import copy
 import uuid
 import time
 import websockets
 import base64
 import json
-import aiohttp
 import os
 import traceback
 from collections import deque
@@ -13,12 +11,16 @@ from collections import deque
 from bolna.memory.cache.inmemory_scalar_cache import InmemoryScalarCache
 from .base_synthesizer import BaseSynthesizer
 from bolna.helpers.logger_config import configure_logger
-from bolna.helpers.utils import convert_audio_to_wav, create_ws_data_packet, resample
+from bolna.helpers.utils import convert_audio_to_wav, create_ws_data_packet, resample, wrap_pcm_in_wav
+from bolna.helpers.packet_meta_info import PacketMetaInfo
+from bolna.helpers.resource_registry import resource_registry
 
 logger = configure_logger(__name__)
 
 
 class ElevenlabsSynthesizer(BaseSynthesizer):
+    native_output_formats = (("mulaw", 8000), ("pcm", 8000), ("pcm", 16000), ("pcm", 22050), ("pcm", 24000), ("pcm", 44100))
+
     def __init__(self, voice, voice_id, model="eleven_turbo_v2_5", audio_format="mp3", sampling_rate="16000",
                  stream=False, buffer_size=400, temperature=0.5, similarity_boost=0.75, speed=1.0, style=0, synthesizer_key=None,
                  caching=True, **kwargs):
@@ -31,9 +33,12 @@ class ElevenlabsSynthesizer(BaseSynthesizer):
         self.speed = speed
         self.style = style
         self.audio_format = "mp3"
-        self.use_mulaw = kwargs.get("use_mulaw", True)
+        # Native (encoding, sample rate) negotiated by the task manager for the output handler, if any
+        self.output_format = kwargs.get("output_format", None)
+        self.use_mulaw = self.output_format[0] == "mulaw" if self.output_format else kwargs.get("use_mulaw", True)
+        self.use_pcm = bool(self.output_format) and self.output_format[0] == "pcm"
         self.elevenlabs_host = os.getenv("ELEVENLABS_API_HOST", "api.elevenlabs.io")
-        self.ws_url = f"wss://{self.elevenlabs_host}/v1/text-to-speech/{self.voice}/multi-stream-input?model_id={self.model}&output_format={'ulaw_8000' if self.use_mulaw else 'mp3_44100_128'}&inactivity_timeout=170&sync_alignment=true&optimize_streaming_latency=4"
+        self.ws_url = f"wss://{self.elevenlabs_host}/v1/text-to-speech/{self.voice}/multi-stream-input?model_id={self.model}&output_format={self.get_format(self.audio_format, self.sampling_rate)}&inactivity_timeout=170&sync_alignment=true&optimize_streaming_latency=4"
         self.api_url = f"https://{self.elevenlabs_host}/v1/text-to-speech/{self.voice}?optimize_streaming_latency=2&output_format="
         self.first_chunk_generated = False
         self.last_text_sent = False
@@ -63,6 +68,8 @@ class ElevenlabsSynthesizer(BaseSynthesizer):
         # pcm_24000, ulaw_8000
         if self.use_mulaw:
             return "ulaw_8000"
+        if self.use_pcm:
+            return f"pcm_{self.output_format[1]}"
         return f"mp3_44100_128"
 
     def get_engine(self):
@@ -214,16 +221,16 @@ class ElevenlabsSynthesizer(BaseSynthesizer):
             'xi-api-key': self.api_key
         }
         url = f"{self.api_url}{self.get_format(self.audio_format, self.sampling_rate)}" if format is None else f"{self.api_url}{format}"
-        async with aiohttp.ClientSession() as session:
-            if payload is not None:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        data = await response.read()
-                        return data
-                    else:
-                        logger.error(f"Error: {response.status} - {await response.text()}")
-            else:
-                logger.info("Payload was null")
+        session = resource_registry.get_aiohttp_session()
+        if payload is not None:
+            async with session.post(url, headers=headers, json=payload) as response:
+                if response.status == 200:
+                    data = await response.read()
+                    return data
+                else:
+                    logger.error(f"Error: {response.status} - {await response.text()}")
+        else:
+            logger.info("Payload was null")
 
     async def synthesize(self, text):
         audio = await self.__generate_http(text, format="mp3_44100_128")
@@ -276,13 +283,18 @@ class ElevenlabsSynthesizer(BaseSynthesizer):
                     if self.use_mulaw:
                         self.meta_info['format'] = 'mulaw'
                         audio = message
+                    elif self.use_pcm:
+                        self.meta_info['format'] = 'pcm'
+                        self.meta_info['sample_rate'] = self.output_format[1]
+                        # A whole (silent) sample for the end of stream marker
+                        audio = b'\x00\x00' if message == b'\x00' else message
                     else:
                         self.meta_info['format'] = "wav"
                         audio = message
                         if message != b'\x00':
                             proc_start = time.perf_counter()
-                            audio = resample(convert_audio_to_wav(message, source_format="mp3"), int(self.sampling_rate),
-                                             format="wav")
+                            audio = wrap_pcm_in_wav(self.resample_stream(convert_audio_to_wav(message, source_format="mp3"), self.sampling_rate),
+                                                    int(self.sampling_rate))
                             proc_time = (time.perf_counter() - proc_start) * 1000
                             if proc_time > 50:
                                 logger.info(f"EL audio_proc took={proc_time:.0f}ms trace_id={self.ws_trace_id}")
@@ -302,6 +314,7 @@ class ElevenlabsSynthesizer(BaseSynthesizer):
                         logger.info("received null byte and hence end of stream")
                         self.meta_info["end_of_synthesizer_stream"] = True
                         self.first_chunk_generated = False
+                        self.reset_stream_resampler()
                         # Compute total stream duration for this synthesizer turn
                         try:
                             if self.current_turn_start_time is not None:
@@ -358,6 +371,9 @@ class ElevenlabsSynthesizer(BaseSynthesizer):
 
                     if self.use_mulaw:
                         meta_info['format'] = "mulaw"
+                    elif self.use_pcm:
+                        meta_info['format'] = "pcm"
+                        meta_info['sample_rate'] = self.output_format[1]
                     else:
                         meta_info['format'] = "wav"
                         wav_bytes = convert_audio_to_wav(audio, source_format="mp3")
@@ -404,12 +420,12 @@ class ElevenlabsSynthesizer(BaseSynthesizer):
             return None
 
     async def monitor_connection(self):
-        # Periodically check if the connection is still alive
+        # Re-establishes the connection whenever it gets closed
         while True:
             if self.websocket_holder["websocket"] is None or self.websocket_holder["websocket"].state is websockets.protocol.State.CLOSED:
                 logger.info("Re-establishing elevenlabs connection...")
                 self.websocket_holder["websocket"] = await self.establish_connection()
-            await asyncio.sleep(1)
+            await self.wait_for_connection_change(self.websocket_holder["websocket"])
 
     async def get_sender_task(self):
         return self.sender_task
@@ -419,7 +435,7 @@ class ElevenlabsSynthesizer(BaseSynthesizer):
             meta_info, text, self.current_text = message.get("meta_info"), message.get("data"), message.get("data")
             self.synthesized_characters += len(text) if text is not None else 0
             end_of_llm_stream = "end_of_llm_stream" in meta_info and meta_info["end_of_llm_stream"]
-            self.meta_info = copy.deepcopy(meta_info)
+            self.meta_info = PacketMetaInfo(meta_info)
             meta_info["text"] = text
             try:
                 if self.current_turn_start_time is None:
@@ -2,7 +2,7 @@ from collections import deque
 import os
 from dotenv import load_dotenv
 from bolna.helpers.logger_config import configure_logger
-from bolna.helpers.utils import convert_audio_to_wav, create_ws_data_packet, resample
+from bolna.helpers.utils import convert_audio_to_wav, create_ws_data_packet, resample, wrap_pcm_in_wav
 from .base_synthesizer import BaseSynthesizer
 from openai import AsyncOpenAI
 import io
@@ -12,8 +12,13 @@ load_dotenv()
 
 
 class OPENAISynthesizer(BaseSynthesizer):
+    # "pcm" responses are raw 16 bit PCM at 24kHz
+    native_output_formats = (("pcm", 24000),)
+
     def __init__(self, voice, audio_format="mp3", model = "tts-1", stream=False, sampling_rate=8000, buffer_size=400, **kwargs):
         super().__init__(kwargs.get("task_manager_instance", None), stream, buffer_size)
+        # Native (encoding, sample rate) negotiated by the task manager for the output handler, if any
+        self.output_format = kwargs.get("output_format", None)
         self.format = self.get_format(audio_format.lower())
         self.voice = voice
         self.sample_rate = sampling_rate
@@ -28,18 +33,20 @@ class OPENAISynthesizer(BaseSynthesizer):
         
     # Ensuring we can only do wav outputs becasue mulaw conversion for others messes up twilio
     def get_format(self, format):
+        if self.output_format:
+            return "pcm"
         return "mp3"
     
     async def synthesize(self, text):
         #This is used for one off synthesis mainly for use cases like voice lab and IVR
-        audio = await self.__generate_http(text)
+        audio = await self.__generate_http(text, response_format="mp3")
         return audio
 
-    async def __generate_http(self, text):
+    async def __generate_http(self, text, response_format=None):
         spoken_response = await self.async_client.audio.speech.create(
             model=self.model,
             voice=self.voice,
-            response_format=self.format,
+            response_format=response_format or self.format,
             input=text
             )
 
@@ -53,7 +60,7 @@ class OPENAISynthesizer(BaseSynthesizer):
         spoken_response = await self.async_client.audio.speech.create(
             model=self.model,
             voice=self.voice,
-            response_format="mp3",
+            response_format=self.format,
             input=text
             )
 
@@ -78,7 +85,14 @@ class OPENAISynthesizer(BaseSynthesizer):
                         if not self.first_chunk_generated:
                             meta_info["is_first_chunk"] = True
                             self.first_chunk_generated = True
-                        yield create_ws_data_packet(resample(convert_audio_to_wav(chunk, 'mp3'), self.sample_rate, format="wav"), meta_info)
+                        if self.output_format:
+                            meta_info['format'] = 'pcm'
+                            meta_info['sample_rate'] = self.output_format[1]
+                            yield create_ws_data_packet(chunk, meta_info)
+                            continue
+                        audio = self.resample_stream(convert_audio_to_wav(chunk, 'mp3'), self.sample_rate)
+                        yield create_ws_data_packet(wrap_pcm_in_wav(audio, int(self.sample_rate)), meta_info)
+                    self.reset_stream_resampler()
                         
                     if "end_of_llm_stream" in meta_info and meta_info["end_of_llm_stream"]:
                         meta_info["end_of_synthesizer_stream"] = True
@@ -95,7 +109,12 @@ class OPENAISynthesizer(BaseSynthesizer):
                     if "end_of_llm_stream" in meta_info and meta_info["end_of_llm_stream"]:
                         meta_info["end_of_synthesizer_stream"] = True
                         self.first_chunk_generated = False 
-                    yield create_ws_data_packet(resample(convert_audio_to_wav(audio, 'mp3'), self.sample_rate, format="wav"), meta_info)
+                    if self.output_format:
+                        meta_info['format'] = 'pcm'
+                        meta_info['sample_rate'] = self.output_format[1]
+                        yield create_ws_data_packet(audio, meta_info)
+                    else:
+                        yield create_ws_data_packet(resample(convert_audio_to_wav(audio, 'mp3'), self.sample_rate, format="wav"), meta_info)
 
         except Exception as e:
                 logger.error(f"Error in openai generate {e}")
@@ -1,5 +1,3 @@
-import copy
-import aiohttp
 import os
 import uuid
 import asyncio
@@ -14,6 +12,8 @@ from dotenv import load_dotenv
 
 from bolna.helpers.logger_config import configure_logger
 from bolna.helpers.utils import convert_audio_to_wav, create_ws_data_packet
+from bolna.helpers.packet_meta_info import PacketMetaInfo
+from bolna.helpers.resource_registry import resource_registry
 from bolna.memory.cache.inmemory_scalar_cache import InmemoryScalarCache
 from .base_synthesizer import BaseSynthesizer
 
@@ -89,16 +89,16 @@ class RimeSynthesizer(BaseSynthesizer):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                if payload is not None:
-                    async with session.post(self.api_url, headers=headers, json=payload) as response:
-                        if response.status == 200:
-                            chunk = await response.read()
-                            return chunk
-                        else:
-                            return b'\x00'
-                else:
-                    logger.info("Payload was null")
+            session = resource_registry.get_aiohttp_session()
+            if payload is not None:
+                async with session.post(self.api_url, headers=headers, json=payload) as response:
+                    if response.status == 200:
+                        chunk = await response.read()
+                        return chunk
+                    else:
+                        return b'\x00'
+            else:
+                logger.info("Payload was null")
         except Exception as e:
             logger.error("something went wrong")
 
@@ -306,12 +306,12 @@ class RimeSynthesizer(BaseSynthesizer):
             return None
 
     async def monitor_connection(self):
-        # Periodically check if the connection is still alive
+        # Re-establishes the connection whenever it gets closed
         while True:
             if self.websocket_holder["websocket"] is None or self.websocket_holder["websocket"].state is websockets.protocol.State.CLOSED:
                 logger.info("Re-establishing rime connection...")
                 self.websocket_holder["websocket"] = await self.establish_connection()
-            await asyncio.sleep(1)
+            await self.wait_for_connection_change(self.websocket_holder["websocket"])
 
     async def get_sender_task(self):
         return self.sender_task
@@ -321,7 +321,7 @@ class RimeSynthesizer(BaseSynthesizer):
             meta_info, text, self.current_text = message.get("meta_info"), message.get("data"), message.get("data")
             self.synthesized_characters += len(text) if text is not None else 0
             end_of_llm_stream = "end_of_llm_stream" in meta_info and meta_info["end_of_llm_stream"]
-            self.meta_info = copy.deepcopy(meta_info)
+            self.meta_info = PacketMetaInfo(meta_info)
             meta_info["text"] = text
             # Stamp synthesizer turn start time
             try:
@@ -1,9 +1,7 @@
-import aiohttp
 import asyncio
 import os
 import websockets
 from websockets.exceptions import InvalidHandshake
-import copy
 import time
 import uuid
 import traceback
@@ -12,7 +10,9 @@ import base64
 from collections import deque
 from .base_synthesizer import BaseSynthesizer
 from bolna.helpers.logger_config import configure_logger
-from bolna.helpers.utils import create_ws_data_packet, resample, wav_bytes_to_pcm
+from bolna.helpers.utils import create_ws_data_packet
+from bolna.helpers.packet_meta_info import PacketMetaInfo
+from bolna.helpers.resource_registry import resource_registry
 
 logger = configure_logger(__name__)
 
@@ -60,17 +60,17 @@ class SarvamSynthesizer(BaseSynthesizer):
             'Content-Type': 'application/json'
         }
 
-        async with aiohttp.ClientSession() as session:
-            if payload is not None:
-                async with session.post(self.api_url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data and data.get('audios', []) and isinstance(data.get('audios', []), list):
-                            return data.get('audios')[0]
-                    else:
-                        logger.error(f"Error: {response.status} - {await response.text()}")
-            else:
-                logger.info("Payload was null")
+        session = resource_registry.get_aiohttp_session()
+        if payload is not None:
+            async with session.post(self.api_url, headers=headers, json=payload) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data and data.get('audios', []) and isinstance(data.get('audios', []), list):
+                        return data.get('audios')[0]
+                else:
+                    logger.error(f"Error: {response.status} - {await response.text()}")
+        else:
+            logger.info("Payload was null")
 
     async def synthesize(self, text):
         audio = await self.__generate_http(text)
@@ -217,7 +217,7 @@ class SarvamSynthesizer(BaseSynthesizer):
             return None
 
     async def monitor_connection(self):
-        # Periodically check if the connection is still alive
+        # Re-establishes the connection whenever it gets closed
         consecutive_failures = 0
         max_failures = 3
 
@@ -234,7 +234,7 @@ class SarvamSynthesizer(BaseSynthesizer):
                 else:
                     self.websocket_holder["websocket"] = result
                     consecutive_failures = 0  # Reset on success
-            await asyncio.sleep(1)
+            await self.wait_for_connection_change(self.websocket_holder["websocket"])
 
     def get_synthesized_characters(self):
         return self.synthesized_characters
@@ -276,6 +276,7 @@ class SarvamSynthesizer(BaseSynthesizer):
                         logger.info("received null byte and hence end of stream")
                         self.meta_info["end_of_synthesizer_stream"] = True
                         self.first_chunk_generated = False
+                        self.reset_stream_resampler()
                         # Compute total stream duration for this synthesizer turn
                         try:
                             if self.current_turn_start_time is not None:
@@ -291,8 +292,7 @@ class SarvamSynthesizer(BaseSynthesizer):
                         except Exception:
                             pass
                     else:
-                        resampled_audio = resample(audio, int(self.sampling_rate), format="wav")
-                        audio = wav_bytes_to_pcm(resampled_audio)
+                        audio = self.resample_stream(audio, self.sampling_rate)
 
                     self.meta_info["mark_id"] = str(uuid.uuid4())
                     yield create_ws_data_packet(audio, self.meta_info)
@@ -306,7 +306,7 @@ class SarvamSynthesizer(BaseSynthesizer):
             meta_info, text, self.current_text = message.get("meta_info"), message.get("data"), message.get("data")
             self.synthesized_characters += len(text) if text is not None else 0
             end_of_llm_stream = "end_of_llm_stream" in meta_info and meta_info["end_of_llm_stream"]
-            self.meta_info = copy.deepcopy(meta_info)
+            self.meta_info = PacketMetaInfo(meta_info)
             meta_info["text"] = text
             # Stamp synthesizer turn start time
             try:
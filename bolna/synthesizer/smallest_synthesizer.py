@@ -1,10 +1,8 @@
-import aiohttp
 import os
 import uuid
 import traceback
 from collections import deque
 import asyncio
-import copy
 import websockets
 import json
 import base64
@@ -13,6 +11,8 @@ import time
 from .base_synthesizer import BaseSynthesizer
 from bolna.helpers.logger_config import configure_logger
 from bolna.helpers.utils import create_ws_data_packet
+from bolna.helpers.packet_meta_info import PacketMetaInfo
+from bolna.helpers.resource_registry import resource_registry
 
 logger = configure_logger(__name__)
 
@@ -51,16 +51,16 @@ class SmallestSynthesizer(BaseSynthesizer):
             'Content-Type': 'application/json'
         }
 
-        async with aiohttp.ClientSession() as session:
-            if payload is not None:
-                async with session.post(self.api_url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        data = await response.read()
-                        return data
-                    else:
-                        logger.error(f"Error: {response.status} - {await response.text()}")
-            else:
-                logger.info("Payload was null")
+        session = resource_registry.get_aiohttp_session()
+        if payload is not None:
+            async with session.post(self.api_url, headers=headers, json=payload) as response:
+                if response.status == 200:
+                    data = await response.read()
+                    return data
+                else:
+                    logger.error(f"Error: {response.status} - {await response.text()}")
+        else:
+            logger.info("Payload was null")
 
     async def synthesize(self, text):
         audio = await self.__generate_http(text)
@@ -261,12 +261,12 @@ class SmallestSynthesizer(BaseSynthesizer):
             return None
 
     async def monitor_connection(self):
-        # Periodically check if the connection is still alive
+        # Re-establishes the connection whenever it gets closed
         while True:
             if self.websocket_holder["websocket"] is None or self.websocket_holder["websocket"].state is websockets.protocol.State.CLOSED:
                 logger.info("Re-establishing smallest connection...")
                 self.websocket_holder["websocket"] = await self.establish_connection()
-            await asyncio.sleep(1)
+            await self.wait_for_connection_change(self.websocket_holder["websocket"])
 
     async def get_sender_task(self):
         return self.sender_task
@@ -276,7 +276,7 @@ class SmallestSynthesizer(BaseSynthesizer):
             meta_info, text, self.current_text = message.get("meta_info"), message.get("data"), message.get("data")
             self.synthesized_characters += len(text) if text is not None else 0
             end_of_llm_stream = "end_of_llm_stream" in meta_info and meta_info["end_of_llm_stream"]
-            self.meta_info = copy.deepcopy(meta_info)
+            self.meta_info = PacketMetaInfo(meta_info)
             meta_info["text"] = text
             # Stamp synthesizer turn start time
             try:
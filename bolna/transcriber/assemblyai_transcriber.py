@@ -2,9 +2,7 @@ import asyncio
 import traceback
 import os
 import json
-import aiohttp
 import time
-from audioop import ulaw2lin
 from urllib.parse import urlencode
 from dotenv import load_dotenv
 import websockets
@@ -12,7 +10,9 @@ from websockets.asyncio.client import ClientConnection
 from websockets.exceptions import ConnectionClosedError, InvalidHandshake
 
 from .base_transcriber import BaseTranscriber
+from bolna.helpers.audio_codec import ulaw2lin
 from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.resource_registry import resource_registry
 from bolna.helpers.utils import create_ws_data_packet, timestamp_ms
 
 logger = configure_logger(__name__)
@@ -20,15 +20,15 @@ load_dotenv()
 
 
 class AssemblyAITranscriber(BaseTranscriber):
+    keepalive_interval = 5
+
     def __init__(self, telephony_provider, input_queue=None, model='universal-streaming', stream=True, language="en",
                  sampling_rate="16000", encoding="pcm_s16le", output_queue=None, format_turns=True,
                  **kwargs):
-        super().__init__(input_queue)
+        super().__init__(input_queue, kwargs.get("input_frames_per_batch"))
         self.language = language
         self.stream = stream
         self.provider = telephony_provider
-        self.heartbeat_task = None
-        self.sender_task = None
         self.model = model
         self.sampling_rate = int(sampling_rate)
         self.encoding = encoding
@@ -40,21 +40,15 @@ class AssemblyAITranscriber(BaseTranscriber):
         self.transcription_task = None
         
         # Audio and transcription tracking
-        self.audio_cursor = 0.0
         self.transcription_cursor = 0.0
         self.interruption_signalled = False
         
         if not self.stream:
             # For non-streaming HTTP API
             self.api_url = f"https://api.assemblyai.com/v2/transcript"
-            self.session = aiohttp.ClientSession()
+            self.session = None
             
-        self.audio_submitted = False
-        self.audio_submission_time = None
-        self.num_frames = 0
         self.connection_start_time = None
-        self.audio_frame_duration = 0.0
-        self.audio_frame_timestamps = []  # List of (frame_start, frame_end, send_timestamp)
         self.connected_via_dashboard = kwargs.get("enforce_streaming", True)
         
         # Message states for turn management
@@ -63,8 +57,6 @@ class AssemblyAITranscriber(BaseTranscriber):
         self.is_transcript_sent_for_processing = False
         self.websocket_connection = None
         self.connection_authenticated = False
-        self.current_turn_start_time = None
-        self.current_turn_id = None
         self.current_turn_interim_details = []
 
     def get_assemblyai_ws_url(self):
@@ -77,7 +69,7 @@ class AssemblyAITranscriber(BaseTranscriber):
         if self.provider in ('twilio', 'exotel', 'plivo'):
             self.encoding = 'mulaw' if self.provider in ("twilio") else "linear16"
             self.sampling_rate = 8000
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
             connection_params['sample_rate'] = self.sampling_rate
 
         elif self.provider == "web_based_call":
@@ -100,36 +92,10 @@ class AssemblyAITranscriber(BaseTranscriber):
         websocket_url = f"wss://{self.assemblyai_host}/v3/ws?{urlencode(connection_params)}"
         return websocket_url
 
-    async def send_heartbeat(self, ws: ClientConnection):
-        """Send periodic keepalive messages"""
-        try:
-            while True:
-                try:
-                    await ws.ping()
-                except ConnectionClosedError as e:
-                    logger.info(f"Connection closed while sending ping: {e}")
-                    break
-                except Exception as e:
-                    logger.error(f"Error sending ping: {e}")
-                    break
-
-                await asyncio.sleep(5)
-                
-        except asyncio.CancelledError:
-            logger.info("Heartbeat task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f'Error in send_heartbeat: {e}')
-            raise
-
     async def toggle_connection(self):
         """Close the connection and cleanup tasks"""
         self.connection_on = False
-
-        if self.heartbeat_task is not None:
-            self.heartbeat_task.cancel()
-        if self.sender_task is not None:
-            self.sender_task.cancel()
+        self.stop_stream()
 
         if self.websocket_connection is not None:
             try:
@@ -145,8 +111,8 @@ class AssemblyAITranscriber(BaseTranscriber):
 
     async def _get_http_transcription(self, audio_data):
         """Handle non-streaming HTTP transcription"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+        # Connection pool shared by every call of the process
+        self.session = resource_registry.get_aiohttp_session()
 
         headers = {
             'Authorization': self.api_key,
@@ -196,30 +162,26 @@ class AssemblyAITranscriber(BaseTranscriber):
             return True
         return False
 
-    def get_meta_info(self):
-        return self.meta_info
-
-    def _find_audio_send_timestamp(self, audio_position):
-        """
-        Find when the audio frame containing this position was sent to AssemblyAI.
-
-        This directly matches the audio position to the frame that contains it,
-        providing accurate latency measurement from when that specific audio was sent.
-
-        Args:
-            audio_position: Position in seconds within the audio stream
+    async def on_stream_start(self, ws_data_packet):
+        self.meta_info = ws_data_packet.get('meta_info', {}) or {}
+        self.audio_submitted = True
+        self.audio_submission_time = time.time()
+        self.current_request_id = self.generate_request_id()
+        self.meta_info['request_id'] = self.current_request_id
+        if not self.current_turn_start_time:
+            self.current_turn_start_time = time.perf_counter()
+            self.current_turn_id = self.meta_info.get('turn_id') or self.meta_info.get('request_id')
 
-        Returns:
-            Timestamp when the frame containing this position was sent, or None if not found
-        """
-        if not self.audio_frame_timestamps:
+    def encode_frame(self, audio_data):
+        if not isinstance(audio_data, bytes):
+            logger.warning(f"Expected bytes for audio data, got: {type(audio_data)}")
             return None
+        if self.provider == "twilio" and self.encoding == "mulaw":
+            return ulaw2lin(audio_data)
+        return audio_data
 
-        for frame_start, frame_end, send_timestamp in self.audio_frame_timestamps:
-            if frame_start <= audio_position <= frame_end:
-                return send_timestamp
-
-        return None
+    def get_meta_info(self):
+        return self.meta_info
 
     async def sender(self, ws=None):
         """Sender for non-streaming mode"""
@@ -256,62 +218,6 @@ class AssemblyAITranscriber(BaseTranscriber):
             logger.info("Cancelled sender task")
             return
 
-    async def sender_stream(self, ws: ClientConnection):
-        """Send audio data to AssemblyAI WebSocket"""
-        try:
-            while True:
-                ws_data_packet = await self.input_queue.get()
-
-                if not self.audio_submitted:
-                    if ws_data_packet is not None:
-                        self.meta_info = ws_data_packet.get('meta_info', {}) or {}
-                        self.audio_submitted = True
-                        self.audio_submission_time = time.time()
-                        self.current_request_id = self.generate_request_id()
-                        self.meta_info['request_id'] = self.current_request_id
-                        try:
-                            if not self.current_turn_start_time:
-                                self.current_turn_start_time = time.perf_counter()
-                                meta = self.meta_info or {}
-                                self.current_turn_id = meta.get('turn_id') or meta.get('request_id')
-                        except Exception:
-                            pass
-
-                end_of_stream = await self._check_and_process_end_of_stream(ws_data_packet, ws)
-                if end_of_stream:
-                    break
-
-                frame_start = self.num_frames * self.audio_frame_duration
-                frame_end = (self.num_frames + 1) * self.audio_frame_duration
-                send_timestamp = timestamp_ms()
-                self.audio_frame_timestamps.append((frame_start, frame_end, send_timestamp))
-
-                self.num_frames += 1
-                self.audio_cursor = self.num_frames * self.audio_frame_duration
-                
-                audio_data = ws_data_packet.get('data')
-                if isinstance(audio_data, bytes):
-                    try:
-                        if self.provider == "twilio" and self.encoding == "mulaw":
-                            audio_data = ulaw2lin(audio_data, 2)
-                        
-                        await ws.send(audio_data)
-                    except ConnectionClosedError as e:
-                        logger.error(f"Connection closed while sending data: {e}")
-                        break
-                    except Exception as e:
-                        logger.error(f"Error sending data to websocket: {e}")
-                        break
-                else:
-                    logger.warning(f"Expected bytes for audio data, got: {type(audio_data)}")
-                    
-        except asyncio.CancelledError:
-            logger.info("Sender stream task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f'Error in sender_stream: {e}')
-            raise
-
     async def receiver(self, ws: ClientConnection):
         """Receive and process messages from AssemblyAI WebSocket"""
         async for msg in ws:
@@ -482,6 +388,9 @@ class AssemblyAITranscriber(BaseTranscriber):
             logger.error(f"Unexpected error connecting to AssemblyAI websocket: {e}")
             raise ConnectionError(f"Unexpected error connecting to AssemblyAI websocket: {e}")
 
+    async def connect(self):
+        return await self.assemblyai_connect()
+
     async def run(self):
         """Start the transcription task"""
         try:
@@ -496,7 +405,7 @@ class AssemblyAITranscriber(BaseTranscriber):
             start_time = time.perf_counter()
             
             try:
-                assemblyai_ws = await self.assemblyai_connect()
+                assemblyai_ws = await self.get_connection()
             except (ValueError, ConnectionError) as e:
                 logger.error(f"Failed to establish AssemblyAI connection: {e}")
                 await self.toggle_connection()
@@ -506,8 +415,7 @@ class AssemblyAITranscriber(BaseTranscriber):
                 self.connection_time = round((time.perf_counter() - start_time) * 1000)
 
             if self.stream:
-                self.sender_task = asyncio.create_task(self.sender_stream(assemblyai_ws))
-                self.heartbeat_task = asyncio.create_task(self.send_heartbeat(assemblyai_ws))
+                self.start_stream(assemblyai_ws)
                 
                 try:
                     async for message in self.receiver(assemblyai_ws):
@@ -544,10 +452,7 @@ class AssemblyAITranscriber(BaseTranscriber):
                     self.websocket_connection = None
                     self.connection_authenticated = False
             
-            if hasattr(self, 'sender_task') and self.sender_task is not None:
-                self.sender_task.cancel()
-            if hasattr(self, 'heartbeat_task') and self.heartbeat_task is not None:
-                self.heartbeat_task.cancel()
+            self.stop_stream()
             
             await self.push_to_transcriber_queue(
                 create_ws_data_packet("transcriber_connection_closed", getattr(self, 'meta_info', {}))
@@ -16,7 +16,7 @@ load_dotenv()
 
 class AzureTranscriber(BaseTranscriber):
     def __init__(self, telephony_provider, input_queue=None, output_queue=None, language="en-US", encoding="linear16", **kwargs):
-        super().__init__(input_queue)
+        super().__init__(input_queue, kwargs.get("input_frames_per_batch"))
         self.transcription_task = None
         self.subscription_key = os.getenv('AZURE_SPEECH_KEY')
         self.service_region = os.getenv('AZURE_SPEECH_REGION')
@@ -37,7 +37,6 @@ class AzureTranscriber(BaseTranscriber):
         self.start_time = None
         self.end_time = None
 
-        self.audio_frame_timestamps = []
         self.num_frames = 0
         self.audio_frame_duration = 0.0
 
@@ -50,7 +49,7 @@ class AzureTranscriber(BaseTranscriber):
             self.encoding = "mulaw" if self.audio_provider in ("twilio",) else "linear16"
             if self.encoding == "mulaw":
                 self.bits_per_sample = 8
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
 
         elif self.audio_provider == "web_based_call":
             self.sampling_rate = 16000
@@ -75,28 +74,6 @@ class AzureTranscriber(BaseTranscriber):
             return True
         return False
 
-    def _find_audio_send_timestamp(self, audio_position):
-        """
-        Find when the audio frame containing this position was sent to Azure.
-
-        This directly matches the audio position to the frame that contains it,
-        providing accurate latency measurement from when that specific audio was sent.
-
-        Args:
-            audio_position: Position in seconds within the audio stream
-
-        Returns:
-            Timestamp when the frame containing this position was sent, or None if not found
-        """
-        if not self.audio_frame_timestamps:
-            return None
-
-        for frame_start, frame_end, send_timestamp in self.audio_frame_timestamps:
-            if frame_start <= audio_position <= frame_end:
-                return send_timestamp
-
-        return None
-
     async def send_audio_to_transcriber(self):
         try:
             while True:
@@ -120,7 +97,7 @@ class AzureTranscriber(BaseTranscriber):
                     frame_start = self.num_frames * self.audio_frame_duration
                     frame_end = (self.num_frames + 1) * self.audio_frame_duration
                     send_timestamp = timestamp_ms()
-                    self.audio_frame_timestamps.append((frame_start, frame_end, send_timestamp))
+                    self.audio_frame_timestamps.append(frame_start, frame_end, send_timestamp)
                     self.num_frames += 1
 
                     self.push_stream.write(ws_data_packet.get('data'))
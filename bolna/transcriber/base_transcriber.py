@@ -1,16 +1,31 @@
+import asyncio
 import json
 import time
 import uuid
+from websockets.exceptions import ConnectionClosed
+from websockets.protocol import State
 from dotenv import load_dotenv
+from bolna.constants import DEFAULT_FRAME_TIMESTAMP_RETENTION_S, DEFAULT_INPUT_FRAMES_PER_BATCH, TELEPHONY_MEDIA_FRAME_MS
+from bolna.helpers.frame_timestamp_index import FrameTimestampIndex
 from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.timer_wheel import get_timer_wheel
+from bolna.helpers.utils import create_ws_data_packet, timestamp_ms
 
 load_dotenv()
 logger = configure_logger(__name__)
 
 
 class BaseTranscriber:
-    def __init__(self, input_queue=None):
+    # Seconds without any message sent to the provider after which `send_keepalive()` is called, None to never call it
+    keepalive_interval = None
+    # `async connect()` opening the connection to the provider (DNS, TLS, session creation...), defined by the
+    # transcribers streaming over a connection. The others leave it None and are neither pre-connected nor connected
+    connect = None
+
+    def __init__(self, input_queue=None, input_frames_per_batch=None):
         self.input_queue = input_queue
+        # Seconds of audio in each packet of the telephony input handlers, which batch `input_frames_per_batch` frames
+        self.telephony_frame_duration = (input_frames_per_batch or DEFAULT_INPUT_FRAMES_PER_BATCH) * TELEPHONY_MEDIA_FRAME_MS / 1000
         self.connection_on = True
         self.callee_speaking = False
         self.caller_speaking = False
@@ -20,8 +35,32 @@ class BaseTranscriber:
         self.previous_request_id = None
         self.current_request_id = None
         self.connection_time = None
+        self.connection_setup_time = None
+        self.preconnected = False
+        self.preconnect_task = None
         self.turn_latencies = []
 
+        # Streaming state, see `start_stream()`
+        self.sender_task = None
+        self.audio_submitted = False
+        self.audio_submission_time = None
+        self.num_frames = 0
+        self.audio_frame_duration = 0.0
+        self.audio_cursor = 0.0
+        self.audio_frame_timestamps = FrameTimestampIndex()
+        self.last_audio_send_time = None
+        self.last_result_audio_sent_at = None  # send timestamp (ms) of the frame the latest result ends in
+        self.current_turn_start_time = None
+        self.current_turn_id = None
+        self.interim_timeout = 5.0
+        self.__last_send_time = None
+        self.__keepalive_timer = None
+        self.__keepalive_task = None
+        self.__monitor_utterances = False
+        self.__utterance_timer = None
+        self.__finalize_task = None
+        self._last_interim_time = None
+
     def update_meta_info(self):
         self.meta_info['request_id'] = self.current_request_id if self.current_request_id else None
         self.meta_info['previous_request_id'] = self.previous_request_id
@@ -57,3 +96,238 @@ class BaseTranscriber:
             await ws.send(json.dumps(data))
         except Exception as e:
             logger.error(f"Error while closing transcriber stream {e}")
+
+    async def __timed_connect(self):
+        start_time = time.perf_counter()
+        connection = await self.connect()
+        if self.connection_setup_time is None:
+            self.connection_setup_time = round((time.perf_counter() - start_time) * 1000)
+        return connection
+
+    def preconnect(self):
+        """
+        Starts setting up the connection in the background while the call is being set up, so that it's ready (or
+        nearly) by the time `transcribe()` asks for it through `get_connection()`.
+        """
+        if self.preconnect_task is None and self.connect is not None:
+            logger.info("Pre-connecting the transcriber")
+            self.preconnect_task = asyncio.create_task(self.__timed_connect())
+
+    async def get_connection(self):
+        """The pre-connected connection, waiting for its setup to complete if needed, otherwise a new connection"""
+        if self.connect is None:
+            raise ConnectionError(f"{type(self).__name__} doesn't stream over a connection")
+        if self.preconnect_task is not None:
+            preconnect_task, self.preconnect_task = self.preconnect_task, None
+            try:
+                connection = await preconnect_task
+                if connection.state is State.OPEN:
+                    self.preconnected = True
+                    return connection
+                logger.info("Pre-connected transcriber connection was closed, connecting again")
+            except Exception as e:
+                logger.error(f"Pre-connecting the transcriber failed, connecting again: {e}")
+        return await self.__timed_connect()
+
+    async def close_preconnection(self):
+        """Closes the pre-connected connection if nothing used it, e.g. the call ended before the transcriber ran"""
+        if self.preconnect_task is None:
+            return
+        preconnect_task, self.preconnect_task = self.preconnect_task, None
+        if not preconnect_task.done():
+            preconnect_task.cancel()
+        try:
+            connection = await preconnect_task
+            await connection.close()
+        except (asyncio.CancelledError, Exception) as e:
+            logger.info(f"Pre-connected transcriber connection not closed: {e}")
+
+    #################################################################
+    # Streaming engine
+    #################################################################
+    # Providers implement `connect()`, `encode_frame()` and `receiver()` (parsing the provider messages) and, where
+    # they differ from the defaults, `on_stream_start()`, `_check_and_process_end_of_stream()` and `send_keepalive()`.
+    # The transcription task runs the receiver, `start_stream()` adds a single sender task and timer callbacks.
+
+    def encode_frame(self, audio_data):
+        """Message sent to the provider for a frame of audio, None to skip the frame"""
+        return audio_data
+
+    async def on_stream_start(self, ws_data_packet):
+        """Called with the first packet of the input queue, initialises the request and the first turn"""
+        self.meta_info = ws_data_packet.get('meta_info', {}) or {}
+        self.audio_submitted = True
+        self.audio_submission_time = time.time()
+        self.current_request_id = self.generate_request_id()
+        self.meta_info['request_id'] = self.current_request_id
+        if not self.current_turn_start_time:
+            self.current_turn_start_time = timestamp_ms()
+            self.current_turn_id = self.meta_info.get('turn_id') or self.meta_info.get('request_id')
+
+    async def _check_and_process_end_of_stream(self, ws_data_packet, ws):
+        if ws_data_packet.get('meta_info', {}).get('eos') is True:
+            await self._close(ws, data={"type": "CloseStream"})
+            return True
+        return False
+
+    async def send_keepalive(self, ws):
+        await ws.ping()
+
+    def start_stream(self, ws, monitor_utterances=False):
+        """
+        Starts streaming the input queue to `ws` from a single sender task. Keepalives are sent from a timer callback
+        (on the process wide timer wheel) once nothing was sent for `keepalive_interval` seconds and, with
+        `monitor_utterances`, a turn left without a final transcript for `interim_timeout` seconds after its last
+        interim result is force-finalized.
+        """
+        self.__monitor_utterances = monitor_utterances
+        self.__last_send_time = time.monotonic()
+        self.sender_task = asyncio.create_task(self.__sender_stream(ws))
+        if self.keepalive_interval:
+            self.__keepalive_timer = get_timer_wheel().call_later(self.keepalive_interval, self.__on_keepalive_timer, ws)
+
+    def stop_stream(self):
+        self.__monitor_utterances = False
+        for timer in (self.__keepalive_timer, self.__utterance_timer):
+            if timer is not None:
+                timer.cancel()
+        self.__keepalive_timer = self.__utterance_timer = None
+        for task in (self.sender_task, self.__keepalive_task):
+            if task is not None:
+                task.cancel()
+
+    async def __sender_stream(self, ws):
+        try:
+            while True:
+                ws_data_packet = await self.input_queue.get()
+                if ws_data_packet is None:
+                    continue
+
+                if not self.audio_submitted:
+                    await self.on_stream_start(ws_data_packet)
+
+                if await self._check_and_process_end_of_stream(ws_data_packet, ws):
+                    break
+
+                frame_start = self.num_frames * self.audio_frame_duration
+                self.num_frames += 1
+                self.audio_cursor = self.num_frames * self.audio_frame_duration
+                self.audio_frame_timestamps.append(frame_start, self.audio_cursor, timestamp_ms())
+
+                message = self.encode_frame(ws_data_packet.get('data'))
+                if message is None:
+                    continue
+                try:
+                    await ws.send(message)
+                    self.last_audio_send_time = timestamp_ms()
+                    self.__last_send_time = time.monotonic()
+                except ConnectionClosed as e:
+                    logger.error(f"Connection closed while sending audio: {e}")
+                    break
+                except Exception as e:
+                    logger.error(f"Error sending audio to the transcriber: {e}")
+                    break
+        except asyncio.CancelledError:
+            logger.info("Sender stream task cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Error in sender_stream: {e}")
+            raise
+
+    def __on_keepalive_timer(self, ws):
+        idle = time.monotonic() - self.__last_send_time
+        if idle >= self.keepalive_interval:
+            if self.__keepalive_task is None or self.__keepalive_task.done():
+                self.__keepalive_task = asyncio.create_task(self.__keepalive(ws))
+            idle = 0
+        self.__keepalive_timer = get_timer_wheel().call_later(self.keepalive_interval - idle, self.__on_keepalive_timer, ws)
+
+    async def __keepalive(self, ws):
+        try:
+            await self.send_keepalive(ws)
+            self.__last_send_time = time.monotonic()
+        except ConnectionClosed as e:
+            logger.info(f"Connection closed while sending keepalive: {e}")
+            if self.__keepalive_timer is not None:
+                self.__keepalive_timer.cancel()
+                self.__keepalive_timer = None
+        except Exception as e:
+            logger.error(f"Error sending keepalive: {e}")
+
+    #################################################################
+    # Turn bookkeeping
+    #################################################################
+    @property
+    def last_interim_time(self):
+        return self._last_interim_time
+
+    @last_interim_time.setter
+    def last_interim_time(self, value):
+        # Every interim result (re)arms the utterance timeout, finalizing the turn (resetting it to None) disarms it
+        self._last_interim_time = value
+        if self.__utterance_timer is not None:
+            self.__utterance_timer.cancel()
+            self.__utterance_timer = None
+        if value is not None and self.__monitor_utterances:
+            self.__utterance_timer = get_timer_wheel().call_later(self.interim_timeout, self.__on_utterance_timeout)
+
+    def has_pending_utterance(self):
+        """Whether interim results were received for a turn which wasn't finalized yet"""
+        return not self.is_transcript_sent_for_processing and bool(self.final_transcript.strip() or self.current_turn_interim_details)
+
+    def __on_utterance_timeout(self):
+        self.__utterance_timer = None
+        if self.has_pending_utterance() and (self.__finalize_task is None or self.__finalize_task.done()):
+            logger.warning(f"Utterance timeout: No finalization for {self.interim_timeout:.1f}s. Force-finalizing turn {self.current_turn_id}")
+            self.__finalize_task = asyncio.create_task(self._force_finalize_utterance())
+
+    def _reset_turn_state(self):
+        """Reset turn state variables after finalizing a transcript"""
+        self.speech_start_time = None
+        self.speech_end_time = None
+        self.last_interim_time = None
+        self.current_turn_interim_details = []
+        self.current_turn_start_time = None
+        self.current_turn_id = None
+        self.final_transcript = ""
+        self.is_transcript_sent_for_processing = True
+
+    async def _force_finalize_utterance(self):
+        """Force-finalize a stuck utterance and send it to the queue, as the final transcript would have been"""
+        transcript_to_send = self.final_transcript.strip()
+
+        # Fallback: use last interim if no final results received
+        if not transcript_to_send and self.current_turn_interim_details:
+            transcript_to_send = self.current_turn_interim_details[-1]['transcript']
+            logger.info(f"Using last interim as fallback: {transcript_to_send}")
+
+        if not transcript_to_send:
+            logger.warning("No transcript available to force-finalize")
+            self._reset_turn_state()
+            return
+
+        self.turn_latencies.append({
+            'turn_id': self.current_turn_id,
+            'sequence_id': self.current_turn_id,
+            'interim_details': self.current_turn_interim_details,
+            'force_finalized': True
+        })
+
+        data = {
+            "type": "transcript",
+            "content": transcript_to_send,
+            "force_finalized": True
+        }
+
+        logger.info(f"Force-finalized transcript after timeout: {transcript_to_send}")
+        await self.push_to_transcriber_queue(create_ws_data_packet(data, self.meta_info))
+        self._reset_turn_state()
+
+    def _find_audio_send_timestamp(self, audio_position):
+        """Timestamp (ms) at which the frame containing `audio_position` (seconds into the stream) was sent, if known"""
+        send_timestamp = self.audio_frame_timestamps.find(audio_position)
+        if send_timestamp is not None:
+            self.last_result_audio_sent_at = send_timestamp
+        # Results only move forward, the frames far behind this one won't be looked up anymore
+        self.audio_frame_timestamps.trim(audio_position - DEFAULT_FRAME_TIMESTAMP_RETENTION_S)
+        return send_timestamp
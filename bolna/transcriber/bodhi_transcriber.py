@@ -1,5 +1,4 @@
 import asyncio
-from audioop import ulaw2lin
 import traceback
 import uuid
 import numpy as np
@@ -7,12 +6,13 @@ import torch
 import websockets
 import os
 import json
-import aiohttp
 import time
 from urllib.parse import urlencode
 from dotenv import load_dotenv
 from .base_transcriber import BaseTranscriber
+from bolna.helpers.audio_codec import ulaw2lin
 from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.resource_registry import resource_registry
 from bolna.helpers.utils import create_ws_data_packet
 import ssl
 
@@ -31,8 +31,6 @@ class BodhiTranscriber(BaseTranscriber):
         self.language = language if model == "nova-2" else "en"
         self.stream = True
         self.provider = telephony_provider
-        self.heartbeat_task = None
-        self.sender_task = None
         self.model = "hi-general-v2-8khz"
         self.sampling_rate = 8000 if telephony_provider in ["plivo", "twilio", "exotel"] else sampling_rate
         self.api_key = kwargs.get("transcriber_key", os.getenv('BODHI_API_KEY'))
@@ -40,15 +38,10 @@ class BodhiTranscriber(BaseTranscriber):
         self.transcriber_output_queue = output_queue
         self.transcription_task = None
         self.keywords = keywords
-        self.audio_cursor = 0.0
         self.transcription_cursor = 0.0
         logger.info(f"self.stream: {self.stream}")
         self.interruption_signalled = False
-        self.audio_submitted = False
-        self.audio_submission_time = None
-        self.num_frames = 0
         self.connection_start_time = None
-        self.audio_frame_duration = 0.0
         self.connected_via_dashboard = kwargs.get("enforce_streaming", True)
         #Message states
         self.curr_message = ''
@@ -61,25 +54,13 @@ class BodhiTranscriber(BaseTranscriber):
         websocket_url = 'wss://{}'.format(self.api_host)
         return websocket_url
 
-    async def send_heartbeat(self, ws):
-        try:
-            while True:
-                data = {'type': 'KeepAlive'}
-                await ws.send(json.dumps(data))
-                await asyncio.sleep(5)  # Send a heartbeat message every 5 seconds
-        except Exception as e:
-            logger.error('Error while sending: ' + str(e))
-            raise Exception("Something went wrong while sending heartbeats to {}".format(self.model))
-
     async def toggle_connection(self):
         self.connection_on = False
-        if self.heartbeat_task is not None:
-            self.heartbeat_task.cancel()
-        self.sender_task.cancel()
+        self.stop_stream()
 
     async def _get_http_transcription(self, audio_data):
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+        # Connection pool shared by every call of the process
+        self.session = resource_registry.get_aiohttp_session()
 
         headers = {
             'Authorization': 'Token {}'.format(self.api_key),
@@ -89,16 +70,15 @@ class BodhiTranscriber(BaseTranscriber):
         self.current_request_id = self.generate_request_id()
         self.meta_info['request_id'] = self.current_request_id
         start_time = time.time()
-        async with self.session as session:
-            async with session.post(self.api_url, data=audio_data, headers=headers) as response:
-                response_data = await response.json()
-                self.meta_info["start_time"] = start_time
-                self.meta_info['transcriber_latency'] = time.time() - start_time
-                logger.info(f"response_data {response_data} transcriber_latency time {time.time() - start_time}")
-                transcript = response_data["results"]["channels"][0]["alternatives"][0]["transcript"]
-                logger.info(f"transcript {transcript} total time {time.time() - start_time}")
-                self.meta_info['transcriber_duration'] = response_data["metadata"]["duration"]
-                return create_ws_data_packet(transcript, self.meta_info)
+        async with self.session.post(self.api_url, data=audio_data, headers=headers) as response:
+            response_data = await response.json()
+            self.meta_info["start_time"] = start_time
+            self.meta_info['transcriber_latency'] = time.time() - start_time
+            logger.info(f"response_data {response_data} transcriber_latency time {time.time() - start_time}")
+            transcript = response_data["results"]["channels"][0]["alternatives"][0]["transcript"]
+            logger.info(f"transcript {transcript} total time {time.time() - start_time}")
+            self.meta_info['transcriber_duration'] = response_data["metadata"]["duration"]
+            return create_ws_data_packet(transcript, self.meta_info)
 
     async def _check_and_process_end_of_stream(self, ws_data_packet, ws):
         if 'eos' in ws_data_packet['meta_info'] and ws_data_packet['meta_info']['eos'] is True:
@@ -109,6 +89,11 @@ class BodhiTranscriber(BaseTranscriber):
 
         return False
 
+    def encode_frame(self, audio_data):
+        if self.provider in ["twilio", "exotel"]:
+            return ulaw2lin(audio_data)
+        return audio_data
+
     def get_meta_info(self):
         return self.meta_info
 
@@ -141,34 +126,6 @@ class BodhiTranscriber(BaseTranscriber):
             logger.error('Error while sending: ' + str(e))
             raise Exception("Something went wrong")
 
-    async def sender_stream(self, ws=None):
-        try:
-            while True:
-                ws_data_packet = await self.input_queue.get()
-                # Initialise new request
-                if not self.audio_submitted:
-                    self.meta_info = ws_data_packet.get('meta_info')
-                    self.audio_submitted = True
-                    self.audio_submission_time = time.time()
-                    self.current_request_id = self.generate_request_id()
-                    self.meta_info['request_id'] = self.current_request_id
-
-                end_of_stream = await self._check_and_process_end_of_stream(ws_data_packet, ws)
-                if end_of_stream:
-                    break
-                self.num_frames += 1
-                # save the audio cursor here
-                self.audio_cursor = self.num_frames * self.audio_frame_duration
-                audio_chunk = ws_data_packet.get('data')
-                if self.provider in ["twilio", "exotel"]:
-                    logger.info(f"It is a telephony provider")
-                    audio_chunk = ulaw2lin(audio_chunk, 2)
-
-                await ws.send(audio_chunk)
-        except Exception as e:
-            logger.error('Error while sending: ' + str(e))
-            raise Exception("Something went wrong")
-
     async def receiver(self, ws):
         try:
             async for msg in ws:
@@ -257,19 +214,17 @@ class BodhiTranscriber(BaseTranscriber):
     async def push_to_transcriber_queue(self, data_packet):
         await self.transcriber_output_queue.put(data_packet)
 
-    def connect(self):
-        try:
-            websocket_url = self.get_ws_url()
-            request_headers = {
-                "x-api-key": os.getenv("BODHI_API_KEY"),
-                "x-customer-id": os.getenv("BODHI_CUSTOMER_ID"),
-            }
-            logger.info(f"Connecting to {websocket_url}, with extra_headers {request_headers}")
-            ws = websockets.connect(websocket_url, extra_headers=request_headers)
-            return ws
-        except Exception as e:
-            traceback.print_exc()
-            logger.error(f"something went wrong in connecting {e}")
+    async def bodhi_connect(self):
+        websocket_url = self.get_ws_url()
+        request_headers = {
+            "x-api-key": os.getenv("BODHI_API_KEY"),
+            "x-customer-id": os.getenv("BODHI_CUSTOMER_ID"),
+        }
+        logger.info(f"Connecting to {websocket_url}, with extra_headers {request_headers}")
+        return await websockets.connect(websocket_url, extra_headers=request_headers)
+
+    async def connect(self):
+        return await self.bodhi_connect()
 
     async def run(self):
         try:
@@ -286,11 +241,9 @@ class BodhiTranscriber(BaseTranscriber):
     async def transcribe(self):
         logger.info(f"STARTED TRANSCRIBING")
         try:
-            async with self.connect() as ws:
+            async with await self.get_connection() as ws:
                 if self.stream:
                     logger.info(f"Connectioin established")
-                    self.sender_task = asyncio.create_task(self.sender_stream(ws))
-                    #self.heartbeat_task = asyncio.create_task(self.send_heartbeat(deepgram_ws))
                     self.config = {
                                     "sample_rate": self.sampling_rate,
                                     "transaction_id": str(uuid.uuid4()),
@@ -301,6 +254,7 @@ class BodhiTranscriber(BaseTranscriber):
                         json.dumps(
                             {
                                 "config": self.config}))
+                    self.start_stream(ws)
                     await asyncio.sleep(3)
                     async for message in self.receiver(ws):
                         if self.connection_on:
@@ -314,4 +268,6 @@ class BodhiTranscriber(BaseTranscriber):
             self.meta_info["transcriber_duration"] = time.time() - self.start_time
             await self.push_to_transcriber_queue(create_ws_data_packet("transcriber_connection_closed", self.meta_info))
         except Exception as e:
-            logger.error(f"Error in transcribe: {e}")
\ No newline at end of file
+            logger.error(f"Error in transcribe: {e}")
+        finally:
+            self.stop_stream()
\ No newline at end of file
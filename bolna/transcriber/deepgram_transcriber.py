@@ -2,16 +2,16 @@ import asyncio
 import traceback
 import os
 import json
-import aiohttp
 import time
 from urllib.parse import urlencode
 from dotenv import load_dotenv
 import websockets
 from websockets.asyncio.client import ClientConnection
-from websockets.exceptions import ConnectionClosedError, InvalidHandshake, ConnectionClosed
+from websockets.exceptions import ConnectionClosedError, InvalidHandshake
 
 from .base_transcriber import BaseTranscriber
 from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.resource_registry import resource_registry
 from bolna.helpers.utils import create_ws_data_packet, timestamp_ms
 
 
@@ -20,16 +20,16 @@ load_dotenv()
 
 
 class DeepgramTranscriber(BaseTranscriber):
+    keepalive_interval = 5
+
     def __init__(self, telephony_provider, input_queue=None, model='nova-2', stream=True, language="en", endpointing="400",
                  sampling_rate="16000", encoding="linear16", output_queue=None, keywords=None,
                  process_interim_results="true", **kwargs):
-        super().__init__(input_queue)
+        super().__init__(input_queue, kwargs.get("input_frames_per_batch"))
         self.endpointing = endpointing
         self.language = language
         self.stream = stream
         self.provider = telephony_provider
-        self.heartbeat_task = None
-        self.sender_task = None
         self.model = model
         self.sampling_rate = 16000
         self.encoding = encoding
@@ -42,13 +42,10 @@ class DeepgramTranscriber(BaseTranscriber):
         self.interruption_signalled = False
         if not self.stream:
             self.api_url = f"https://{self.deepgram_host}/v1/listen?model={self.model}&filler_words=true&language={self.language}"
-            self.session = aiohttp.ClientSession()
+            self.session = None
             if self.keywords is not None:
                 keyword_string = "&keywords=" + "&keywords=".join(self.keywords.split(","))
                 self.api_url = f"{self.api_url}{keyword_string}"
-        self.audio_submitted = False
-        self.audio_submission_time = None
-        self.num_frames = 0
         self.connection_start_time = None
         self.process_interim_results = process_interim_results
         self.audio_frame_duration = 0.0
@@ -58,19 +55,15 @@ class DeepgramTranscriber(BaseTranscriber):
         self.finalized_transcript = ""
         self.final_transcript = ""
         self.is_transcript_sent_for_processing = False
-        self.current_turn_start_time = None
-        self.current_turn_id = None
         self.websocket_connection = None
         self.connection_authenticated = False
         self.speech_start_time = None
         self.speech_end_time = None
         self.current_turn_interim_details = []
-        self.audio_frame_timestamps = []  # List of (frame_start, frame_end, send_timestamp)
         self.turn_counter = 0
         # Timeout tracking for stuck utterances
         self.last_interim_time = None
         self.interim_timeout = kwargs.get("interim_timeout", 5.0)  # Default 5 seconds
-        self.utterance_timeout_task = None
 
     def get_deepgram_ws_url(self):
         dg_params = {
@@ -89,7 +82,7 @@ class DeepgramTranscriber(BaseTranscriber):
         if self.provider in ('twilio', 'exotel', 'plivo'):
             self.encoding = 'mulaw' if self.provider in ("twilio") else "linear16"
             self.sampling_rate = 8000
-            self.audio_frame_duration = 0.2  # With twilio we are sending 200ms at a time
+            self.audio_frame_duration = self.telephony_frame_duration  # The telephony input handler sends input_frames_per_batch frames at a time
 
             dg_params['encoding'] = self.encoding
             dg_params['sample_rate'] = self.sampling_rate
@@ -127,123 +120,12 @@ class DeepgramTranscriber(BaseTranscriber):
         websocket_url = websocket_api + urlencode(dg_params)
         return websocket_url
 
-    async def send_heartbeat(self, ws: ClientConnection):
-        try:
-            while True:
-                data = {'type': 'KeepAlive'}
-                try:
-                    await ws.send(json.dumps(data))
-                except ConnectionClosed as e:
-                    rcvd_code = getattr(e.rcvd, "code", None)
-                    sent_code = getattr(e.sent, "code", None)
-
-                    if rcvd_code == 1000 or sent_code == 1000:
-                        logger.info("WebSocket closed normally (1000 OK) during heartbeat.")
-                    else:
-                        logger.warning(
-                            f"WebSocket closed: received={rcvd_code}, sent={sent_code}, "
-                            f"reason={getattr(e.rcvd, 'reason', '') or getattr(e.sent, 'reason', '')}"
-                        )
-                    break
-                except Exception as e:
-                    logger.error(f"Error sending heartbeat: {e}")
-                    break
-                    
-                await asyncio.sleep(5)  # Send a heartbeat message every 5 seconds
-        except asyncio.CancelledError:
-            logger.info("Heartbeat task cancelled")
-            raise
-        except Exception as e:
-            logger.error('Error in send_heartbeat: ' + str(e))
-            raise
-
-    def _reset_turn_state(self):
-        """Reset turn state variables after finalizing a transcript"""
-        self.speech_start_time = None
-        self.speech_end_time = None
-        self.last_interim_time = None
-        self.current_turn_interim_details = []
-        self.current_turn_start_time = None
-        self.current_turn_id = None
-        self.final_transcript = ""
-        self.is_transcript_sent_for_processing = True
-
-    async def _force_finalize_utterance(self):
-        """Force-finalize a stuck utterance and send to queue"""
-
-        # Determine what transcript to use
-        transcript_to_send = self.final_transcript.strip()
-
-        # Fallback: use last interim if no is_final results received
-        if not transcript_to_send and self.current_turn_interim_details:
-            transcript_to_send = self.current_turn_interim_details[-1]['transcript']
-            logger.info(f"Using last interim as fallback: {transcript_to_send}")
-
-        if not transcript_to_send:
-            logger.warning("No transcript available to force-finalize")
-            self._reset_turn_state()
-            return
-
-        # Build turn latencies (same as UtteranceEnd logic)
-        try:
-            self.turn_latencies.append({
-                'turn_id': self.current_turn_id,
-                'sequence_id': self.current_turn_id,
-                'interim_details': self.current_turn_interim_details,
-                'force_finalized': True
-            })
-        except Exception as e:
-            logger.error(f"Error building turn latencies: {e}")
-
-        # Create transcript message (same format as UtteranceEnd)
-        data = {
-            "type": "transcript",
-            "content": transcript_to_send,
-            "force_finalized": True  # For debugging
-        }
-
-        logger.info(f"Force-finalized transcript after timeout: {transcript_to_send}")
-
-        # Send to queue (unblocks _listen_transcriber)
-        await self.push_to_transcriber_queue(create_ws_data_packet(data, self.meta_info))
-
-        # Reset state (same as normal UtteranceEnd)
-        self._reset_turn_state()
-
-    async def monitor_utterance_timeout(self):
-        """Monitor for stuck utterances that never receive UtteranceEnd"""
-        try:
-            while True:
-                await asyncio.sleep(1.0)
-
-                # Check if we have pending interim results without finalization
-                if (self.last_interim_time and
-                    not self.is_transcript_sent_for_processing and
-                    (self.final_transcript.strip() or self.current_turn_interim_details)):
-
-                    elapsed = time.time() - self.last_interim_time
-
-                    if elapsed > self.interim_timeout:
-                        logger.warning(
-                            f"Interim timeout: No finalization for {elapsed:.1f}s. "
-                            f"Force-finalizing turn {self.current_turn_id}"
-                        )
-                        await self._force_finalize_utterance()
-        except asyncio.CancelledError:
-            logger.info("Utterance timeout monitoring task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in monitor_utterance_timeout: {e}")
-            raise
+    async def send_keepalive(self, ws):
+        await ws.send(json.dumps({'type': 'KeepAlive'}))
 
     async def toggle_connection(self):
         self.connection_on = False
-        if self.heartbeat_task is not None:
-            self.heartbeat_task.cancel()
-        if self.sender_task is not None:
-            self.sender_task.cancel()
-        if self.utterance_timeout_task is not None:
-            self.utterance_timeout_task.cancel()
+        self.stop_stream()
 
         if self.websocket_connection is not None:
             try:
@@ -256,8 +138,8 @@ class DeepgramTranscriber(BaseTranscriber):
                 self.connection_authenticated = False
 
     async def _get_http_transcription(self, audio_data):
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+        # Connection pool shared by every call of the process
+        self.session = resource_registry.get_aiohttp_session()
 
         headers = {
             'Authorization': 'Token {}'.format(self.api_key),
@@ -266,19 +148,11 @@ class DeepgramTranscriber(BaseTranscriber):
 
         self.current_request_id = self.generate_request_id()
         self.meta_info['request_id'] = self.current_request_id
-        async with self.session as session:
-            async with session.post(self.api_url, data=audio_data, headers=headers) as response:
-                response_data = await response.json()
-                transcript = response_data["results"]["channels"][0]["alternatives"][0]["transcript"]
-                self.meta_info['transcriber_duration'] = response_data["metadata"]["duration"]
-                return create_ws_data_packet(transcript, self.meta_info)
-
-    async def _check_and_process_end_of_stream(self, ws_data_packet, ws):
-        if 'eos' in ws_data_packet['meta_info'] and ws_data_packet['meta_info']['eos'] is True:
-            await self._close(ws, data={"type": "CloseStream"})
-            return True  # Indicates end of processing
-
-        return False
+        async with self.session.post(self.api_url, data=audio_data, headers=headers) as response:
+            response_data = await response.json()
+            transcript = response_data["results"]["channels"][0]["alternatives"][0]["transcript"]
+            self.meta_info['transcriber_duration'] = response_data["metadata"]["duration"]
+            return create_ws_data_packet(transcript, self.meta_info)
 
     def get_meta_info(self):
         return self.meta_info
@@ -324,50 +198,6 @@ class DeepgramTranscriber(BaseTranscriber):
             logger.info("Cancelled sender task")
             return
 
-    async def sender_stream(self, ws: ClientConnection):
-        try:
-            while True:
-                ws_data_packet = await self.input_queue.get()
-                # Initialise new request
-                if not self.audio_submitted:
-                    self.meta_info = ws_data_packet.get('meta_info')
-                    self.audio_submitted = True
-                    self.audio_submission_time = time.time()
-                    self.current_request_id = self.generate_request_id()
-                    self.meta_info['request_id'] = self.current_request_id
-                    try:
-                        if not self.current_turn_start_time:
-                            self.current_turn_start_time = timestamp_ms()
-                            self.current_turn_id = self.meta_info.get('turn_id') or self.meta_info.get('request_id')
-                    except Exception:
-                        pass
-
-                end_of_stream = await self._check_and_process_end_of_stream(ws_data_packet, ws)
-                if end_of_stream:
-                    break
-
-                frame_start = self.num_frames * self.audio_frame_duration
-                frame_end = (self.num_frames + 1) * self.audio_frame_duration
-                send_timestamp = timestamp_ms()
-                self.audio_frame_timestamps.append((frame_start, frame_end, send_timestamp))
-                self.num_frames += 1
-
-                try:
-                    await ws.send(ws_data_packet.get('data'))
-                except ConnectionClosedError as e:
-                    logger.error(f"Connection closed while sending data: {e}")
-                    break
-                except Exception as e:
-                    logger.error(f"Error sending data to websocket: {e}")
-                    break
-                    
-        except asyncio.CancelledError:
-            logger.info("Sender stream task cancelled")
-            raise
-        except Exception as e:
-            logger.error('Error in sender_stream: ' + str(e))
-            raise
-
     async def receiver(self, ws: ClientConnection):
         async for msg in ws:
             try:
@@ -580,6 +410,9 @@ class DeepgramTranscriber(BaseTranscriber):
             logger.error(f"Unexpected error connecting to Deepgram websocket: {e}")
             raise ConnectionError(f"Unexpected error connecting to Deepgram websocket: {e}")
 
+    async def connect(self):
+        return await self.deepgram_connect()
+
     async def run(self):
         try:
             self.transcription_task = asyncio.create_task(self.transcribe())
@@ -604,34 +437,12 @@ class DeepgramTranscriber(BaseTranscriber):
             logger.warning(f"Missing start or duration in Deepgram message, cannot update transcription cursor")
         return self.transcription_cursor
 
-    def _find_audio_send_timestamp(self, audio_position):
-        """
-        Find when the audio frame containing this position was sent to Deepgram.
-
-        This directly matches the audio position to the frame that contains it,
-        providing accurate latency measurement from when that specific audio was sent.
-
-        Args:
-            audio_position: Position in seconds within the audio stream
-
-        Returns:
-            Timestamp when the frame containing this position was sent, or None if not found
-        """
-        if not self.audio_frame_timestamps:
-            return None
-
-        for frame_start, frame_end, send_timestamp in self.audio_frame_timestamps:
-            if frame_start <= audio_position <= frame_end:
-                return send_timestamp
-
-        return None
-
     async def transcribe(self):
         deepgram_ws = None
         try:
             start_time = timestamp_ms()
             try:
-                deepgram_ws = await self.deepgram_connect()
+                deepgram_ws = await self.get_connection()
             except (ValueError, ConnectionError) as e:
                 logger.error(f"Failed to establish Deepgram connection: {e}")
                 await self.toggle_connection()
@@ -641,9 +452,7 @@ class DeepgramTranscriber(BaseTranscriber):
                 self.connection_time = round(timestamp_ms() - start_time)
 
             if self.stream:
-                self.sender_task = asyncio.create_task(self.sender_stream(deepgram_ws))
-                self.heartbeat_task = asyncio.create_task(self.send_heartbeat(deepgram_ws))
-                self.utterance_timeout_task = asyncio.create_task(self.monitor_utterance_timeout())
+                self.start_stream(deepgram_ws, monitor_utterances=True)
                 try:
                     async for message in self.receiver(deepgram_ws):
                         if self.connection_on:
@@ -678,12 +487,7 @@ class DeepgramTranscriber(BaseTranscriber):
                     self.websocket_connection = None
                     self.connection_authenticated = False
             
-            if hasattr(self, 'sender_task') and self.sender_task is not None:
-                self.sender_task.cancel()
-            if hasattr(self, 'heartbeat_task') and self.heartbeat_task is not None:
-                self.heartbeat_task.cancel()
-            if hasattr(self, 'utterance_timeout_task') and self.utterance_timeout_task is not None:
-                self.utterance_timeout_task.cancel()
+            self.stop_stream()
 
             await self.push_to_transcriber_queue(
                 create_ws_data_packet("transcriber_connection_closed", getattr(self, 'meta_info', {}))
@@ -24,7 +24,7 @@ class ElevenLabsTranscriber(BaseTranscriber):
                  language="en", endpointing="400", sampling_rate="16000", encoding="linear16", output_queue=None,
                  commit_strategy="vad", include_timestamps=True,
                  include_language_detection=True, **kwargs):
-        super().__init__(input_queue)
+        super().__init__(input_queue, kwargs.get("input_frames_per_batch"))
         self.endpointing = endpointing
         # Convert endpointing (ms) to vad_silence_threshold_secs (seconds)
         # ElevenLabs requires vad_silence_threshold_secs to be between 0.3 and 3.0
@@ -33,7 +33,6 @@ class ElevenLabsTranscriber(BaseTranscriber):
         self.language = language
         self.stream = stream
         self.provider = telephony_provider
-        self.sender_task = None
         self.model = model
         self.sampling_rate = 16000
         self.encoding = encoding
@@ -43,11 +42,7 @@ class ElevenLabsTranscriber(BaseTranscriber):
         self.transcription_task = None
         self.transcription_cursor = 0.0
         self.interruption_signalled = False
-        self.audio_submitted = False
-        self.audio_submission_time = None
-        self.num_frames = 0
         self.connection_start_time = None
-        self.audio_frame_duration = 0.0
         self.connected_via_dashboard = kwargs.get("enforce_streaming", True)
 
         # ElevenLabs specific settings
@@ -68,23 +63,16 @@ class ElevenLabsTranscriber(BaseTranscriber):
         self.finalized_transcript = ""
         self.final_transcript = ""
         self.is_transcript_sent_for_processing = False
-        self.current_turn_start_time = None
-        self.current_turn_id = None
         self.websocket_connection = None
         self.connection_authenticated = False
         self.speech_start_time = None
         self.speech_end_time = None
         self.current_turn_interim_details = []
-        self.audio_frame_timestamps = []
         self.turn_counter = 0
 
-        # Latency tracking
-        self.last_audio_send_time = None
-
         # Timeout tracking for stuck utterances
         self.last_interim_time = None
         self.interim_timeout = kwargs.get("interim_timeout", 5.0)
-        self.utterance_timeout_task = None
 
     def get_elevenlabs_ws_url(self):
         """Build the ElevenLabs WebSocket URL with query parameters"""
@@ -95,7 +83,7 @@ class ElevenLabsTranscriber(BaseTranscriber):
             # Twilio uses mulaw at 8kHz, exotel/plivo use linear16 at 8kHz
             self.encoding = 'mulaw' if self.provider == "twilio" else "linear16"
             self.sampling_rate = 8000
-            self.audio_frame_duration = 0.2  # 200ms chunks for telephony
+            self.audio_frame_duration = self.telephony_frame_duration  # input_frames_per_batch frames of 20 ms at a time
             audio_format = 'ulaw_8000' if self.provider == "twilio" else 'pcm_8000'
 
         elif self.provider == "web_based_call":
@@ -150,91 +138,10 @@ class ElevenLabsTranscriber(BaseTranscriber):
         # but should not block subsequent utterances
         self.is_transcript_sent_for_processing = False
 
-    def _find_audio_send_timestamp(self, audio_position):
-        """
-        Find when the audio frame containing this position was sent to ElevenLabs.
-
-        Args:
-            audio_position: Position in seconds within the audio stream
-
-        Returns:
-            Timestamp when the frame containing this position was sent, or None if not found
-        """
-        if not self.audio_frame_timestamps:
-            return None
-
-        for frame_start, frame_end, send_timestamp in self.audio_frame_timestamps:
-            if frame_start <= audio_position <= frame_end:
-                return send_timestamp
-
-        return None
-
-    async def _force_finalize_utterance(self):
-        """Force-finalize a stuck utterance and send to queue"""
-        transcript_to_send = self.final_transcript.strip()
-
-        # Fallback: use last interim if no final results received
-        if not transcript_to_send and self.current_turn_interim_details:
-            transcript_to_send = self.current_turn_interim_details[-1]['transcript']
-            logger.info(f"Using last interim as fallback: {transcript_to_send}")
-
-        if not transcript_to_send:
-            logger.warning("No transcript available to force-finalize")
-            self._reset_turn_state()
-            return
-
-        try:
-            self.turn_latencies.append({
-                'turn_id': self.current_turn_id,
-                'sequence_id': self.current_turn_id,
-                'interim_details': self.current_turn_interim_details,
-                'force_finalized': True
-            })
-        except Exception as e:
-            logger.error(f"Error building turn latencies: {e}")
-
-        data = {
-            "type": "transcript",
-            "content": transcript_to_send,
-            "force_finalized": True
-        }
-
-        logger.info(f"Force-finalized transcript after timeout: {transcript_to_send}")
-        await self.push_to_transcriber_queue(create_ws_data_packet(data, self.meta_info))
-        self._reset_turn_state()
-
-    async def monitor_utterance_timeout(self):
-        """Monitor for stuck utterances that never receive committed transcript"""
-        try:
-            while True:
-                await asyncio.sleep(1.0)
-
-                if (self.last_interim_time and
-                    not self.is_transcript_sent_for_processing and
-                    (self.final_transcript.strip() or self.current_turn_interim_details)):
-
-                    elapsed = time.time() - self.last_interim_time
-
-                    if elapsed > self.interim_timeout:
-                        logger.warning(
-                            f"Interim timeout: No finalization for {elapsed:.1f}s. "
-                            f"Force-finalizing turn {self.current_turn_id}"
-                        )
-                        await self._force_finalize_utterance()
-        except asyncio.CancelledError:
-            logger.info("Utterance timeout monitoring task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in monitor_utterance_timeout: {e}")
-            raise
-
     async def toggle_connection(self):
         """Close the connection and cancel all tasks"""
         self.connection_on = False
-        if self.sender_task is not None:
-            self.sender_task.cancel()
-        if self.utterance_timeout_task is not None:
-            self.utterance_timeout_task.cancel()
+        self.stop_stream()
 
         if self.websocket_connection is not None:
             try:
@@ -256,68 +163,17 @@ class ElevenLabsTranscriber(BaseTranscriber):
             return True
         return False
 
+    def encode_frame(self, audio_data):
+        return json.dumps({
+            "message_type": "input_audio_chunk",
+            "audio_base_64": base64.b64encode(audio_data).decode('utf-8'),
+            "sample_rate": self.sampling_rate,
+            "commit": False  # Let VAD handle commits
+        })
+
     def get_meta_info(self):
         return self.meta_info
 
-    async def sender_stream(self, ws: ClientConnection):
-        """Send audio data to ElevenLabs WebSocket"""
-        try:
-            while True:
-                ws_data_packet = await self.input_queue.get()
-
-                # Initialize new request
-                if not self.audio_submitted:
-                    self.meta_info = ws_data_packet.get('meta_info')
-                    self.audio_submitted = True
-                    self.audio_submission_time = time.time()
-                    self.current_request_id = self.generate_request_id()
-                    self.meta_info['request_id'] = self.current_request_id
-                    try:
-                        if not self.current_turn_start_time:
-                            self.current_turn_start_time = timestamp_ms()
-                            self.current_turn_id = self.meta_info.get('turn_id') or self.meta_info.get('request_id')
-                    except Exception:
-                        pass
-
-                end_of_stream = await self._check_and_process_end_of_stream(ws_data_packet, ws)
-                if end_of_stream:
-                    break
-
-                frame_start = self.num_frames * self.audio_frame_duration
-                frame_end = (self.num_frames + 1) * self.audio_frame_duration
-                send_timestamp = timestamp_ms()
-                self.audio_frame_timestamps.append((frame_start, frame_end, send_timestamp))
-                self.num_frames += 1
-
-                try:
-                    # Prepare audio message for ElevenLabs
-                    audio_data = ws_data_packet.get('data')
-                    audio_b64 = base64.b64encode(audio_data).decode('utf-8')
-
-                    message = {
-                        "message_type": "input_audio_chunk",
-                        "audio_base_64": audio_b64,
-                        "sample_rate": self.sampling_rate,
-                        "commit": False  # Let VAD handle commits
-                    }
-
-                    await ws.send(json.dumps(message))
-                    # Track send time for latency calculation
-                    self.last_audio_send_time = timestamp_ms()
-                except ConnectionClosedError as e:
-                    logger.error(f"Connection closed while sending data: {e}")
-                    break
-                except Exception as e:
-                    logger.error(f"Error sending data to websocket: {e}")
-                    break
-
-        except asyncio.CancelledError:
-            logger.info("Sender stream task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f'Error in sender_stream: {e}')
-            raise
-
     async def receiver(self, ws: ClientConnection):
         """Receive and process messages from ElevenLabs WebSocket"""
         async for msg in ws:
@@ -528,6 +384,9 @@ class ElevenLabsTranscriber(BaseTranscriber):
             logger.error(f"Unexpected error connecting to ElevenLabs websocket: {e}")
             raise ConnectionError(f"Unexpected error connecting to ElevenLabs websocket: {e}")
 
+    async def connect(self):
+        return await self.elevenlabs_connect()
+
     async def run(self):
         try:
             self.transcription_task = asyncio.create_task(self.transcribe())
@@ -539,7 +398,7 @@ class ElevenLabsTranscriber(BaseTranscriber):
         try:
             start_time = timestamp_ms()
             try:
-                elevenlabs_ws = await self.elevenlabs_connect()
+                elevenlabs_ws = await self.get_connection()
             except (ValueError, ConnectionError) as e:
                 logger.error(f"Failed to establish ElevenLabs connection: {e}")
                 await self.toggle_connection()
@@ -549,8 +408,7 @@ class ElevenLabsTranscriber(BaseTranscriber):
                 self.connection_time = round(timestamp_ms() - start_time)
 
             if self.stream:
-                self.sender_task = asyncio.create_task(self.sender_stream(elevenlabs_ws))
-                self.utterance_timeout_task = asyncio.create_task(self.monitor_utterance_timeout())
+                self.start_stream(elevenlabs_ws, monitor_utterances=True)
                 try:
                     async for message in self.receiver(elevenlabs_ws):
                         if self.connection_on:
@@ -581,10 +439,7 @@ class ElevenLabsTranscriber(BaseTranscriber):
                     self.websocket_connection = None
                     self.connection_authenticated = False
 
-            if hasattr(self, 'sender_task') and self.sender_task is not None:
-                self.sender_task.cancel()
-            if hasattr(self, 'utterance_timeout_task') and self.utterance_timeout_task is not None:
-                self.utterance_timeout_task.cancel()
+            self.stop_stream()
 
             await self.push_to_transcriber_queue(
                 create_ws_data_packet("transcriber_connection_closed", getattr(self, 'meta_info', {}))
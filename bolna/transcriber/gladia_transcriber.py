@@ -9,12 +9,13 @@ from typing import Optional
 import aiohttp
 import websockets
 from websockets.asyncio.client import ClientConnection
-from websockets.exceptions import ConnectionClosedError, InvalidHandshake, ConnectionClosed
+from websockets.exceptions import ConnectionClosedError, InvalidHandshake
 from dotenv import load_dotenv
 
 from .base_transcriber import BaseTranscriber
 from bolna.helpers.logger_config import configure_logger
 from bolna.helpers.utils import create_ws_data_packet, timestamp_ms
+from bolna.helpers.resource_registry import resource_registry
 
 load_dotenv()
 logger = configure_logger(__name__)
@@ -34,6 +35,8 @@ class GladiaTranscriber(BaseTranscriber):
     - Code-switching support for multilingual conversations
     """
 
+    keepalive_interval = 5
+
     def __init__(
         self,
         telephony_provider: str,
@@ -49,7 +52,7 @@ class GladiaTranscriber(BaseTranscriber):
         model: str = None,     # Optional model for future Gladia models
         **kwargs
     ):
-        super().__init__(input_queue)
+        super().__init__(input_queue, kwargs.get("input_frames_per_batch"))
 
         # Provider configuration
         self.provider = telephony_provider
@@ -89,19 +92,8 @@ class GladiaTranscriber(BaseTranscriber):
         self.gladia_session_id: Optional[str] = None
         self.gladia_ws_url: Optional[str] = None
 
-        # Tasks
         self.transcription_task = None
-        self.sender_task = None
-        self.heartbeat_task = None
-        self.utterance_timeout_task = None
-
-        # Audio tracking
-        self.audio_submitted = False
-        self.audio_submission_time = None
-        self.num_frames = 0
         self.connection_start_time = None
-        self.audio_frame_timestamps = []  # List of (frame_start, frame_end, send_timestamp)
-        self.audio_cursor = 0.0
 
         # Transcript state management
         self.current_transcript = ""
@@ -111,8 +103,6 @@ class GladiaTranscriber(BaseTranscriber):
 
         # Turn tracking
         self.turn_counter = 0
-        self.current_turn_start_time = None
-        self.current_turn_id = None
         self.current_turn_interim_details = []
         self.speech_start_time = None
         self.speech_end_time = None
@@ -136,13 +126,13 @@ class GladiaTranscriber(BaseTranscriber):
             self.encoding = "wav/ulaw"
             self.sample_rate = 8000
             self.bit_depth = 8
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
         elif self.provider in ("exotel", "plivo"):
             # Exotel and Plivo send linear16 at 8kHz
             self.encoding = "wav/pcm"
             self.sample_rate = 8000
             self.bit_depth = 16
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
         elif self.provider == "web_based_call":
             # Web calls typically use 16kHz
             self.encoding = "wav/pcm"
@@ -228,27 +218,27 @@ class GladiaTranscriber(BaseTranscriber):
                    f"audio_enhancer={payload['pre_processing'].get('audio_enhancer', False)}, "
                    f"keywords={bool(self.keywords)}")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                self.session_url,
-                headers=headers,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                if response.status not in (200, 201):
-                    error_text = await response.text()
-                    logger.error(f"Failed to create Gladia session: {response.status} - {error_text}")
-                    raise ConnectionError(f"Failed to create Gladia session: {response.status} - {error_text}")
+        session = resource_registry.get_aiohttp_session()
+        async with session.post(
+            self.session_url,
+            headers=headers,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            if response.status not in (200, 201):
+                error_text = await response.text()
+                logger.error(f"Failed to create Gladia session: {response.status} - {error_text}")
+                raise ConnectionError(f"Failed to create Gladia session: {response.status} - {error_text}")
 
-                data = await response.json()
-                session_id = data.get("id")
-                ws_url = data.get("url")
+            data = await response.json()
+            session_id = data.get("id")
+            ws_url = data.get("url")
 
-                if not ws_url:
-                    raise ConnectionError("Gladia session response missing WebSocket URL")
+            if not ws_url:
+                raise ConnectionError("Gladia session response missing WebSocket URL")
 
-                logger.info(f"Created Gladia session: {session_id}")
-                return session_id, ws_url
+            logger.info(f"Created Gladia session: {session_id}")
+            return session_id, ws_url
 
     async def gladia_connect(self, retries: int = 3, timeout: float = 10.0) -> ClientConnection:
         """
@@ -301,113 +291,10 @@ class GladiaTranscriber(BaseTranscriber):
 
         raise ConnectionError(f"Failed to connect to Gladia after {retries} attempts: {last_err}")
 
-    async def send_heartbeat(self, ws: ClientConnection):
-        """Send periodic ping to keep connection alive."""
-        try:
-            while True:
-                try:
-                    await ws.ping()
-                except ConnectionClosed as e:
-                    rcvd_code = getattr(e.rcvd, "code", None)
-                    sent_code = getattr(e.sent, "code", None)
-                    if rcvd_code == 1000 or sent_code == 1000:
-                        logger.info("WebSocket closed normally during heartbeat")
-                    else:
-                        logger.warning(f"WebSocket closed: received={rcvd_code}, sent={sent_code}")
-                    break
-                except Exception as e:
-                    logger.error(f"Error sending heartbeat: {e}")
-                    break
-
-                await asyncio.sleep(5)
-        except asyncio.CancelledError:
-            logger.info("Heartbeat task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in send_heartbeat: {e}")
-            raise
-
-    def _reset_turn_state(self):
-        """Reset turn state after finalizing a transcript."""
-        self.speech_start_time = None
-        self.speech_end_time = None
-        self.last_interim_time = None
-        self.current_turn_interim_details = []
-        self.current_turn_start_time = None
-        self.current_turn_id = None
-        self.final_transcript = ""
-        self.is_transcript_sent_for_processing = True
-
-    async def _force_finalize_utterance(self):
-        """Force-finalize a stuck utterance."""
-        transcript_to_send = self.final_transcript.strip()
-
-        # Fallback: use last interim if no final results received
-        if not transcript_to_send and self.current_turn_interim_details:
-            transcript_to_send = self.current_turn_interim_details[-1]['transcript']
-            logger.info(f"Using last interim as fallback: {transcript_to_send}")
-
-        if not transcript_to_send:
-            logger.warning("No transcript available to force-finalize")
-            self._reset_turn_state()
-            return
-
-        # Build turn latencies
-        try:
-            self.turn_latencies.append({
-                'turn_id': self.current_turn_id,
-                'sequence_id': self.current_turn_id,
-                'interim_details': self.current_turn_interim_details,
-                'force_finalized': True
-            })
-        except Exception as e:
-            logger.error(f"Error building turn latencies: {e}")
-
-        data = {
-            "type": "transcript",
-            "content": transcript_to_send,
-            "force_finalized": True
-        }
-
-        logger.info(f"Force-finalized transcript: {transcript_to_send}")
-        await self.push_to_transcriber_queue(create_ws_data_packet(data, self.meta_info))
-        self._reset_turn_state()
-
-    async def monitor_utterance_timeout(self):
-        """Monitor for stuck utterances that never receive final transcript."""
-        try:
-            while True:
-                await asyncio.sleep(1.0)
-
-                if (self.last_interim_time and
-                    not self.is_transcript_sent_for_processing and
-                    (self.final_transcript.strip() or self.current_turn_interim_details)):
-
-                    elapsed = time.time() - self.last_interim_time
-
-                    if elapsed > self.interim_timeout:
-                        logger.warning(
-                            f"Utterance timeout: No finalization for {elapsed:.1f}s. "
-                            f"Force-finalizing turn {self.current_turn_id}"
-                        )
-                        await self._force_finalize_utterance()
-        except asyncio.CancelledError:
-            logger.info("Utterance timeout monitoring cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in utterance timeout monitor: {e}")
-            raise
-
     async def toggle_connection(self):
         """Close connection and cleanup tasks."""
         self.connection_on = False
-
-        if self.heartbeat_task:
-            self.heartbeat_task.cancel()
-        if self.sender_task:
-            self.sender_task.cancel()
-        if self.utterance_timeout_task:
-            self.utterance_timeout_task.cancel()
+        self.stop_stream()
 
         if self.websocket_connection:
             try:
@@ -429,6 +316,13 @@ class GladiaTranscriber(BaseTranscriber):
         except Exception as e:
             logger.error(f"Error closing Gladia stream: {e}")
 
+    def encode_frame(self, audio_data):
+        """Gladia expects base64 encoded audio in JSON."""
+        if not audio_data:
+            return None
+        audio_b64 = base64.b64encode(audio_data).decode("utf-8") if isinstance(audio_data, bytes) else audio_data
+        return json.dumps({"type": "audio_chunk", "data": {"chunk": audio_b64}})
+
     async def _check_and_process_end_of_stream(self, ws_data_packet, ws):
         """Check for end of stream signal."""
         if ws_data_packet.get('meta_info', {}).get('eos') is True:
@@ -436,86 +330,6 @@ class GladiaTranscriber(BaseTranscriber):
             return True
         return False
 
-    def _find_audio_send_timestamp(self, audio_position: float):
-        """Find when the audio frame containing this position was sent."""
-        if not self.audio_frame_timestamps:
-            return None
-
-        for frame_start, frame_end, send_timestamp in self.audio_frame_timestamps:
-            if frame_start <= audio_position <= frame_end:
-                return send_timestamp
-
-        return None
-
-    async def sender_stream(self, ws: ClientConnection):
-        """Send audio data to Gladia WebSocket."""
-        try:
-            while True:
-                ws_data_packet = await self.input_queue.get()
-
-                if ws_data_packet is None:
-                    continue
-
-                # Initialize on first audio packet
-                if not self.audio_submitted:
-                    self.meta_info = ws_data_packet.get("meta_info", {}) or {}
-                    self.audio_submitted = True
-                    self.audio_submission_time = time.time()
-                    self.current_request_id = self.generate_request_id()
-                    self.meta_info["request_id"] = self.current_request_id
-                    try:
-                        if not self.current_turn_start_time:
-                            self.current_turn_start_time = timestamp_ms()
-                            self.current_turn_id = self.meta_info.get('turn_id') or self.meta_info.get('request_id')
-                    except Exception:
-                        pass
-
-                # Check for end of stream
-                end_of_stream = await self._check_and_process_end_of_stream(ws_data_packet, ws)
-                if end_of_stream:
-                    break
-
-                # Track audio frame timing
-                frame_start = self.num_frames * self.audio_frame_duration
-                frame_end = (self.num_frames + 1) * self.audio_frame_duration
-                send_timestamp = timestamp_ms()
-                self.audio_frame_timestamps.append((frame_start, frame_end, send_timestamp))
-
-                self.num_frames += 1
-                self.audio_cursor = self.num_frames * self.audio_frame_duration
-
-                # Get audio data and send to Gladia
-                audio_data = ws_data_packet.get("data")
-                if audio_data:
-                    try:
-                        # Gladia expects base64 encoded audio in JSON
-                        if isinstance(audio_data, bytes):
-                            audio_b64 = base64.b64encode(audio_data).decode("utf-8")
-                        else:
-                            audio_b64 = audio_data  # Assume already base64 string
-
-                        message = {
-                            "type": "audio_chunk",
-                            "data": {
-                                "chunk": audio_b64
-                            }
-                        }
-                        await ws.send(json.dumps(message))
-
-                    except ConnectionClosedError as e:
-                        logger.error(f"Connection closed while sending audio: {e}")
-                        break
-                    except Exception as e:
-                        logger.error(f"Error sending audio to Gladia: {e}")
-                        break
-
-        except asyncio.CancelledError:
-            logger.info("Sender stream task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in sender_stream: {e}")
-            raise
-
     async def receiver(self, ws: ClientConnection):
         """Receive and process messages from Gladia WebSocket."""
         async for msg in ws:
@@ -653,6 +467,9 @@ class GladiaTranscriber(BaseTranscriber):
         """Return current meta_info."""
         return getattr(self, 'meta_info', {})
 
+    async def connect(self):
+        return await self.gladia_connect()
+
     async def run(self):
         """Start the transcription task."""
         try:
@@ -667,7 +484,7 @@ class GladiaTranscriber(BaseTranscriber):
             start_time = timestamp_ms()
 
             try:
-                gladia_ws = await self.gladia_connect()
+                gladia_ws = await self.get_connection()
             except (ValueError, ConnectionError) as e:
                 logger.error(f"Failed to establish Gladia connection: {e}")
                 await self.toggle_connection()
@@ -677,9 +494,7 @@ class GladiaTranscriber(BaseTranscriber):
                 self.connection_time = round(timestamp_ms() - start_time)
 
             if self.stream:
-                self.sender_task = asyncio.create_task(self.sender_stream(gladia_ws))
-                self.heartbeat_task = asyncio.create_task(self.send_heartbeat(gladia_ws))
-                self.utterance_timeout_task = asyncio.create_task(self.monitor_utterance_timeout())
+                self.start_stream(gladia_ws, monitor_utterances=True)
 
                 try:
                     async for message in self.receiver(gladia_ws):
@@ -716,13 +531,7 @@ class GladiaTranscriber(BaseTranscriber):
                     self.websocket_connection = None
                     self.connection_authenticated = False
 
-            # Cancel tasks
-            if hasattr(self, 'sender_task') and self.sender_task:
-                self.sender_task.cancel()
-            if hasattr(self, 'heartbeat_task') and self.heartbeat_task:
-                self.heartbeat_task.cancel()
-            if hasattr(self, 'utterance_timeout_task') and self.utterance_timeout_task:
-                self.utterance_timeout_task.cancel()
+            self.stop_stream()
 
             # Send connection closed message
             await self.push_to_transcriber_queue(
@@ -32,7 +32,7 @@ class GoogleTranscriber(BaseTranscriber):
                  model="latest_long",
                  run_id="",
                  **kwargs):
-        super().__init__(input_queue)
+        super().__init__(input_queue, kwargs.get("input_frames_per_batch"))
         self.provider = telephony_provider or ""
         self.transcriber_output_queue = output_queue  # expected to be asyncio.Queue in TaskManager
         self.language = language
@@ -72,7 +72,7 @@ class GoogleTranscriber(BaseTranscriber):
         self.audio_frame_duration = 0.0
         self.num_frames = 0
         if self.provider in ('twilio', 'exotel', 'plivo'):
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
         elif self.provider == "web_based_call":
             self.audio_frame_duration = 0.256
         elif self.provider == "playground":
@@ -0,0 +1,183 @@
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+
+from .base_transcriber import BaseTranscriber
+from bolna.constants import DEFAULT_LOCAL_STT_MODEL
+from bolna.helpers.audio_codec import ulaw2lin
+from bolna.helpers.local_stt_service import get_local_stt_service
+from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.utils import create_ws_data_packet, timestamp_ms
+
+
+logger = configure_logger(__name__)
+load_dotenv()
+
+
+class LocalTranscriber(BaseTranscriber):
+    """
+    In-process transcriber running a Vosk model on the CPU (see LocalSTTService), for calls which can't reach a
+    provider and for load tests. It streams like the Deepgram transcriber and pushes the same messages: "speech_started",
+    "interim_transcript_received" for every new hypothesis and a "transcript" once the endpointer closed the utterance.
+    """
+
+    def __init__(self, telephony_provider, input_queue=None, model=DEFAULT_LOCAL_STT_MODEL, stream=True, language="en",
+                 endpointing="400", sampling_rate="16000", encoding="linear16", output_queue=None, keywords=None,
+                 process_interim_results="true", **kwargs):
+        super().__init__(input_queue, kwargs.get("input_frames_per_batch"))
+        self.endpointing = endpointing
+        self.language = language
+        self.stream = True  # Recognition is always streamed, there's no request per utterance to save
+        self.provider = telephony_provider
+        # The model defaults of the other providers (e.g. nova-2) don't name a Vosk model
+        if model and (model.startswith("vosk-model") or os.path.isdir(model)):
+            self.model = model
+        else:
+            self.model = os.getenv('LOCAL_STT_MODEL', DEFAULT_LOCAL_STT_MODEL)
+        self.encoding = encoding
+        self.sampling_rate = int(sampling_rate)
+        self.audio_frame_duration = 0.5
+        if self.provider in ('twilio', 'exotel', 'plivo'):
+            self.encoding = 'mulaw' if self.provider == 'twilio' else 'linear16'
+            self.sampling_rate = 8000
+            self.audio_frame_duration = self.telephony_frame_duration
+        elif self.provider == 'web_based_call':
+            self.encoding = 'linear16'
+            self.sampling_rate = 16000
+            self.audio_frame_duration = 0.256
+        elif self.provider == 'playground':
+            self.sampling_rate = 8000
+            self.audio_frame_duration = 0.0
+        self.transcriber_output_queue = output_queue
+        self.transcription_task = None
+        self.local_stream = None
+        #Message states
+        self.final_transcript = ""
+        self.is_transcript_sent_for_processing = False
+        self.speech_start_time = None
+        self.speech_end_time = None
+        self.current_turn_interim_details = []
+        self.turn_counter = 0
+        # Timeout tracking for stuck utterances
+        self.last_interim_time = None
+        self.interim_timeout = kwargs.get("interim_timeout", 5.0)
+
+    async def connect(self):
+        # Loading (and the first time downloading) the model is blocking, pre-connecting runs it during the call setup
+        service = await asyncio.to_thread(get_local_stt_service, self.model)
+        self.local_stream = service.open_stream(self.sampling_rate, self.endpointing)
+        return self.local_stream
+
+    def encode_frame(self, audio_data):
+        if not audio_data:
+            return None
+        return ulaw2lin(audio_data) if self.encoding == 'mulaw' else audio_data
+
+    async def _check_and_process_end_of_stream(self, ws_data_packet, ws):
+        if ws_data_packet.get('meta_info', {}).get('eos') is True:
+            await ws.finish()
+            return True
+        return False
+
+    async def toggle_connection(self):
+        self.connection_on = False
+        self.stop_stream()
+        if self.local_stream is not None:
+            await self.local_stream.close()
+            self.local_stream = None
+
+    def get_meta_info(self):
+        return self.meta_info
+
+    async def receiver(self, local_stream):
+        async for event in local_stream:
+            try:
+                transcript = event["text"].strip()
+                if not transcript:
+                    continue
+
+                if self.speech_start_time is None:
+                    self.turn_counter += 1
+                    self.current_turn_id = self.turn_counter
+                    self.speech_start_time = timestamp_ms()
+                    self.current_turn_interim_details = []
+                    logger.info(f"Starting new turn with turn_id: {self.current_turn_id}")
+                    yield create_ws_data_packet("speech_started", self.meta_info)
+
+                latency_ms = None
+                audio_sent_at = self._find_audio_send_timestamp(event["timestamp"])
+                if audio_sent_at:
+                    latency_ms = round(timestamp_ms() - audio_sent_at, 5)
+
+                is_final = event["type"] == "final"
+                self.current_turn_interim_details.append({
+                    'transcript': transcript,
+                    'latency_ms': latency_ms,
+                    'is_final': is_final,
+                    'received_at': time.time()
+                })
+                logger.info(f"Interim result - is_final: {is_final}, transcript: {transcript}")
+                self.last_interim_time = time.time()
+                yield create_ws_data_packet({"type": "interim_transcript_received", "content": transcript}, self.meta_info)
+
+                if not is_final:
+                    continue
+
+                # The endpointer closes the utterance on silence, like a speech_final result of Deepgram
+                self.final_transcript += f' {transcript}'
+                self.is_transcript_sent_for_processing = False
+                logger.info(f"Received final result hence yielding the following transcript - {self.final_transcript}")
+                data = {
+                    "type": "transcript",
+                    "content": self.final_transcript
+                }
+                self.turn_latencies.append({
+                    'turn_id': self.current_turn_id,
+                    'sequence_id': self.current_turn_id,
+                    'interim_details': self.current_turn_interim_details
+                })
+                self._reset_turn_state()
+                yield create_ws_data_packet(data, self.meta_info)
+            except Exception as e:
+                logger.error(f"Error while processing a local transcription result: {e}")
+
+        if self.meta_info is not None:
+            self.meta_info["transcriber_duration"] = self.audio_cursor
+
+    async def push_to_transcriber_queue(self, data_packet):
+        await self.transcriber_output_queue.put(data_packet)
+
+    async def run(self):
+        try:
+            self.transcription_task = asyncio.create_task(self.transcribe())
+        except Exception as e:
+            logger.error(f"not working {e}")
+
+    async def transcribe(self):
+        local_stream = None
+        try:
+            start_time = timestamp_ms()
+            local_stream = await self.get_connection()
+            if not self.connection_time:
+                self.connection_time = round(timestamp_ms() - start_time)
+
+            self.start_stream(local_stream, monitor_utterances=True)
+            async for message in self.receiver(local_stream):
+                if self.connection_on:
+                    await self.push_to_transcriber_queue(message)
+                else:
+                    logger.info("closing the local transcriber stream")
+                    break
+        except Exception as e:
+            logger.error(f"Unexpected error in transcribe: {e}")
+            await self.toggle_connection()
+        finally:
+            if local_stream is not None:
+                await local_stream.close()
+            self.local_stream = None
+            self.stop_stream()
+
+            await self.push_to_transcriber_queue(
+                create_ws_data_packet("transcriber_connection_closed", getattr(self, 'meta_info', {}))
+            )
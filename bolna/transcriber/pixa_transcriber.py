@@ -30,6 +30,8 @@ class PixaTranscriber(BaseTranscriber):
     - Models: pixa-1 (default), whisper-1
     """
 
+    keepalive_interval = 10
+
     def __init__(
         self,
         telephony_provider,
@@ -42,7 +44,7 @@ class PixaTranscriber(BaseTranscriber):
         output_queue=None,
         **kwargs,
     ):
-        super().__init__(input_queue)
+        super().__init__(input_queue, kwargs.get("input_frames_per_batch"))
 
         # Configuration
         self.telephony_provider = telephony_provider
@@ -59,18 +61,8 @@ class PixaTranscriber(BaseTranscriber):
         # Output queue
         self.transcriber_output_queue = output_queue
 
-        # Task handles
         self.transcription_task = None
-        self.sender_task = None
-        self.heartbeat_task = None
-        self.utterance_timeout_task = None
-
-        # State tracking
-        self.audio_submitted = False
-        self.audio_submission_time = None
-        self.num_frames = 0
         self.connection_start_time = None
-        self.audio_frame_duration = 0.0
 
         # Transcript state
         self.final_transcript = ""
@@ -79,8 +71,6 @@ class PixaTranscriber(BaseTranscriber):
         self.meta_info = {}
 
         # Turn/latency tracking
-        self.current_turn_start_time = None
-        self.current_turn_id = None
         self.turn_latencies = []
         self.first_result_latency_ms = None
         self.turn_counter = 0
@@ -100,12 +90,12 @@ class PixaTranscriber(BaseTranscriber):
             self.encoding = "mulaw"
             self.input_sampling_rate = 8000
             self.sampling_rate = 8000
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
         elif self.telephony_provider in ("plivo", "exotel"):
             self.encoding = "linear16"
             self.input_sampling_rate = 8000
             self.sampling_rate = 8000
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
         elif self.telephony_provider == "web_based_call":
             self.encoding = "linear16"
             self.sampling_rate = 16000
@@ -178,61 +168,6 @@ class PixaTranscriber(BaseTranscriber):
 
         raise ConnectionError(f"Failed to connect to Pixa after {retries} attempts: {last_err}")
 
-    async def sender_stream(self, ws: ClientConnection):
-        """Send audio frames to Pixa WebSocket."""
-        try:
-            while True:
-                ws_data_packet = await self.input_queue.get()
-                if ws_data_packet is None:
-                    continue
-
-                if not self.audio_submitted:
-                    self.meta_info = ws_data_packet.get("meta_info", {})
-                    self.audio_submitted = True
-                    self.audio_submission_time = time.time()
-                    self.current_request_id = self.generate_request_id()
-                    self.meta_info["request_id"] = self.current_request_id
-
-                    # Start turn tracking
-                    if not self.current_turn_start_time:
-                        self.current_turn_start_time = timestamp_ms()
-                        self.turn_counter += 1
-                        self.current_turn_id = f"turn_{self.turn_counter}"
-
-                # Check for end of stream
-                if ws_data_packet.get("meta_info", {}).get("eos") is True:
-                    logger.info("Received end of stream signal")
-                    # Send Finalize command before closing
-                    try:
-                        await ws.send(json.dumps({"type": "Finalize"}))
-                        await asyncio.sleep(0.5)  # Allow final results to come through
-                        await ws.send(json.dumps({"type": "CloseStream"}))
-                    except Exception as e:
-                        logger.warning(f"Error sending close commands: {e}")
-                    break
-
-                self.num_frames += 1
-
-                # Send raw audio bytes directly
-                audio_data = ws_data_packet.get("data")
-                if audio_data:
-                    try:
-                        await ws.send(audio_data)
-                    except ConnectionClosed as e:
-                        logger.error(f"Connection closed while sending audio: {e}")
-                        break
-                    except Exception as e:
-                        logger.error(f"Error sending audio to Pixa: {e}")
-                        break
-
-        except asyncio.CancelledError:
-            logger.info("Pixa sender stream task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in Pixa sender_stream: {e}")
-            traceback.print_exc()
-            raise
-
     async def receiver(self, ws: ClientConnection):
         """
         Receive and process messages from Pixa WebSocket.
@@ -344,6 +279,44 @@ class PixaTranscriber(BaseTranscriber):
             logger.error(f"Error in Pixa receiver: {e}")
             traceback.print_exc()
 
+    async def on_stream_start(self, ws_data_packet):
+        self.meta_info = ws_data_packet.get("meta_info", {})
+        self.audio_submitted = True
+        self.audio_submission_time = time.time()
+        self.current_request_id = self.generate_request_id()
+        self.meta_info["request_id"] = self.current_request_id
+
+        # Start turn tracking
+        if not self.current_turn_start_time:
+            self.current_turn_start_time = timestamp_ms()
+            self.turn_counter += 1
+            self.current_turn_id = f"turn_{self.turn_counter}"
+
+    def encode_frame(self, audio_data):
+        # Raw audio bytes are sent directly
+        return audio_data or None
+
+    async def _check_and_process_end_of_stream(self, ws_data_packet, ws):
+        if ws_data_packet.get("meta_info", {}).get("eos") is True:
+            logger.info("Received end of stream signal")
+            # Send Finalize command before closing
+            try:
+                await ws.send(json.dumps({"type": "Finalize"}))
+                await asyncio.sleep(0.5)  # Allow final results to come through
+                await ws.send(json.dumps({"type": "CloseStream"}))
+            except Exception as e:
+                logger.warning(f"Error sending close commands: {e}")
+            return True
+        return False
+
+    async def send_keepalive(self, ws):
+        await ws.send(json.dumps({"type": "KeepAlive"}))
+        logger.debug("Sent KeepAlive to Pixa")
+
+    def has_pending_utterance(self):
+        # Since Pixa has no UtteranceEnd event, only the accumulated is_final results are force-finalized
+        return bool(self.final_transcript.strip()) and not self.is_transcript_sent_for_processing
+
     def _reset_turn_state(self):
         """Reset turn state after finalizing a transcript."""
         self.current_turn_start_time = timestamp_ms()
@@ -354,35 +327,6 @@ class PixaTranscriber(BaseTranscriber):
         self.is_transcript_sent_for_processing = True
         self.last_interim_time = None
 
-    async def monitor_utterance_timeout(self):
-        """
-        Monitor for stuck utterances that never receive is_final=True.
-        Since Pixa has no UtteranceEnd event, we need this fallback.
-        """
-        try:
-            while True:
-                await asyncio.sleep(1.0)
-
-                if (self.last_interim_time and
-                    self.final_transcript.strip() and
-                    not self.is_transcript_sent_for_processing):
-
-                    elapsed = time.time() - self.last_interim_time
-
-                    if elapsed > self.interim_timeout:
-                        logger.warning(
-                            f"Pixa interim timeout: No is_final for {elapsed:.1f}s. "
-                            f"Force-finalizing turn {self.current_turn_id}"
-                        )
-                        await self._force_finalize_utterance()
-        except asyncio.CancelledError:
-            logger.info("Pixa utterance timeout monitoring task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in monitor_utterance_timeout: {e}")
-            traceback.print_exc()
-            raise
-
     async def _force_finalize_utterance(self):
         """Force-finalize a stuck utterance and send to queue."""
         transcript_to_send = self.final_transcript.strip()
@@ -417,31 +361,10 @@ class PixaTranscriber(BaseTranscriber):
 
         self._reset_turn_state()
 
-    async def send_heartbeat(self, ws: ClientConnection, interval_sec: float = 10.0):
-        """Send keepalive messages to maintain connection."""
-        try:
-            while True:
-                await asyncio.sleep(interval_sec)
-                try:
-                    await ws.send(json.dumps({"type": "KeepAlive"}))
-                    logger.debug("Sent KeepAlive to Pixa")
-                except ConnectionClosed:
-                    logger.info("Connection closed during heartbeat")
-                    break
-                except Exception as e:
-                    logger.error(f"Error sending heartbeat: {e}")
-                    break
-        except asyncio.CancelledError:
-            logger.info("Pixa heartbeat task cancelled")
-            raise
-
     async def toggle_connection(self):
         """Close connection and cancel all tasks."""
         self.connection_on = False
-
-        for task in [self.sender_task, self.heartbeat_task, self.utterance_timeout_task]:
-            if task:
-                task.cancel()
+        self.stop_stream()
 
         if self.websocket_connection:
             try:
@@ -458,6 +381,9 @@ class PixaTranscriber(BaseTranscriber):
         if self.transcriber_output_queue is not None:
             await self.transcriber_output_queue.put(data_packet)
 
+    async def connect(self):
+        return await self.pixa_connect()
+
     async def run(self):
         """Start the transcription task."""
         try:
@@ -472,7 +398,7 @@ class PixaTranscriber(BaseTranscriber):
         try:
             start_time = time.perf_counter()
             try:
-                pixa_ws = await self.pixa_connect()
+                pixa_ws = await self.get_connection()
             except (ValueError, ConnectionError) as e:
                 logger.error(f"Failed to connect to Pixa: {e}")
                 await self.toggle_connection()
@@ -482,9 +408,7 @@ class PixaTranscriber(BaseTranscriber):
                 self.connection_time = round((time.perf_counter() - start_time) * 1000)
 
             if self.stream:
-                self.sender_task = asyncio.create_task(self.sender_stream(pixa_ws))
-                self.heartbeat_task = asyncio.create_task(self.send_heartbeat(pixa_ws))
-                self.utterance_timeout_task = asyncio.create_task(self.monitor_utterance_timeout())
+                self.start_stream(pixa_ws, monitor_utterances=True)
 
                 try:
                     async for message in self.receiver(pixa_ws):
@@ -509,10 +433,7 @@ class PixaTranscriber(BaseTranscriber):
             logger.error(f"Unexpected error in Pixa transcribe: {e}")
             traceback.print_exc()
         finally:
-            # Cleanup tasks
-            for task in [self.sender_task, self.heartbeat_task, self.utterance_timeout_task]:
-                if task:
-                    task.cancel()
+            self.stop_stream()
 
             if pixa_ws:
                 try:
@@ -6,7 +6,6 @@ import io
 import wave
 import time
 import traceback
-import audioop
 from dotenv import load_dotenv
 import aiohttp
 import websockets
@@ -18,7 +17,10 @@ from scipy.signal import resample_poly
 from typing import Optional
 
 from .base_transcriber import BaseTranscriber
+from bolna.helpers.audio_codec import ulaw2lin
+from bolna.helpers.audio_resampler import StreamingResampler, resample_pcm
 from bolna.helpers.logger_config import configure_logger
+from bolna.helpers.resource_registry import resource_registry
 from bolna.helpers.utils import create_ws_data_packet
 
 load_dotenv()
@@ -26,6 +28,8 @@ logger = configure_logger(__name__)
 
 
 class SarvamTranscriber(BaseTranscriber):
+    keepalive_interval = 10
+
     def __init__(
         self,
         telephony_provider,
@@ -42,7 +46,7 @@ class SarvamTranscriber(BaseTranscriber):
         disable_sdk=False,
         **kwargs,
     ):
-        super().__init__(input_queue)
+        super().__init__(input_queue, kwargs.get("input_frames_per_batch"))
 
         self.telephony_provider = telephony_provider
         self.model = model
@@ -68,24 +72,13 @@ class SarvamTranscriber(BaseTranscriber):
 
         self.transcriber_output_queue = output_queue
         self.transcription_task = None
-        self.sender_task = None
-        self.heartbeat_task = None
-
-        self.audio_submitted = False
-        self.audio_submission_time = None
-        self.num_frames = 0
         self.connection_start_time = None
-        self.connection_time = None
-        self.audio_frame_duration = 0.0
-        self.audio_cursor = 0.0
 
         self.final_transcript = ""
         self.websocket_connection = None
         self.connection_authenticated = False
         self.meta_info = {}
 
-        self.current_turn_start_time = None
-        self.current_turn_id = None
         self.turn_latencies = []
         self.first_result_latency_ms = None
         self.total_stream_duration_ms = None
@@ -100,25 +93,25 @@ class SarvamTranscriber(BaseTranscriber):
 
         self._configure_audio_params()
         self.session: Optional[aiohttp.ClientSession] = None
-        if not self.stream:
-            self.session = aiohttp.ClientSession()
 
     def _configure_audio_params(self):
         if self.telephony_provider == "plivo":
             self.encoding = "linear16"
             self.input_sampling_rate = 8000
             self.sampling_rate = 16000
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
         elif self.telephony_provider == "twilio":
             self.encoding = "mulaw"
             self.input_sampling_rate = 8000
             self.sampling_rate = 16000
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
         else:
             self.encoding = self.encoding or "linear16"
             self.sampling_rate = int(self.sampling_rate)
             self.input_sampling_rate = self.sampling_rate
             self.audio_frame_duration = 0.2
+        # The streamed frames are resampled as one stream, resampling each frame on its own clicks at the frame edges
+        self.input_resampler = StreamingResampler(self.input_sampling_rate, self.sampling_rate)
 
     def _get_ws_url(self):
         params = {"model": self.model}
@@ -137,8 +130,8 @@ class SarvamTranscriber(BaseTranscriber):
         return f"{self.ws_url}?{query_string}"
 
     async def _get_http_transcription(self, audio_data):
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+        # Connection pool shared by every call of the process
+        self.session = resource_registry.get_aiohttp_session()
 
         wav_data = self._convert_audio_to_wav(audio_data)
         if wav_data is None:
@@ -179,7 +172,7 @@ class SarvamTranscriber(BaseTranscriber):
             logger.error(f"HTTP transcription error: {e}")
             raise
 
-    def _convert_audio_to_wav(self, audio_data) -> Optional[bytes]:
+    def _convert_audio_to_wav(self, audio_data, resampler=None) -> Optional[bytes]:
         try:
             if isinstance(audio_data, str):
                 audio_bytes = base64.b64decode(audio_data)
@@ -187,12 +180,14 @@ class SarvamTranscriber(BaseTranscriber):
                 audio_bytes = audio_data
 
             if self.encoding == "mulaw":
-                audio_bytes = audioop.ulaw2lin(audio_bytes, 2)
+                audio_bytes = ulaw2lin(audio_bytes)
 
             try:
                 current_rate = getattr(self, "input_sampling_rate", self.sampling_rate)
-                if current_rate != self.sampling_rate:
-                    audio_bytes, _ = audioop.ratecv(audio_bytes, 2, 1, current_rate, self.sampling_rate, None)
+                if resampler is not None:
+                    audio_bytes = resampler.process(audio_bytes)
+                elif current_rate != self.sampling_rate:
+                    audio_bytes = resample_pcm(audio_bytes, current_rate, self.sampling_rate)
             except Exception:
                 audio_bytes = self.normalize_to_16k(audio_bytes, current_rate)
 
@@ -233,6 +228,22 @@ class SarvamTranscriber(BaseTranscriber):
             return True
         return False
 
+    async def on_stream_start(self, ws_data_packet):
+        self.meta_info = ws_data_packet.get("meta_info", {})
+        self.audio_submitted = True
+        self.audio_submission_time = time.time()
+        self.current_request_id = self.generate_request_id()
+        self.meta_info["request_id"] = self.current_request_id
+
+    def encode_frame(self, audio_data):
+        if not audio_data:
+            return None
+        wav_bytes = self._convert_audio_to_wav(audio_data, self.input_resampler)
+        if not wav_bytes:
+            return None
+        audio_b64 = base64.b64encode(wav_bytes).decode("utf-8")
+        return json.dumps({"audio": {"data": audio_b64, "encoding": "audio/wav", "sample_rate": self.sampling_rate}})
+
     async def sender(self):
         # HTTP batching sender
         buffer_flush_interval_sec = 2.5
@@ -285,37 +296,6 @@ class SarvamTranscriber(BaseTranscriber):
         except asyncio.CancelledError:
             pass
 
-    async def sender_stream(self, ws: ClientConnection):
-        try:
-            while True:
-                ws_data_packet = await self.input_queue.get()
-                if ws_data_packet is None:
-                    continue
-
-                if not self.audio_submitted:
-                    self.meta_info = ws_data_packet.get("meta_info", {})
-                    self.audio_submitted = True
-                    self.audio_submission_time = time.time()
-                    self.current_request_id = self.generate_request_id()
-                    self.meta_info["request_id"] = self.current_request_id
-
-                if await self._check_and_process_end_of_stream(ws_data_packet, ws):
-                    break
-
-                self.num_frames += 1
-                self.audio_cursor = self.num_frames * self.audio_frame_duration
-
-                audio_data = ws_data_packet.get("data")
-                if audio_data:
-                    wav_bytes = self._convert_audio_to_wav(audio_data)
-                    if not wav_bytes:
-                        continue
-                    audio_b64 = base64.b64encode(wav_bytes).decode("utf-8")
-                    message = {"audio": {"data": audio_b64, "encoding": "audio/wav", "sample_rate": self.sampling_rate}}
-                    await ws.send(json.dumps(message))
-        except asyncio.CancelledError:
-            pass
-
     async def receiver(self, ws: ClientConnection):
         try:
             async for message in ws:
@@ -464,10 +444,7 @@ class SarvamTranscriber(BaseTranscriber):
 
     async def toggle_connection(self):
         self.connection_on = False
-        if self.sender_task:
-            self.sender_task.cancel()
-        if self.heartbeat_task:
-            self.heartbeat_task.cancel()
+        self.stop_stream()
         if self.websocket_connection:
             try:
                 await self.websocket_connection.close()
@@ -477,28 +454,20 @@ class SarvamTranscriber(BaseTranscriber):
                 self.websocket_connection = None
                 self.connection_authenticated = False
 
+    async def connect(self):
+        return await self.sarvam_connect()
+
     async def run(self):
         try:
             self.transcription_task = asyncio.create_task(self.transcribe())
         except Exception:
             traceback.print_exc()
 
-    async def send_heartbeat(self, ws: ClientConnection, interval_sec: float = 10.0):
-        try:
-            while True:
-                await asyncio.sleep(interval_sec)
-                try:
-                    await ws.ping()
-                except Exception:
-                    break
-        except asyncio.CancelledError:
-            pass
-
     async def transcribe(self):
         try:
             start_time = time.perf_counter()
             try:
-                sarvam_ws = await self.sarvam_connect()
+                sarvam_ws = await self.get_connection()
             except (ValueError, ConnectionError):
                 await self.toggle_connection()
                 return
@@ -509,8 +478,7 @@ class SarvamTranscriber(BaseTranscriber):
             if self.stream:
                 try:
                     async with sarvam_ws:
-                        self.sender_task = asyncio.create_task(self.sender_stream(sarvam_ws))
-                        self.heartbeat_task = asyncio.create_task(self.send_heartbeat(sarvam_ws))
+                        self.start_stream(sarvam_ws)
                         async for message in self.receiver(sarvam_ws):
                             if getattr(self, "connection_on", True):
                                 await self.push_to_transcriber_queue(message)
@@ -535,12 +503,7 @@ class SarvamTranscriber(BaseTranscriber):
             except Exception:
                 traceback.print_exc()
         finally:
-            if self.sender_task:
-                self.sender_task.cancel()
-            if self.heartbeat_task:
-                self.heartbeat_task.cancel()
-            if self.session and not self.session.closed:
-                await self.session.close()
+            self.stop_stream()
             if self.websocket_connection:
                 try:
                     await self.websocket_connection.close()
@@ -8,7 +8,7 @@ from urllib.parse import urlencode
 
 import websockets
 from websockets.asyncio.client import ClientConnection
-from websockets.exceptions import ConnectionClosedError, InvalidHandshake, ConnectionClosed
+from websockets.exceptions import ConnectionClosedError, InvalidHandshake
 from dotenv import load_dotenv
 
 from .base_transcriber import BaseTranscriber
@@ -31,6 +31,8 @@ class SmallestTranscriber(BaseTranscriber):
     API Documentation: https://waves-docs.smallest.ai/v4.0.0/content/api-references/lightning-asr-ws
     """
 
+    keepalive_interval = 5
+
     def __init__(
         self,
         telephony_provider: str,
@@ -47,7 +49,7 @@ class SmallestTranscriber(BaseTranscriber):
         process_interim_results: str = "true",
         **kwargs
     ):
-        super().__init__(input_queue)
+        super().__init__(input_queue, kwargs.get("input_frames_per_batch"))
 
         # Provider configuration
         self.provider = telephony_provider
@@ -79,18 +81,8 @@ class SmallestTranscriber(BaseTranscriber):
         self.connection_authenticated = False
         self.smallest_session_id: Optional[str] = None
 
-        # Tasks
         self.transcription_task = None
-        self.sender_task = None
-        self.heartbeat_task = None
-        self.utterance_timeout_task = None
-
-        # Audio tracking
-        self.audio_submitted = False
-        self.audio_submission_time = None
-        self.num_frames = 0
         self.connection_start_time = None
-        self.audio_frame_timestamps = []  # List of (frame_start, frame_end, send_timestamp)
 
         # Transcript state management
         self.final_transcript = ""
@@ -99,8 +91,6 @@ class SmallestTranscriber(BaseTranscriber):
 
         # Turn tracking
         self.turn_counter = 0
-        self.current_turn_start_time = None
-        self.current_turn_id = None
         self.current_turn_interim_details = []
         self.speech_start_time = None
         self.speech_end_time = None
@@ -122,12 +112,12 @@ class SmallestTranscriber(BaseTranscriber):
             # Twilio sends mulaw at 8kHz
             self.encoding = "mulaw"
             self.sampling_rate = 8000
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
         elif self.provider in ("exotel", "plivo"):
             # Exotel and Plivo send linear16 at 8kHz
             self.encoding = "linear16"
             self.sampling_rate = 8000
-            self.audio_frame_duration = 0.2
+            self.audio_frame_duration = self.telephony_frame_duration
         elif self.provider == "web_based_call":
             # Web calls typically use 16kHz
             self.encoding = "linear16"
@@ -226,113 +216,10 @@ class SmallestTranscriber(BaseTranscriber):
 
         raise ConnectionError(f"Failed to connect to Smallest AI after {retries} attempts: {last_err}")
 
-    async def send_heartbeat(self, ws: ClientConnection):
-        """Send periodic ping to keep connection alive."""
-        try:
-            while True:
-                try:
-                    await ws.ping()
-                except ConnectionClosed as e:
-                    rcvd_code = getattr(e.rcvd, "code", None)
-                    sent_code = getattr(e.sent, "code", None)
-                    if rcvd_code == 1000 or sent_code == 1000:
-                        logger.info("WebSocket closed normally during heartbeat")
-                    else:
-                        logger.warning(f"WebSocket closed: received={rcvd_code}, sent={sent_code}")
-                    break
-                except Exception as e:
-                    logger.error(f"Error sending heartbeat: {e}")
-                    break
-
-                await asyncio.sleep(5)
-        except asyncio.CancelledError:
-            logger.info("Heartbeat task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in send_heartbeat: {e}")
-            raise
-
-    def _reset_turn_state(self):
-        """Reset turn state after finalizing a transcript."""
-        self.speech_start_time = None
-        self.speech_end_time = None
-        self.last_interim_time = None
-        self.current_turn_interim_details = []
-        self.current_turn_start_time = None
-        self.current_turn_id = None
-        self.final_transcript = ""
-        self.is_transcript_sent_for_processing = True
-
-    async def _force_finalize_utterance(self):
-        """Force-finalize a stuck utterance."""
-        transcript_to_send = self.final_transcript.strip()
-
-        # Fallback: use last interim if no final results received
-        if not transcript_to_send and self.current_turn_interim_details:
-            transcript_to_send = self.current_turn_interim_details[-1]['transcript']
-            logger.info(f"Using last interim as fallback: {transcript_to_send}")
-
-        if not transcript_to_send:
-            logger.warning("No transcript available to force-finalize")
-            self._reset_turn_state()
-            return
-
-        # Build turn latencies
-        try:
-            self.turn_latencies.append({
-                'turn_id': self.current_turn_id,
-                'sequence_id': self.current_turn_id,
-                'interim_details': self.current_turn_interim_details,
-                'force_finalized': True
-            })
-        except Exception as e:
-            logger.error(f"Error building turn latencies: {e}")
-
-        data = {
-            "type": "transcript",
-            "content": transcript_to_send,
-            "force_finalized": True
-        }
-
-        logger.info(f"Force-finalized transcript: {transcript_to_send}")
-        await self.push_to_transcriber_queue(create_ws_data_packet(data, self.meta_info))
-        self._reset_turn_state()
-
-    async def monitor_utterance_timeout(self):
-        """Monitor for stuck utterances that never receive final transcript."""
-        try:
-            while True:
-                await asyncio.sleep(1.0)
-
-                if (self.last_interim_time and
-                    not self.is_transcript_sent_for_processing and
-                    (self.final_transcript.strip() or self.current_turn_interim_details)):
-
-                    elapsed = time.time() - self.last_interim_time
-
-                    if elapsed > self.interim_timeout:
-                        logger.warning(
-                            f"Utterance timeout: No finalization for {elapsed:.1f}s. "
-                            f"Force-finalizing turn {self.current_turn_id}"
-                        )
-                        await self._force_finalize_utterance()
-        except asyncio.CancelledError:
-            logger.info("Utterance timeout monitoring cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in utterance timeout monitor: {e}")
-            raise
-
     async def toggle_connection(self):
         """Close connection and cleanup tasks."""
         self.connection_on = False
-
-        if self.heartbeat_task:
-            self.heartbeat_task.cancel()
-        if self.sender_task:
-            self.sender_task.cancel()
-        if self.utterance_timeout_task:
-            self.utterance_timeout_task.cancel()
+        self.stop_stream()
 
         if self.websocket_connection:
             try:
@@ -355,6 +242,25 @@ class SmallestTranscriber(BaseTranscriber):
         except Exception as e:
             logger.error(f"Error closing Smallest AI stream: {e}")
 
+    async def on_stream_start(self, ws_data_packet):
+        await super().on_stream_start(ws_data_packet)
+
+        # Signal speech started (Smallest doesn't have VAD events)
+        self.turn_counter += 1
+        self.current_turn_id = self.turn_counter
+        self.speech_start_time = timestamp_ms()
+        self.current_turn_interim_details = []
+        self.is_transcript_sent_for_processing = False
+
+        logger.info(f"Starting new turn with turn_id: {self.current_turn_id}")
+        await self.push_to_transcriber_queue(
+            create_ws_data_packet("speech_started", self.meta_info)
+        )
+
+    def encode_frame(self, audio_data):
+        """Smallest AI expects raw binary audio chunks (4KB recommended)."""
+        return audio_data or None
+
     async def _check_and_process_end_of_stream(self, ws_data_packet, ws):
         """Check for end of stream signal."""
         if ws_data_packet.get('meta_info', {}).get('eos') is True:
@@ -362,103 +268,6 @@ class SmallestTranscriber(BaseTranscriber):
             return True
         return False
 
-    def _find_audio_send_timestamp(self, audio_position: float):
-        """
-        Find when the audio frame containing this position was sent.
-
-        Args:
-            audio_position: Position in seconds within the audio stream
-
-        Returns:
-            Timestamp when the frame containing this position was sent, or None if not found
-        """
-        if not self.audio_frame_timestamps:
-            return None
-
-        for frame_start, frame_end, send_timestamp in self.audio_frame_timestamps:
-            if frame_start <= audio_position <= frame_end:
-                return send_timestamp
-
-        return None
-
-    async def sender_stream(self, ws: ClientConnection):
-        """
-        Send audio data to Smallest AI WebSocket.
-
-        Smallest AI expects binary audio chunks (4KB recommended).
-        """
-        try:
-            while True:
-                ws_data_packet = await self.input_queue.get()
-
-                if ws_data_packet is None:
-                    continue
-
-                # Initialize on first audio packet
-                if not self.audio_submitted:
-                    self.meta_info = ws_data_packet.get("meta_info", {}) or {}
-                    self.audio_submitted = True
-                    self.audio_submission_time = time.time()
-                    self.current_request_id = self.generate_request_id()
-                    self.meta_info["request_id"] = self.current_request_id
-
-                    # Start new turn tracking
-                    try:
-                        if not self.current_turn_start_time:
-                            self.current_turn_start_time = timestamp_ms()
-                            self.current_turn_id = self.meta_info.get('turn_id') or self.meta_info.get('request_id')
-                    except Exception:
-                        pass
-
-                    # Signal speech started (Smallest doesn't have VAD events)
-                    self.turn_counter += 1
-                    self.current_turn_id = self.turn_counter
-                    self.speech_start_time = timestamp_ms()
-                    self.current_turn_interim_details = []
-                    self.is_transcript_sent_for_processing = False
-
-                    logger.info(f"Starting new turn with turn_id: {self.current_turn_id}")
-                    await self.push_to_transcriber_queue(
-                        create_ws_data_packet("speech_started", self.meta_info)
-                    )
-
-                # Check for end of stream
-                end_of_stream = await self._check_and_process_end_of_stream(ws_data_packet, ws)
-                if end_of_stream:
-                    break
-
-                # Track audio frame timing
-                frame_start = self.num_frames * self.audio_frame_duration
-                frame_end = (self.num_frames + 1) * self.audio_frame_duration
-                send_timestamp = timestamp_ms()
-                self.audio_frame_timestamps.append((frame_start, frame_end, send_timestamp))
-                self.num_frames += 1
-
-                # Get audio data and send to Smallest AI
-                audio_data = ws_data_packet.get("data")
-                if audio_data:
-                    try:
-                        # Smallest AI expects raw binary audio chunks
-                        if isinstance(audio_data, bytes):
-                            await ws.send(audio_data)
-                        else:
-                            # If string (possibly base64), send as-is
-                            await ws.send(audio_data)
-
-                    except ConnectionClosedError as e:
-                        logger.error(f"Connection closed while sending audio: {e}")
-                        break
-                    except Exception as e:
-                        logger.error(f"Error sending audio to Smallest AI: {e}")
-                        break
-
-        except asyncio.CancelledError:
-            logger.info("Sender stream task cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in sender_stream: {e}")
-            raise
-
     async def receiver(self, ws: ClientConnection):
         """
         Receive and process messages from Smallest AI WebSocket.
@@ -601,6 +410,9 @@ class SmallestTranscriber(BaseTranscriber):
         """Return current meta_info."""
         return getattr(self, 'meta_info', {})
 
+    async def connect(self):
+        return await self.smallest_connect()
+
     async def run(self):
         """Start the transcription task."""
         try:
@@ -615,7 +427,7 @@ class SmallestTranscriber(BaseTranscriber):
             start_time = timestamp_ms()
 
             try:
-                smallest_ws = await self.smallest_connect()
+                smallest_ws = await self.get_connection()
             except (ValueError, ConnectionError) as e:
                 logger.error(f"Failed to establish Smallest AI connection: {e}")
                 await self.toggle_connection()
@@ -625,9 +437,7 @@ class SmallestTranscriber(BaseTranscriber):
                 self.connection_time = round(timestamp_ms() - start_time)
 
             if self.stream:
-                self.sender_task = asyncio.create_task(self.sender_stream(smallest_ws))
-                self.heartbeat_task = asyncio.create_task(self.send_heartbeat(smallest_ws))
-                self.utterance_timeout_task = asyncio.create_task(self.monitor_utterance_timeout())
+                self.start_stream(smallest_ws, monitor_utterances=True)
 
                 try:
                     async for message in self.receiver(smallest_ws):
@@ -663,13 +473,7 @@ class SmallestTranscriber(BaseTranscriber):
                     self.websocket_connection = None
                     self.connection_authenticated = False
 
-            # Cancel tasks
-            if hasattr(self, 'sender_task') and self.sender_task:
-                self.sender_task.cancel()
-            if hasattr(self, 'heartbeat_task') and self.heartbeat_task:
-                self.heartbeat_task.cancel()
-            if hasattr(self, 'utterance_timeout_task') and self.utterance_timeout_task:
-                self.utterance_timeout_task.cancel()
+            self.stop_stream()
 
             # Send connection closed message
             await self.push_to_transcriber_queue(
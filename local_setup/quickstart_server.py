@@ -12,6 +12,7 @@ from bolna.helpers.logger_config import configure_logger
 from bolna.models import *
 from bolna.llms import LiteLLM
 from bolna.agent_manager.assistant_manager import AssistantManager
+from bolna.helpers.resource_registry import resource_registry
 
 load_dotenv()
 logger = configure_logger(__name__)
@@ -31,6 +32,12 @@ app.add_middleware(
 )
 
 
+@app.on_event("shutdown")
+async def close_shared_resources():
+    # HTTP pools shared by all the calls of this process
+    await resource_registry.close()
+
+
 class CreateAgentPayload(BaseModel):
     agent_config: AgentModel
     agent_prompts: Optional[Dict[str, Dict[str, str]]]
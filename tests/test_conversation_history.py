@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from bolna.helpers.conversation_history import ConversationHistory
+
+
+def test_concatenation_gives_a_list():
+    history = ConversationHistory([{"role": "user", "content": "hi"}])
+    system_message = {"role": "system", "content": "prompt"}
+
+    assert [system_message] + history == [system_message, {"role": "user", "content": "hi"}]
+    assert history + [system_message] == [{"role": "user", "content": "hi"}, system_message]
+    assert history + history.snapshot() == [{"role": "user", "content": "hi"}] * 2
+    assert len(history) == 1
+
+
+class FakeRAGClient:
+    async def query_for_conversation(self, query, collections, max_results, similarity_threshold):
+        from bolna.helpers.rag_service_client import RAGContext, RAGResponse
+        return RAGResponse(contexts=[RAGContext(text="Opening hours are 9 to 5", score=0.9)], total_results=1,
+                           processing_time=0.01)
+
+    async def format_context_for_prompt(self, contexts):
+        return "\n".join(context.text for context in contexts)
+
+
+def test_rag_context_without_system_message(monkeypatch):
+    knowledgebase_agent = pytest.importorskip("bolna.agent_types.knowledgebase_agent")
+
+    async def get_client(rag_server_url):
+        return FakeRAGClient()
+
+    monkeypatch.setattr(knowledgebase_agent.RAGServiceClientSingleton, "get_client", get_client)
+    agent = knowledgebase_agent.KnowledgeBaseAgent.__new__(knowledgebase_agent.KnowledgeBaseAgent)
+    agent.config = {"prompt": "You are a support agent."}
+    agent.agent_information = "a support agent"
+    agent.rag_config = {"collections": ["docs"], "similarity_top_k": 5}
+    agent.rag_server_url = "http://localhost:8000"
+
+    history = ConversationHistory([{"role": "user", "content": "When are you open?"}])
+    messages = asyncio.run(agent._add_rag_context(history))
+
+    assert isinstance(messages, list)
+    assert messages[0]["role"] == "system"
+    assert "Opening hours are 9 to 5" in messages[0]["content"]
+    assert messages[1:] == [{"role": "user", "content": "When are you open?"}]
@@ -0,0 +1,46 @@
+import asyncio
+
+from bolna.helpers.pipeline_queue import DROP_OLDEST, PipelineQueue
+
+
+def audio_packet(index):
+    return {"data": bytes([index]), "meta_info": {"type": "audio", "sequence": index}}
+
+
+def end_of_stream_packet():
+    return {"data": None, "meta_info": {"io": "default", "eos": True}}
+
+
+def drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_drop_oldest_keeps_control_packets():
+    async def run():
+        queue = PipelineQueue("transcriber", maxsize=3, policy=DROP_OLDEST)
+        queue.put_nowait(end_of_stream_packet())
+        for index in range(5):
+            queue.put_nowait(audio_packet(index))
+        return queue, drain(queue)
+
+    queue, items = asyncio.run(run())
+    assert items[0]["meta_info"]["eos"] is True
+    assert [item["data"] for item in items[1:]] == [bytes([3]), bytes([4])]
+    assert queue.dropped_count == 3
+
+
+def test_control_packets_go_over_the_bound():
+    async def run():
+        queue = PipelineQueue("transcriber", maxsize=2, policy=DROP_OLDEST)
+        for _ in range(3):
+            queue.put_nowait(end_of_stream_packet())
+        queue.put_nowait(None)
+        return queue, drain(queue)
+
+    queue, items = asyncio.run(run())
+    assert len(items) == 4
+    assert items[-1] is None
+    assert queue.dropped_count == 0
@@ -0,0 +1,80 @@
+import heapq
+import random
+
+import pytest
+
+from bolna.helpers import timer_wheel
+from bolna.helpers.timer_wheel import TimerWheel
+
+
+class FakeLoop:
+    """Event loop clock moved by hand, running the `call_at()` callbacks in order of their time"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.__scheduled = []
+        self.__counter = 0
+
+    def time(self):
+        return self.now
+
+    def call_at(self, when, callback):
+        handle = FakeHandle(when, callback)
+        self.__counter += 1
+        heapq.heappush(self.__scheduled, (when, self.__counter, handle))
+        return handle
+
+    def run_until(self, deadline):
+        """Runs the callbacks due by `deadline`, each at its own time, and moves the clock to `deadline`"""
+        while self.__scheduled and self.__scheduled[0][0] <= deadline:
+            when, _, handle = heapq.heappop(self.__scheduled)
+            if not handle.cancelled:
+                self.now = max(self.now, when)
+                handle.callback()
+        self.now = max(self.now, deadline)
+
+    def run_all(self):
+        while self.__scheduled:
+            self.run_until(self.__scheduled[0][0])
+
+
+class FakeHandle:
+    def __init__(self, when, callback):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_timers_fire_within_a_tick_of_their_delay(monkeypatch, seed):
+    rng = random.Random(seed)
+    loop = FakeLoop()
+    monkeypatch.setattr(timer_wheel.asyncio, "get_running_loop", lambda: loop)
+    wheel = TimerWheel(tick_ms=50)
+    lateness = []
+    handles = []
+
+    def on_timer(due, rearm):
+        lateness.append(loop.now - due)
+        if rearm:
+            arm(rng.uniform(0, 400), rearm - 1)
+
+    def arm(delay, rearm=0):
+        handles.append(wheel.call_later(delay, on_timer, loop.now + delay, rearm))
+
+    for _ in range(3000):
+        # Spread over the levels of the wheel, some timers re-armed from their callback, some cancelled
+        arm(rng.choice((rng.uniform(0, 3), rng.uniform(0, 200), rng.uniform(0, 5000))), rng.randint(0, 2))
+        if handles and rng.random() < 0.2:
+            handles.pop(rng.randrange(len(handles))).cancel()
+        if rng.random() < 0.3:
+            loop.run_until(loop.now + rng.uniform(0, 2))
+    loop.run_all()
+
+    assert wheel.pending == 0
+    assert lateness
+    assert min(lateness) >= -1e-6
+    assert max(lateness) <= wheel.tick + 1e-6
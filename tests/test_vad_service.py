@@ -0,0 +1,39 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from bolna.helpers import vad_service
+from bolna.helpers.vad_service import VADService
+
+
+class FakeSession:
+    """Silero v5 like session whose speech probability is 0.9 for loud frames and 0.01 otherwise"""
+
+    def get_inputs(self):
+        return [SimpleNamespace(name=name) for name in ("input", "state", "sr")]
+
+    def run(self, output_names, inputs):
+        loud = np.abs(inputs["input"]).mean(axis=1) > 0.1
+        return np.where(loud, 0.9, 0.01).reshape(-1, 1).astype(np.float32), inputs["state"]
+
+
+def test_reset_stream_does_not_stall_the_other_streams(monkeypatch):
+    monkeypatch.setattr(vad_service, "create_vad_session", lambda path: FakeSession())
+
+    async def run():
+        service = VADService(model_path="fake-vad-model-reset-test", batch_window_ms=0)
+        speech = (np.full(1600, 10000, dtype=np.int16)).tobytes()
+        first, second = service.open_stream(16000), service.open_stream(16000)
+        first.push(speech)
+        first.reset()  # frames dropped while the stream was waiting for a tick
+        second.push(speech)
+        event = await asyncio.wait_for(second.get_event(), timeout=1)
+        first.push(speech)
+        first_event = await asyncio.wait_for(first.get_event(), timeout=1)
+        await service.close()
+        return event, first_event
+
+    event, first_event = asyncio.run(run())
+    assert event["type"] == "speech_start"
+    assert first_event["type"] == "speech_start"